@@ -0,0 +1,197 @@
+"""
+Shared fixtures for the pytest-benchmark suite.
+
+    pip install pytest-benchmark
+    python -m pytest benchmarks --corpus-notes 100000
+    python -m pytest benchmarks --update-baselines   # record new baselines
+
+Benchmarks run over a synthetic corpus from generate_midi_corpus.py, cached
+in .pytest_cache. GUI paths need an X display; when DISPLAY is unset an
+Xvfb server is started if one is installed, otherwise those benchmarks are
+skipped. Each benchmark's median (and any extra metric it reports, such as latency
+percentiles) is compared with baselines.json and fails when it is slower
+than the baseline by more than its threshold. Timing baselines are kept
+per machine (--baseline-machine, default the host name) and Python version,
+memory baselines per Python version; a benchmark with no baseline for its
+environment and corpus size is skipped with a message saying so.
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_midi_corpus import corpus_path
+from interaction_replay import isolated_app
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+baselines_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('midigapper benchmarks')
+    group.addoption('--corpus-notes', type=int, default=20000,
+                    help="Notes in the synthetic benchmark file (default 20000)")
+    group.addoption('--input-recording', metavar='PATH',
+                    help="Input recording to replay in the interaction benchmark")
+    group.addoption('--update-baselines', action='store_true',
+                    help="Record this run's medians in benchmarks/baselines.json")
+    group.addoption('--baseline-machine', metavar='NAME',
+                    help="Name timing baselines are recorded and checked under (default: host name)")
+
+
+def pytest_configure(config):
+    config.stash[baselines_key] = Baselines(BASELINES_FILE, config.getoption('--update-baselines'),
+                                            config.getoption('--baseline-machine'))
+
+
+def pytest_collection_modifyitems(config, items):
+    if pytest_benchmark is None:
+        skip = pytest.mark.skip(reason="pytest-benchmark is not installed (pip install pytest-benchmark)")
+        for item in items:
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session):
+    baselines = session.config.stash[baselines_key]
+    if baselines.update:
+        baselines.save()
+
+
+class Baselines:
+    """Recorded medians per benchmark, with the allowed regression before failing.
+
+    Timings are only comparable on the machine that recorded them, so they
+    are kept per machine and Python version. Sizes in bytes depend on the
+    interpreter, not the machine, so they are kept per Python version.
+    """
+    DEFAULT_THRESHOLD = 0.25
+
+    def __init__(self, path, update=False, machine=None):
+        self.path = path
+        self.update = update
+        python = 'Python ' + '.'.join(platform.python_version_tuple()[:2])
+        self.python = python
+        self.machine = f'{machine or platform.node()} {platform.machine()} {python}'
+        self.data = {'threshold': self.DEFAULT_THRESHOLD, 'environments': {}}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.data.update(json.load(f))
+
+    def environment(self, unit):
+        return self.machine if unit == 's' else self.python
+
+    def check(self, key, median, unit='s'):
+        """Fail the running benchmark if a median (or other measurement, in unit) regressed.
+
+        Skips, rather than passes silently, when nothing was recorded for this environment.
+        """
+        environment = self.environment(unit)
+        entries = self.data['environments'].setdefault(environment, {})
+        if self.update:
+            entries[key] = dict(entries.get(key, {}), median=round(median, 6))
+            return
+        entry = entries.get(key)
+        if not entry:
+            pytest.skip(f"{key}: no baseline recorded for {environment}; "
+                        f"run with --update-baselines to record one")
+        threshold = entry.get('threshold', self.data['threshold'])
+        limit = entry['median'] * (1 + threshold)
+        if median > limit:
+            worse = 'slower' if unit == 's' else 'larger'
+            pytest.fail(f"{key}: {self.format(median, unit)} is more than {threshold:.0%} "
+                        f"{worse} than the baseline {self.format(entry['median'], unit)} ({environment})")
+
+    @staticmethod
+    def format(value, unit):
+        return f"{value * 1000:.2f} ms" if unit == 's' else f"{value:.1f} {unit}"
+
+    def save(self):
+        self.data['environments'] = {name: entries for name, entries in self.data['environments'].items()
+                                     if entries}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+@pytest.fixture
+def baseline(request):
+    """check(value, metric=None, unit='s'): compare a measurement with this benchmark's baseline"""
+    notes = request.config.getoption('--corpus-notes')
+    baselines = request.config.stash[baselines_key]
+
+    def check(value, metric=None, unit='s'):
+        key = f'{request.node.name}[{notes}]' + (f':{metric}' if metric else '')
+        baselines.check(key, value, unit)
+    return check
+
+
+@pytest.fixture
+def bench(benchmark, baseline):
+    """Run func under benchmark.pedantic, then check its median against the baseline.
+
+    setup runs untimed before every round; rounds defaults to 5.
+    """
+    def run(func, setup=None, rounds=5, warmup_rounds=0):
+        result = benchmark.pedantic(func, setup=setup, rounds=rounds, iterations=1,
+                                    warmup_rounds=warmup_rounds)
+        if benchmark.stats is not None:  # None with --benchmark-disable
+            baseline(benchmark.stats.stats.median)
+        return result
+    return run
+
+
+@pytest.fixture(scope='session')
+def corpus_file(request):
+    directory = str(request.config.cache.mkdir('midi-corpus'))
+    return corpus_path(request.config.getoption('--corpus-notes'), directory=directory, seed=1,
+                       tracks=8, channels=8, repeat_density=0.3)
+
+
+@pytest.fixture(scope='session')
+def display():
+    """An X display for Tk: the current one, or a private Xvfb server"""
+    if os.environ.get('DISPLAY'):
+        yield os.environ['DISPLAY']
+        return
+    if not shutil.which('Xvfb'):
+        pytest.skip("No DISPLAY and Xvfb is not installed")
+    number = f':{90 + os.getpid() % 100}'
+    server = subprocess.Popen(['Xvfb', number, '-screen', '0', '1600x1000x24', '-nolisten', 'tcp'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ['DISPLAY'] = number
+    try:
+        yield number
+    finally:
+        del os.environ['DISPLAY']
+        server.terminate()
+        server.wait()
+
+
+@pytest.fixture(scope='session')
+def app(display):
+    """A real MidiGapperGUI with a private config, silent synth and no dialogs"""
+    with isolated_app() as gui:
+        yield gui
+
+
+@pytest.fixture(scope='session')
+def loaded_app(app, corpus_file, tmp_path_factory):
+    """app with the corpus loaded (process_midi writes its XML beside a copy)"""
+    path = tmp_path_factory.mktemp('loaded') / os.path.basename(corpus_file)
+    shutil.copy(corpus_file, path)
+    app.process_midi(str(path))
+    app.update()
+    return app
@@ -0,0 +1,69 @@
+"""
+Tk-free stand-ins that run MidiGapperGUI's load, gap, save and memory code
+paths on plain Python state, so those benchmarks need no X display.
+"""
+import xml.etree.ElementTree as ET
+
+import mido
+
+from main import MidiGapperGUI, PlaybackScheduler, midi_to_xml, pretty_print_xml
+
+
+class NoteTable:
+    """Just enough of MidiGapperGUI to rebuild the note table without Tk"""
+    set_notes = MidiGapperGUI.set_notes
+    rebuild_note_index = MidiGapperGUI.rebuild_note_index
+    rebuild_notes_from_xml = MidiGapperGUI.rebuild_notes_from_xml
+
+    def __init__(self):
+        self.playback_scheduler = PlaybackScheduler()
+
+    def draw_visualization(self, notes, max_time):
+        pass
+
+
+class TextBuffer:
+    """The few tk.Text calls the gap and save code makes, on a plain string"""
+    def __init__(self, content, on_modified):
+        self.content = content
+        self.on_modified = on_modified
+
+    def get(self, start, end):
+        return self.content + '\n' if end == 'end' else self.content
+
+    def delete(self, start, end):
+        self.content = ''
+
+    def insert(self, index, text):
+        self.content = text + self.content
+
+    def event_generate(self, sequence):
+        self.on_modified(self.content)
+
+
+class XmlEditor(NoteTable):
+    """The text screen's gap and save paths without Tk; edits rebuild the notes as in the GUI"""
+    apply_gaps = MidiGapperGUI.apply_gaps
+    gap_ticks = MidiGapperGUI.gap_ticks
+    write_midi_from_xml = MidiGapperGUI.write_midi_from_xml
+    memory_structures = MidiGapperGUI.memory_structures
+    memory_report = MidiGapperGUI.memory_report
+
+    def __init__(self, midi_file, content, path=None):
+        super().__init__()
+        self.current_midi_file = path
+        self.midi_data = midi_file
+        self.tempo_us = 500000
+        self.modifications_applied = False
+        self.text = TextBuffer(content, self.on_text_modified)
+
+    def on_text_modified(self, content):
+        self.rebuild_notes_from_xml(ET.fromstring(content[content.find('<MidiFile'):]))
+
+    @classmethod
+    def load(cls, path):
+        """An editor holding path as the GUI would after loading it, notes included"""
+        midi_file = mido.MidiFile(path)
+        editor = cls(midi_file, pretty_print_xml(midi_to_xml(midi_file)), path)
+        editor.on_text_modified(editor.text.content)
+        return editor
@@ -0,0 +1,21 @@
+"""
+Benchmarks for the piano roll redraw and per-frame keyboard highlighting (needs an X display).
+"""
+
+
+def test_draw_visualization(bench, loaded_app):
+    bench(lambda: (loaded_app.draw_visualization(loaded_app.notes, loaded_app.max_time),
+                   loaded_app.update_idletasks()), rounds=3)
+    assert loaded_app.canvas.find_all()
+
+
+def test_highlighting_per_frame(bench, loaded_app):
+    """One 60 Hz playback frame of keyboard highlighting, stepping through the song"""
+    frame = 1 / 60
+    positions = iter(i * frame for i in range(10 ** 9))
+
+    def next_frame():
+        loaded_app.playback_position = next(positions) % loaded_app.max_time
+
+    bench(loaded_app.update_keyboard_highlighting, setup=next_frame, rounds=600, warmup_rounds=10)
+    loaded_app.playback_position = 0.0
@@ -0,0 +1,20 @@
+"""
+Replays a scroll/seek/play session into the loaded GUI and checks input-to-paint latency.
+
+Pass --input-recording to replay a session captured with Ctrl+Shift+I instead
+of the seeded synthetic one.
+"""
+from diagnostics import load_input_recording
+from interaction_replay import format_report, latency_report, replay, synthetic_session
+
+
+def test_interaction_latency(benchmark, baseline, loaded_app, request):
+    recording = request.config.getoption('--input-recording')
+    events = load_input_recording(recording) if recording else synthetic_session(duration=15.0, seed=1)
+    latencies = benchmark.pedantic(lambda: replay(loaded_app, events), rounds=1, iterations=1)
+    report = latency_report(latencies)
+    benchmark.extra_info['latency_ms'] = report
+    print('\n' + format_report(report))
+    assert report
+    for kind, row in report.items():
+        baseline(row['p95_ms'] / 1000, f'{kind}:p95')
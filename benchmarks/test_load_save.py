@@ -0,0 +1,87 @@
+"""
+Benchmarks for loading, XML round-tripping, gap creation and saving.
+The gap and save paths also run headless on the editor's XML; the
+process_midi, create_gaps and save_midi_file benchmarks need an X display.
+"""
+import os
+import shutil
+
+import mido
+import pytest
+
+import main
+from headless import NoteTable, XmlEditor
+from main import midi_to_xml, pretty_print_xml
+
+
+@pytest.fixture(scope='module')
+def midi_file(corpus_file):
+    return mido.MidiFile(corpus_file)
+
+
+@pytest.fixture(scope='module')
+def xml_root(midi_file):
+    return midi_to_xml(midi_file)
+
+
+def test_midi_to_xml(bench, midi_file):
+    root = bench(lambda: midi_to_xml(midi_file))
+    assert len(root.findall('Track')) == len(midi_file.tracks)
+
+
+def test_pretty_print_xml(bench, xml_root):
+    assert bench(lambda: pretty_print_xml(xml_root), rounds=3).startswith('<?xml')
+
+
+def test_rebuild_notes_from_xml(bench, xml_root, corpus_file, request):
+    table = NoteTable()
+    bench(lambda: table.rebuild_notes_from_xml(xml_root))
+    assert len(table.notes) == request.config.getoption('--corpus-notes')
+
+
+@pytest.fixture(scope='module')
+def xml_text(xml_root):
+    return pretty_print_xml(xml_root)
+
+
+def test_apply_gaps(bench, midi_file, xml_text):
+    editors = []
+    bench(lambda: editors[-1].apply_gaps(editors[-1].gap_ticks(30)),
+          setup=lambda: editors.append(XmlEditor(midi_file, xml_text)), rounds=3)
+    assert editors[-1].modifications_applied
+
+
+def test_write_midi_from_xml(bench, midi_file, xml_text, tmp_path):
+    out = tmp_path / 'saved.mid'
+    editor = XmlEditor(midi_file, xml_text)
+    bench(lambda: editor.write_midi_from_xml(str(out)), rounds=3)
+    assert len(mido.MidiFile(str(out)).tracks) == len(midi_file.tracks)
+
+
+def test_process_midi(bench, app, corpus_file, tmp_path):
+    path = tmp_path / os.path.basename(corpus_file)
+    shutil.copy(corpus_file, path)
+    bench(lambda: app.process_midi(str(path)), rounds=3)
+    assert app.notes
+
+
+def restore_xml(app, content):
+    def setup():
+        app.text.delete('1.0', 'end')
+        app.text.insert('1.0', content)
+    return setup
+
+
+def test_create_gaps(bench, loaded_app):
+    content = loaded_app.text.get('1.0', 'end-1c')
+    loaded_app.gap_var.set('30')
+    bench(loaded_app.create_gaps, setup=restore_xml(loaded_app, content), rounds=3)
+    assert loaded_app.modifications_applied
+    restore_xml(loaded_app, content)()
+
+
+def test_save_midi_file(bench, loaded_app, tmp_path, monkeypatch):
+    out = tmp_path / 'saved.mid'
+    monkeypatch.setattr(main.filedialog, 'asksaveasfilename', lambda **kwargs: str(out))
+    bench(loaded_app.save_midi_file, rounds=3)
+    assert len(mido.MidiFile(str(out)).tracks) == len(loaded_app.midi_data.tracks)
@@ -0,0 +1,35 @@
+"""
+Memory held per note after loading the corpus, and what load, gap, save and
+redraw allocate. The headless report leaves out the canvas and the note
+dictionaries process_midi builds; the GUI report needs an X display.
+"""
+from headless import XmlEditor
+
+
+def check_report(report, baseline, phases=('load', 'gap', 'save', 'redraw')):
+    baseline(report['bytes_per_note'], 'bytes_per_note', unit='bytes')
+    for phase in phases:
+        usage = report['phases'][phase]
+        baseline(usage['peak_bytes'] / report['notes'], f'{phase}_peak_bytes_per_note', unit='bytes')
+
+
+def test_memory_per_note_headless(benchmark, baseline, corpus_file):
+    editor = XmlEditor.load(corpus_file)
+    content, notes = editor.text.content, editor.notes
+    report = benchmark.pedantic(lambda: editor.memory_report(gap_ms=30), rounds=1, iterations=1)
+    benchmark.extra_info['memory'] = report
+    assert editor.text.content == content and editor.notes is notes
+    assert report['notes'] == len(editor.notes) > 0
+    assert report['structures']['notes'] > 0 and report['structures']['event_stream'] > 0
+    check_report(report, baseline, ('load', 'gap', 'save'))  # There is no canvas to redraw
+
+
+def test_memory_per_note(benchmark, baseline, loaded_app):
+    notes, event_stream = loaded_app.notes, loaded_app.event_stream
+    report = benchmark.pedantic(loaded_app.memory_report, rounds=1, iterations=1)
+    benchmark.extra_info['memory'] = report
+    # The report measures the loaded song without replacing it
+    assert loaded_app.notes is notes and loaded_app.event_stream is event_stream
+    assert report['notes'] == len(loaded_app.notes) > 0
+    assert all(size > 0 for size in report['structures'].values())
+    check_report(report, baseline)
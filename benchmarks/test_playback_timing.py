@@ -0,0 +1,13 @@
+"""
+Plays the start of the corpus through the scheduler into the recording backend
+and checks note timing against the tempo map.
+"""
+from timing_harness import run
+
+
+def test_playback_jitter(benchmark, baseline, corpus_file):
+    report = benchmark.pedantic(lambda: run(corpus_file, end=10.0), rounds=1, iterations=1)
+    benchmark.extra_info['timing'] = report
+    assert report['dropped_notes'] == 0 and report['dropped_note_offs'] == 0
+    assert report['inaudible_gaps'] == 0
+    baseline(report['p99_jitter_ms'] / 1000, 'p99_jitter')
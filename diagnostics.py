@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Diagnostics for Python MIDI Gapper 2: categorised, levelled logging,
+hot-path timing statistics, an opt-in Chrome trace-event recorder and a
+UI-thread stall watchdog and an input recorder for interaction replays.
+
+Every record belongs to a category (load, render, playback, gap, io) and
+goes to the console and to a bounded in-memory ring buffer that can be
+dumped on demand. Levels are set per category; a disabled level costs one
+cached level check, so hot paths log with %-style arguments that are only
+formatted when the record is kept.
+
+Timers aggregate into TIMING_STATS: methods are wrapped with @timed(name),
+multi-stage functions mark stages with stage_timer(prefix).lap(stage).
+
+TRACER records complete ('X') trace events when enabled and saves them as
+trace.json for chrome://tracing or ui.perfetto.dev; while disabled each
+instrumented call costs one attribute check.
+
+StallWatchdog logs the Tk thread's Python stack when its heartbeat is late.
+
+InputRecorder writes timestamped scroll/seek/play inputs as JSON lines that
+interaction_replay.py feeds back into the GUI.
+
+measure_memory runs a function under tracemalloc and reports what it kept
+and its transient peak; deep_sizeof totals what a data structure holds.
+"""
+import collections
+import functools
+import gc
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import types
+
+CATEGORIES = ('load', 'render', 'playback', 'gap', 'io')
+TIMING_CATEGORIES = ('render', 'playback')  # Switched to DEBUG by debug timing
+ROOT_LOGGER = 'midigapper'
+DEFAULT_CAPACITY = 5000
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records in memory"""
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(
+            '%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S'))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self):
+        return [self.format(record) for record in list(self.records)]
+
+    def resize(self, capacity):
+        self.records = collections.deque(self.records, maxlen=capacity)
+
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.setLevel(INFO)
+_root.propagate = False
+ring_buffer = RingBufferHandler()
+_root.addHandler(ring_buffer)
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))
+_root.addHandler(_console)
+_debug_timing = False
+
+
+def get_logger(category):
+    """Logger for one of CATEGORIES"""
+    if category not in CATEGORIES:
+        raise ValueError(f"Unknown log category: {category}")
+    return logging.getLogger(f'{ROOT_LOGGER}.{category}')
+
+
+def _level(level):
+    if isinstance(level, str):
+        return logging.getLevelName(level.upper())
+    return level
+
+
+def set_level(level, category=None):
+    """Set the level of one category, or the default for all of them"""
+    if category is None:
+        _root.setLevel(_level(level))
+        for name in CATEGORIES:
+            if not (_debug_timing and name in TIMING_CATEGORIES):
+                get_logger(name).setLevel(logging.NOTSET)
+    else:
+        get_logger(category).setLevel(_level(level))
+
+
+def set_debug_timing(enabled):
+    """Runtime switch for DEBUG output in the timing-related categories"""
+    global _debug_timing
+    _debug_timing = bool(enabled)
+    for name in TIMING_CATEGORIES:
+        get_logger(name).setLevel(DEBUG if enabled else logging.NOTSET)
+
+
+def debug_timing_enabled():
+    return _debug_timing
+
+
+def configure_logging(config):
+    """Apply 'log_level', 'log_buffer_size' and 'debug_timing' from config.json"""
+    set_level(config.get('log_level', 'INFO'))
+    ring_buffer.resize(int(config.get('log_buffer_size', DEFAULT_CAPACITY)))
+    set_debug_timing(config.get('debug_timing', False))
+
+
+def dump_log(path=None):
+    """Return the ring buffer as text, also writing it to path if given"""
+    text = '\n'.join(ring_buffer.lines())
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    return text
+
+
+class TimingStat:
+    """Count and total of every sample, plus a window of recent ones for percentiles"""
+    __slots__ = ('count', 'total_ns', 'max_ns', 'samples')
+
+    def __init__(self, window):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples = collections.deque(maxlen=window)
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.samples.append(ns)
+
+    @staticmethod
+    def percentile(ordered, fraction):
+        """Nearest-rank percentile of an already sorted list"""
+        if not ordered:
+            return 0
+        rank = max(0, min(len(ordered), math.ceil(fraction * len(ordered))) - 1)
+        return ordered[rank]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        ms = 1e-6
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count * ms if self.count else 0.0,
+            'p50_ms': self.percentile(ordered, 0.50) * ms,
+            'p95_ms': self.percentile(ordered, 0.95) * ms,
+            'p99_ms': self.percentile(ordered, 0.99) * ms,
+            'max_ms': self.max_ns * ms,
+        }
+
+
+class StageTimer:
+    """Times consecutive stages of one call: each lap() records the time since the last"""
+    def __init__(self, stats, prefix):
+        self.stats = stats
+        self.prefix = prefix
+        self.start = self.last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        self.stats.record(f'{self.prefix}.{stage}', now - self.last)
+        self.last = now
+
+    def done(self):
+        """Record the whole call under the prefix itself"""
+        self.stats.record(self.prefix, time.perf_counter_ns() - self.start)
+
+
+class TimingStats:
+    """Registry of named timers; safe to record from any thread"""
+    DEFAULT_WINDOW = 2048
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, ns):
+        with self.lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = TimingStat(self.window)
+            stat.add(ns)
+
+    def timed(self, name):
+        """Decorator recording every call of the wrapped function under name"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter_ns() - start)
+            return wrapper
+        return decorate
+
+    def stage_timer(self, prefix):
+        return StageTimer(self, prefix)
+
+    def summary(self):
+        with self.lock:
+            return {name: stat.summary() for name, stat in sorted(self.stats.items())}
+
+    def format_table(self):
+        lines = [f"{'timer':<34}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<34}{row['count']:>8}{row['mean_ms']:>9.2f}{row['p50_ms']:>9.2f}"
+                         f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}")
+        return '\n'.join(lines)
+
+    def export(self, path):
+        """Write the summary as JSON (milliseconds)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+
+
+TIMING_STATS = TimingStats()
+timed = TIMING_STATS.timed
+stage_timer = TIMING_STATS.stage_timer
+
+
+class TraceRecorder:
+    """Collects complete trace events in memory and writes Chrome trace-event JSON"""
+    MAX_EVENTS = 1_000_000
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.events = collections.deque(maxlen=max_events)
+        self.thread_names = {}
+        self.origin = time.perf_counter_ns()
+
+    def start(self):
+        self.events.clear()
+        self.thread_names.clear()
+        self.origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def complete(self, name, category, start_ns, args=None):
+        """Record an event that began at start_ns (perf_counter_ns) and ends now"""
+        end_ns = time.perf_counter_ns()
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.events.append((name, category, start_ns, end_ns - start_ns, tid, args))
+
+    def traced(self, name, category):
+        """Decorator recording every call of the wrapped function while enabled"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.complete(name, category, start)
+            return wrapper
+        return decorate
+
+    def trace_events(self):
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in list(self.thread_names.items())]
+        for name, category, start_ns, dur_ns, tid, args in list(self.events):
+            event = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start_ns - self.origin) / 1000.0, 'dur': dur_ns / 1000.0}
+            if args:
+                event['args'] = args
+            events.append(event)
+        return events
+
+    def save(self, path):
+        """Write trace.json ({"traceEvents": [...]}, microsecond timestamps)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
+
+
+TRACER = TraceRecorder()
+
+
+def trace_tk_callbacks():
+    """Route every Tk callback registered from now on through the tracer.
+
+    Tk event bindings, widget commands and after() timers all reach Python
+    through tkinter.CallWrapper; after() timers are reported in their own
+    category under the scheduled function's name.
+    """
+    import tkinter
+
+    if getattr(tkinter.CallWrapper, 'traced', False):
+        return
+
+    class TracingCallWrapper(tkinter.CallWrapper):
+        traced = True
+
+        def __init__(self, func, subst, widget):
+            super().__init__(func, subst, widget)
+            qualname = getattr(func, '__qualname__', type(func).__name__)
+            if '.after.<locals>.' in qualname:
+                self.category, self.name = 'after', func.__name__
+            else:
+                self.category, self.name = 'tk', qualname
+
+        def __call__(self, *args):
+            if not TRACER.enabled:
+                return super().__call__(*args)
+            start = time.perf_counter_ns()
+            try:
+                return super().__call__(*args)
+            finally:
+                TRACER.complete(self.name, self.category, start)
+
+    tkinter.CallWrapper = TracingCallWrapper
+
+
+class StallWatchdog:
+    """Detects when the Tk main loop stops servicing its heartbeat.
+
+    The Tk thread re-arms an after() heartbeat every HEARTBEAT_MS. A daemon
+    thread checks it several times per budget; once a beat is more than
+    `budget` seconds late it logs the main thread's current Python stack
+    (from sys._current_frames), and when beats resume it logs how long the
+    stall lasted.
+    """
+    HEARTBEAT_MS = 50
+
+    def __init__(self, widget, budget=0.5, logger=None):
+        self.widget = widget
+        self.budget = budget
+        self.logger = logger or get_logger('render')
+        self.main_ident = None
+        self.last_beat = 0.0
+        self.stalled_since = None  # Time of the last beat before the current stall
+        self.stalls = 0
+        self.last_stack = None
+        self.after_id = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        """Start watching; must be called from the Tk thread"""
+        if self.running:
+            return
+        self.main_ident = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._watch, name='stall-watchdog', daemon=True)
+        self.thread.start()
+        self.after_id = self.widget.after(self.HEARTBEAT_MS, self.beat)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def beat(self):
+        now = time.perf_counter()
+        stalled_since = self.stalled_since
+        self.last_beat = now
+        if stalled_since is not None:
+            self.stalled_since = None
+            self.logger.warning("UI thread resumed after a %.0f ms stall",
+                                (now - stalled_since) * 1000 - self.HEARTBEAT_MS)
+        if self.running:
+            self.after_id = self.widget.after(self.HEARTBEAT_MS, self.beat)
+
+    def check(self):
+        """One watchdog poll; returns True when a new stall was reported"""
+        last_beat = self.last_beat
+        late = time.perf_counter() - last_beat - self.HEARTBEAT_MS / 1000
+        if late <= self.budget or self.stalled_since is not None:
+            return False
+        self.stalled_since = last_beat
+        self.stalls += 1
+        frame = sys._current_frames().get(self.main_ident)
+        self.last_stack = ''.join(traceback.format_stack(frame)) if frame else '(main thread not found)\n'
+        self.logger.warning("UI thread stalled for %.0f ms (budget %.0f ms); main thread stack:\n%s",
+                            late * 1000, self.budget * 1000, self.last_stack.rstrip())
+        return True
+
+    def _watch(self):
+        while not self.stop_event.wait(self.budget / 4):
+            self.check()
+
+
+class InputRecorder:
+    """Writes user inputs as JSON lines: {"t": seconds since start, "kind": ..., "args": [...]}"""
+    def __init__(self):
+        self.file = None
+        self.origin = 0.0
+        self.count = 0
+
+    @property
+    def recording(self):
+        return self.file is not None
+
+    def start(self, path):
+        self.stop()
+        self.file = open(path, 'w', encoding='utf-8')
+        self.origin = time.perf_counter()
+        self.count = 0
+
+    def record(self, kind, *args):
+        if self.file is None:
+            return
+        self.file.write(json.dumps({'t': round(time.perf_counter() - self.origin, 6),
+                                    'kind': kind, 'args': list(args)}) + '\n')
+        self.count += 1
+
+    def stop(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def load_input_recording(path):
+    """Read an InputRecorder file as a list of (t, kind, args) in time order"""
+    events = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                events.append((float(entry['t']), entry['kind'], tuple(entry.get('args', ()))))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+NOT_FOLLOWED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes held by obj and everything it references, counting each object once.
+
+    Pass one seen set to several calls to charge shared objects to the first
+    structure that reaches them. Classes, modules and functions are not followed.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, NOT_FOLLOWED):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(item)
+        if hasattr(item, '__dict__'):
+            stack.append(item.__dict__)
+        for cls in type(item).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name not in ('__dict__', '__weakref__') and hasattr(item, name):
+                    stack.append(getattr(item, name))
+    return total
+
+
+def measure_memory(func, top=0):
+    """Run func under tracemalloc; returns (result, usage).
+
+    usage has retained_bytes (still allocated after func, garbage collected),
+    peak_bytes (highest allocation above the starting point while func ran)
+    and, when top is set, the top allocation sites of the retained bytes.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        snapshot = tracemalloc.take_snapshot() if top else None
+        tracemalloc.reset_peak()
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        sites = []
+        if top:
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            diff = tracemalloc.take_snapshot().filter_traces(ignore).compare_to(
+                snapshot.filter_traces(ignore), 'lineno')
+            sites = [(f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}', stat.size_diff)
+                     for stat in diff[:top]]
+    finally:
+        if started:
+            tracemalloc.stop()
+    usage = {'retained_bytes': current - before, 'peak_bytes': max(0, peak - before), 'top': sites}
+    return result, usage
+
+
+def format_memory_report(report):
+    """Table of a memory report: per-phase retained/peak bytes, then per-structure bytes"""
+    lines = [f"{'phase':<12}{'retained KiB':>14}{'peak KiB':>12}"]
+    for phase, usage in report['phases'].items():
+        lines.append(f"{phase:<12}{usage['retained_bytes'] / 1024:>14.1f}{usage['peak_bytes'] / 1024:>12.1f}")
+    lines.append('')
+    lines.append(f"{'structure':<28}{'KiB':>12}{'bytes/note':>12}")
+    notes = report['notes'] or 1
+    for name, size in report['structures'].items():
+        lines.append(f"{name:<28}{size / 1024:>12.1f}{size / notes:>12.1f}")
+    lines.append(f"{'total':<28}{report['structure_bytes'] / 1024:>12.1f}{report['bytes_per_note']:>12.1f}")
+    lines.append(f"{report['notes']} notes")
+    return '\n'.join(lines)
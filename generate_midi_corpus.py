@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Generate reproducible synthetic MIDI files for scale testing.
+
+Files are written straight to disk as Standard MIDI File bytes, one track
+at a time, so even multi-million-note files are produced in constant
+memory. The same seed and parameters always give the same file.
+
+    python generate_midi_corpus.py big.mid --notes 2000000 --tracks 16 --channels 16
+    python generate_midi_corpus.py --corpus corpus/ --sizes 1000,10000,100000
+
+Besides size, the generator varies track and channel counts, tempo changes,
+polyphony, repeated notes of the same pitch separated by tiny gaps (what
+create_gaps works on), sysex messages and running status.
+"""
+import argparse
+import heapq
+import inspect
+import os
+import random
+import struct
+import sys
+
+FLUSH_BYTES = 1 << 16
+SYSEX_GM_RESET = bytes([0x7E, 0x7F, 0x09, 0x01, 0xF7])
+DURATIONS = (1 / 8, 1 / 4, 1 / 2, 1, 2)  # Note lengths in beats
+STEPS = (0, 0, 1 / 8, 1 / 4, 1 / 2)  # Beats between note starts (0 = chord)
+MEAN_STEP = sum(STEPS) / len(STEPS)
+
+
+def varlen(value):
+    """MIDI variable-length quantity"""
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.insert(0, 0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(out)
+
+
+class TrackWriter:
+    """Streams one MTrk chunk, patching its length once the track ends"""
+    def __init__(self, f, running_status=True):
+        self.f = f
+        self.running_status = running_status
+        self.buffer = bytearray()
+        self.length = 0
+        self.tick = 0
+        self.last_status = None
+        f.write(b'MTrk')
+        self.length_offset = f.tell()
+        f.write(b'\0\0\0\0')
+
+    def _delta(self, tick):
+        self.buffer += varlen(tick - self.tick)
+        self.tick = tick
+
+    def channel(self, tick, status, *data):
+        self._delta(tick)
+        if not (self.running_status and status == self.last_status):
+            self.buffer.append(status)
+        self.last_status = status
+        self.buffer += bytes(data)
+        self._maybe_flush()
+
+    def meta(self, tick, meta_type, data):
+        self._delta(tick)
+        self.buffer += bytes([0xFF, meta_type]) + varlen(len(data)) + data
+        self.last_status = None  # Meta and sysex events cancel running status
+        self._maybe_flush()
+
+    def sysex(self, tick, data):
+        self._delta(tick)
+        self.buffer += b'\xF0' + varlen(len(data)) + data
+        self.last_status = None
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.buffer) >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        self.f.write(self.buffer)
+        self.length += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        self.meta(self.tick, 0x2F, b'')
+        self._flush()
+        end = self.f.tell()
+        self.f.seek(self.length_offset)
+        self.f.write(struct.pack('>I', self.length))
+        self.f.seek(end)
+
+
+def track_channels(track, tracks, channels):
+    """Channels a note track plays on; channels are shared out round-robin"""
+    return [ch for ch in range(channels) if ch % tracks == track % tracks] or [track % channels]
+
+
+def write_conductor_track(f, rng, ticks_per_beat, tempo_changes, song_ticks):
+    track = TrackWriter(f)
+    track.meta(0, 0x58, bytes([4, 2, 24, 8]))  # 4/4
+    track.meta(0, 0x51, (500000).to_bytes(3, 'big'))
+    spacing = max(ticks_per_beat, song_ticks // (tempo_changes + 1))
+    for i in range(1, tempo_changes + 1):
+        bpm = rng.randint(60, 200)
+        track.meta(i * spacing, 0x51, (60000000 // bpm).to_bytes(3, 'big'))
+    track.close()
+
+
+def write_note_track(f, rng, notes, channels, ticks_per_beat, polyphony, repeat_density,
+                     sysex_rate, running_status):
+    """Write one note track; returns the number of notes written"""
+    track = TrackWriter(f, running_status)
+    for ch in channels:
+        track.channel(0, 0xC0 | ch, rng.randrange(128))
+        track.channel(0, 0xB0 | ch, 7, 100)
+    sounding = []  # Heap of (off_tick, channel, pitch)
+    off_ticks = {}  # (channel, pitch) -> off tick of the sounding note
+    tick = 0
+    last = None
+
+    def release_until(until):
+        while sounding and sounding[0][0] <= until:
+            off_tick, ch, pitch = heapq.heappop(sounding)
+            del off_ticks[(ch, pitch)]
+            if running_status:
+                track.channel(off_tick, 0x90 | ch, pitch, 0)  # Note-on velocity 0 keeps running status
+            else:
+                track.channel(off_tick, 0x80 | ch, pitch, 64)
+
+    for _ in range(notes):
+        tick += int(rng.choice(STEPS) * ticks_per_beat)
+        if last is not None and rng.random() < repeat_density:
+            # Retrigger the previous pitch just after it ends, leaving a tiny gap
+            ch, pitch = last
+            tick = max(tick, off_ticks.get(last, tick) + rng.randint(0, ticks_per_beat // 32))
+        else:
+            ch = rng.choice(channels)
+            pitch = rng.randint(21, 108)
+        release_until(tick)
+        while len(sounding) >= polyphony or (ch, pitch) in off_ticks:
+            tick = max(tick, sounding[0][0])
+            release_until(tick)
+        if sysex_rate and rng.random() < sysex_rate:
+            track.sysex(tick, SYSEX_GM_RESET)
+        track.channel(tick, 0x90 | ch, pitch, rng.randint(1, 127))
+        off_tick = tick + max(1, int(rng.choice(DURATIONS) * ticks_per_beat))
+        heapq.heappush(sounding, (off_tick, ch, pitch))
+        off_ticks[(ch, pitch)] = off_tick
+        last = (ch, pitch)
+    release_until(float('inf'))
+    track.close()
+    return notes
+
+
+def generate_corpus(path, notes=1000, tracks=4, channels=4, tempo_changes=8, polyphony=8,
+                    repeat_density=0.2, sysex=0, running_status=True, ticks_per_beat=480, seed=0):
+    """Write a type 1 MIDI file with a conductor track and `tracks` note tracks.
+
+    notes are shared evenly between the note tracks; sysex is the total
+    number of sysex messages to expect, scattered at random between notes.
+    Returns a summary of what was written.
+    """
+    if not 1 <= channels <= 16:
+        raise ValueError("channels must be between 1 and 16")
+    if tracks < 1 or polyphony < 1 or notes < 0:
+        raise ValueError("tracks and polyphony must be at least 1, notes at least 0")
+    per_track = [notes // tracks + (1 if i < notes % tracks else 0) for i in range(tracks)]
+    song_ticks = int(max(per_track) * MEAN_STEP * ticks_per_beat)
+    sysex_rate = sysex / notes if notes else 0.0
+    with open(path, 'wb') as f:
+        f.write(b'MThd' + struct.pack('>IHHH', 6, 1, tracks + 1, ticks_per_beat))
+        write_conductor_track(f, random.Random(f'{seed}-tempo'), ticks_per_beat, tempo_changes, song_ticks)
+        written = 0
+        for i, count in enumerate(per_track):
+            written += write_note_track(f, random.Random(f'{seed}-{i}'), count,
+                                        track_channels(i, tracks, channels), ticks_per_beat,
+                                        polyphony, repeat_density, sysex_rate, running_status)
+        size = f.tell()
+    return {'path': path, 'notes': written, 'tracks': tracks + 1, 'bytes': size}
+
+
+def corpus_name(notes, seed=0, **options):
+    """File name for a corpus file; every option that differs from its default is in the name"""
+    defaults = inspect.signature(generate_corpus).parameters
+    suffix = ''.join(f'-{key}{value}' for key, value in sorted(options.items())
+                     if value != defaults[key].default)
+    return f'synthetic-{notes}-s{seed}{suffix}.mid'
+
+
+def corpus_path(notes, directory='corpus', seed=0, **options):
+    """Path of a corpus file with these parameters, generating it if missing"""
+    path = os.path.join(directory, corpus_name(notes, seed, **options))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        partial = path + '.part'
+        generate_corpus(partial, notes=notes, seed=seed, **options)
+        os.replace(partial, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic MIDI files for scale testing")
+    parser.add_argument('output', nargs='?', help="MIDI file to write")
+    parser.add_argument('--corpus', metavar='DIR', help="Write one file per --sizes entry into DIR")
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000,2000000',
+                        help="Comma-separated note counts for --corpus")
+    parser.add_argument('--notes', type=int, default=1000)
+    parser.add_argument('--tracks', type=int, default=4, help="Note tracks (a conductor track is added)")
+    parser.add_argument('--channels', type=int, default=4)
+    parser.add_argument('--tempo-changes', type=int, default=8)
+    parser.add_argument('--polyphony', type=int, default=8, help="Maximum notes sounding per track")
+    parser.add_argument('--repeat-density', type=float, default=0.2,
+                        help="Fraction of notes that retrigger the previous pitch after a tiny gap")
+    parser.add_argument('--sysex', type=int, default=0, help="Approximate number of sysex messages")
+    parser.add_argument('--no-running-status', action='store_true')
+    parser.add_argument('--ticks-per-beat', type=int, default=480)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if not args.output and not args.corpus:
+        parser.error("give an output file or --corpus DIR")
+
+    options = dict(tracks=args.tracks, channels=args.channels, tempo_changes=args.tempo_changes,
+                   polyphony=args.polyphony, repeat_density=args.repeat_density, sysex=args.sysex,
+                   running_status=not args.no_running_status, ticks_per_beat=args.ticks_per_beat,
+                   seed=args.seed)
+    try:
+        if args.output:
+            summary = generate_corpus(args.output, notes=args.notes, **options)
+            print(f"✓ Wrote {summary['notes']} notes in {summary['tracks']} tracks "
+                  f"({summary['bytes']} bytes) to {summary['path']}")
+        if args.corpus:
+            os.makedirs(args.corpus, exist_ok=True)
+            for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+                path = os.path.join(args.corpus, corpus_name(size, **options))
+                summary = generate_corpus(path, notes=size, **options)
+                print(f"✓ {path}: {summary['notes']} notes, {summary['bytes']} bytes")
+    except (OSError, ValueError) as e:
+        print(f"✗ Generation failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Replay scroll, seek and play/pause input into the GUI and report
+input-to-paint latency per interaction type.
+
+    xvfb-run -a python interaction_replay.py song.mid input-recording.jsonl
+    xvfb-run -a python interaction_replay.py song.mid --synthetic 30 --json latency.json
+
+Recordings come from the GUI's input recorder (Ctrl+Shift+I). Inputs are
+fed through MidiGapperGUI.dispatch_input at their recorded times, so wheel
+bursts and key repeat coalesce exactly as they did live. An input counts
+as painted at the end of the first Tk update() after it in which no
+coalesced scroll is still waiting for its frame.
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from diagnostics import TimingStat, load_input_recording
+
+INTERACTION_KINDS = ('wheel', 'arrow', 'scrollbar', 'seek', 'play_pause')
+SCROLL_STEP = 75  # Units per wheel notch or arrow press, as bound in the GUI
+
+
+def synthetic_session(duration=20.0, seed=0):
+    """A seeded input sequence of wheel bursts, arrow repeat, scrollbar drags, seeks and play/pause"""
+    rng = random.Random(seed)
+    events = []
+    t = 0.5
+    while t < duration:
+        gesture = rng.choices(INTERACTION_KINDS, weights=(4, 2, 2, 2, 1))[0]
+        if gesture == 'wheel':
+            direction = rng.choice((-1, 1))
+            for _ in range(rng.randint(5, 20)):
+                events.append((t, 'wheel', (direction * SCROLL_STEP,)))
+                t += rng.uniform(0.008, 0.015)
+        elif gesture == 'arrow':
+            direction = rng.choice((-1, 1))
+            for _ in range(rng.randint(10, 30)):
+                events.append((t, 'arrow', (direction * SCROLL_STEP,)))
+                t += 0.033  # Typical key repeat rate
+        elif gesture == 'scrollbar':
+            fraction = rng.random()
+            step = rng.choice((-1, 1)) * rng.uniform(0.002, 0.01)
+            for _ in range(rng.randint(20, 60)):
+                fraction = min(1.0, max(0.0, fraction + step))
+                events.append((t, 'scrollbar', ('moveto', f'{fraction:.4f}')))
+                t += 0.016
+        elif gesture == 'seek':
+            delta = rng.choice((-5.0, -1.0, 1.0, 5.0))
+            for _ in range(rng.randint(1, 5)):
+                events.append((t, 'seek', (delta,)))
+                t += 0.15
+        else:
+            events.append((t, 'play_pause', ()))
+            t += rng.uniform(0.5, 2.0)
+            events.append((t, 'play_pause', ()))
+        t += rng.uniform(0.2, 1.0)
+    return events
+
+
+def replay(app, events, speed=1.0):
+    """Dispatch (t, kind, args) events into app at their times; returns {kind: [latency seconds]}"""
+    latencies = {}
+    waiting = []  # (kind, input time) not yet painted
+
+    def pump():
+        app.update()
+        if waiting and app.scroll_coalescer.idle:
+            app.update_idletasks()
+            painted = time.perf_counter()
+            for kind, input_time in waiting:
+                latencies.setdefault(kind, []).append(painted - input_time)
+            waiting.clear()
+
+    start = time.perf_counter()
+    for t, kind, args in events:
+        due = start + t / speed
+        while True:
+            pump()
+            remaining = due - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.001))
+        waiting.append((kind, time.perf_counter()))
+        app.dispatch_input(kind, *args)
+    deadline = time.perf_counter() + 1.0
+    while waiting and time.perf_counter() < deadline:
+        pump()
+        time.sleep(0.001)
+    if app.is_playing:
+        app.toggle_play_pause()
+    return latencies
+
+
+def latency_report(latencies):
+    """{kind: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+    report = {}
+    for kind, values in sorted(latencies.items()):
+        stat = TimingStat(len(values))
+        for value in values:
+            stat.add(int(value * 1e9))
+        report[kind] = stat.summary()
+    return report
+
+
+def format_report(report):
+    lines = [f"{'interaction':<12}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+    for kind, row in report.items():
+        lines.append(f"{kind:<12}{row['count']:>7}{row['mean_ms']:>9.2f}{row['p50_ms']:>9.2f}"
+                     f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}")
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def isolated_app(config=None):
+    """A MidiGapperGUI on a throwaway config.json, with the silent synth and dialogs suppressed"""
+    import main
+
+    settings = {'synth_backend': 'null', 'stall_budget_ms': 0, 'geometry': '1400x900'}
+    settings.update(config or {})
+    saved = main.CONFIG_FILE, main.messagebox.showinfo, main.messagebox.showwarning, main.messagebox.showerror
+    with tempfile.TemporaryDirectory() as tmp:
+        main.CONFIG_FILE = os.path.join(tmp, 'config.json')
+        with open(main.CONFIG_FILE, 'w') as f:
+            json.dump(settings, f)
+        main.messagebox.showinfo = main.messagebox.showwarning = main.messagebox.showerror = \
+            lambda *args, **kwargs: None
+        app = None
+        try:
+            app = main.MidiGapperGUI()
+            app.update()
+            yield app
+        finally:
+            if app is not None:
+                app.destroy()
+            (main.CONFIG_FILE, main.messagebox.showinfo,
+             main.messagebox.showwarning, main.messagebox.showerror) = saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded input and report input-to-paint latency")
+    parser.add_argument('midi', help="MIDI file to load before replaying")
+    parser.add_argument('recording', nargs='?', help="Input recording (JSON lines) from Ctrl+Shift+I")
+    parser.add_argument('--synthetic', type=float, metavar='SECONDS',
+                        help="Replay a generated session of this length instead of a recording")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for --synthetic")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed factor")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+    if bool(args.recording) == bool(args.synthetic):
+        parser.error("give either a recording or --synthetic SECONDS")
+
+    events = (load_input_recording(args.recording) if args.recording
+              else synthetic_session(args.synthetic, args.seed))
+    with tempfile.TemporaryDirectory() as tmp, isolated_app() as app:
+        # process_midi writes its XML beside the file, so load a copy
+        midi_copy = os.path.join(tmp, os.path.basename(args.midi))
+        with open(args.midi, 'rb') as src, open(midi_copy, 'wb') as dst:
+            dst.write(src.read())
+        app.process_midi(midi_copy)
+        app.update()
+        report = latency_report(replay(app, events, args.speed))
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
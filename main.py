@@ -1,18 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import os
+import sys
 import json
 import mido
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 import random
 import shutil
+import tempfile
 import traceback
 from tkinter import messagebox
 from mido import MidiFile, MidiTrack
 import tkinter.font as tkfont
 import threading
 import time
+import bisect
+import importlib.util
+from array import array
+
+import diagnostics
+from diagnostics import DEBUG, TIMING_STATS, TRACER, get_logger, stage_timer, timed
+
+log_load = get_logger('load')
+log_render = get_logger('render')
+log_playback = get_logger('playback')
+log_gap = get_logger('gap')
+log_io = get_logger('io')
 
 # Predefined distinct colors for channels
 DEFAULT_CHANNEL_COLORS = [    '#e6194b', '#3cb44b', '#ffe119', '#4363d8', '#f58231', '#911eb4',
@@ -58,26 +72,257 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, f)
 
-class FluidSynthPlayer:
-    """MIDI note player using FluidSynth software synthesizer"""
-    def __init__(self, soundfont_path=None):
+class SynthBackend:
+    """Interface the playback scheduler drives.
+
+    Backends receive channel-voice events (note_on, note_off, cc, program,
+    pitch_bend), can silence everything with panic(), and render(frames)
+    returns that many frames of interleaved stereo int16 samples. midi_out
+    is truthy when the backend can accept events (kept under its historical
+    name for the GUI code that checks it).
+    """
+    name = 'none'
+    midi_out = None
+    latency = None  # Output latency in seconds, when known
+
+    def note_on(self, channel, note, velocity=64):
+        pass
+
+    def note_off(self, channel, note):
+        pass
+
+    def cc(self, channel, control, value):
+        pass
+
+    def program(self, channel, program):
+        pass
+
+    def pitch_bend(self, channel, value):
+        """value is -8192..8191, 0 = centre"""
+        pass
+
+    def panic(self):
+        """Silence every channel immediately"""
+        pass
+
+    def render(self, frames):
+        """Return frames of interleaved stereo int16 samples (silence by default)"""
+        return array('h', bytes(4 * frames))
+
+    def close(self):
+        self.midi_out = None
+
+    # Older callers use the underscored names
+    def _note_on(self, channel, note, velocity=64):
+        self.note_on(channel, note, velocity)
+
+    def _note_off(self, channel, note):
+        self.note_off(channel, note)
+
+
+class NullBackend(SynthBackend):
+    """Accepts every event and produces silence; for headless playback"""
+    name = 'null'
+
+    def __init__(self):
+        self.midi_out = self
+
+
+class RecordingBackend(SynthBackend):
+    """Timestamps every call with perf_counter instead of making sound.
+
+    calls holds (time, method, channel, data1, data2) tuples, with time
+    relative to construction; unused fields are 0 (channel is None for panic
+    and render). Used to measure scheduling accuracy and throughput.
+    """
+    name = 'recording'
+
+    def __init__(self):
+        self.midi_out = self
+        self.calls = []
+        self.t0 = time.perf_counter()
+
+    def _record(self, method, channel=None, data1=0, data2=0):
+        self.calls.append((time.perf_counter() - self.t0, method, channel, data1, data2))
+
+    def note_on(self, channel, note, velocity=64):
+        self._record('note_on', channel, note, velocity)
+
+    def note_off(self, channel, note):
+        self._record('note_off', channel, note)
+
+    def cc(self, channel, control, value):
+        self._record('cc', channel, control, value)
+
+    def program(self, channel, program):
+        self._record('program', channel, program)
+
+    def pitch_bend(self, channel, value):
+        self._record('pitch_bend', channel, value)
+
+    def panic(self):
+        self._record('panic')
+
+    def render(self, frames):
+        self._record('render', None, frames)
+        return super().render(frames)
+
+
+# config.json keys that are passed to FluidSynth: synth settings select the
+# shared synth instance, driver settings only affect its audio output
+SYNTH_SETTING_KEYS = ('synth.sample-rate',)
+AUDIO_DRIVER_SETTING_KEYS = ('audio.period-size', 'audio.periods', 'audio.file.name')
+
+
+def default_audio_driver():
+    """FluidSynth audio driver for this platform"""
+    if sys.platform.startswith('win'):
+        return 'dsound'
+    if sys.platform == 'darwin':
+        return 'coreaudio'
+    return 'pulseaudio'
+
+
+def fluidsynth_config(config):
+    """Split config.json audio keys into (driver, synth settings, driver settings).
+
+    Values keep FluidSynth's types: sample rate is a float setting, period
+    size and count are ints and the file name is a string.
+    """
+    driver = config.get('audio.driver') or default_audio_driver()
+    settings = {}
+    if config.get('synth.sample-rate'):
+        settings['synth.sample-rate'] = float(config['synth.sample-rate'])
+    driver_settings = {}
+    for key in AUDIO_DRIVER_SETTING_KEYS:
+        value = config.get(key)
+        if value is not None:
+            driver_settings[key] = value if key == 'audio.file.name' else int(value)
+    return driver, settings, driver_settings
+
+
+class SynthRegistry:
+    """Process-wide cache of FluidSynth synths and the soundfonts loaded into them.
+
+    Synths are keyed by their settings and soundfonts by (settings, path), so
+    re-selecting an output reuses the synth with its soundfonts already in
+    memory and only a new audio driver is started. General MIDI soundfonts
+    run to hundreds of MB, which made every reconnect take seconds.
+    """
+    def __init__(self, synth_factory=None):
+        self._synth_factory = synth_factory  # Defaults to fluidsynth.Synth
+        self._lock = threading.RLock()
+        self._synths = {}  # settings key -> synth
+        self._soundfonts = {}  # (settings key, path) -> sfid
+
+    @staticmethod
+    def settings_key(settings):
+        return tuple(sorted((settings or {}).items()))
+
+    def synth(self, settings=None):
+        """Return the shared synth for settings, creating it on first use"""
+        key = self.settings_key(settings)
+        with self._lock:
+            fs = self._synths.get(key)
+            if fs is None:
+                factory = self._synth_factory
+                if factory is None:
+                    import fluidsynth
+                    factory = fluidsynth.Synth
+                fs = factory(**dict(key))
+                self._synths[key] = fs
+            return fs
+
+    def soundfont(self, path, settings=None):
+        """Return the sfid of path in the synth for settings, loading it only once"""
+        key = (self.settings_key(settings), os.path.abspath(path))
+        with self._lock:
+            sfid = self._soundfonts.get(key)
+            if sfid is None:
+                sfid = self.synth(settings).sfload(path)
+                if sfid < 0:
+                    raise RuntimeError(f"FluidSynth could not load {path}")
+                self._soundfonts[key] = sfid
+            return sfid
+
+    def is_loaded(self, path, settings=None):
+        return (self.settings_key(settings), os.path.abspath(path)) in self._soundfonts
+
+    def preload(self, paths, settings=None):
+        """Load soundfonts into the shared synth on a background thread; returns the thread"""
+        def work():
+            for path in paths:
+                if not os.path.exists(path):
+                    log_io.warning("⚠ Soundfont to preload not found: %s", path)
+                    continue
+                try:
+                    self.soundfont(path, settings)
+                    log_io.info("✓ Preloaded soundfont: %s", path)
+                except Exception as e:
+                    log_io.warning("⚠ Failed to preload %s: %s", path, e)
+
+        thread = threading.Thread(target=work, name='SoundfontPreload', daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        """Delete every cached synth"""
+        with self._lock:
+            for fs in self._synths.values():
+                try:
+                    fs.delete()
+                except Exception:
+                    pass
+            self._synths.clear()
+            self._soundfonts.clear()
+
+
+SYNTH_REGISTRY = SynthRegistry()
+
+
+class FluidSynthPlayer(SynthBackend):
+    """MIDI note player using FluidSynth software synthesizer.
+
+    The synth and its soundfonts come from a SynthRegistry; each player only
+    owns its audio driver, which close() stops.
+    """
+    name = 'fluidsynth'
+
+    def __init__(self, soundfont_path=None, settings=None, driver=None, driver_settings=None, registry=None,
+                 start_audio=True):
         self.fs = None
         self.midi_out = None  # Keep for compatibility with existing code
         self.soundfont_path = soundfont_path
+        self.settings = settings or {}  # FluidSynth settings the synth is created with
+        self.driver = driver or default_audio_driver()
+        self.driver_settings = driver_settings or {}  # Buffering for this player's output
+        self.registry = registry or SYNTH_REGISTRY
+        self.start_audio = start_audio  # False for offline rendering with render()
+        self.audio_driver = None
+        self.sfid = None  # Id of the loaded soundfont, used for program selection
+        self.channel_banks = {}  # channel -> bank selected with CC 0
         self.initialize_fluidsynth()
     
     def initialize_fluidsynth(self):
         """Initialize FluidSynth with comprehensive diagnostics"""
-        print("\n=== FluidSynth Setup Diagnostics ===")
+        log_load.debug("=== FluidSynth Setup Diagnostics ===")
         
         try:
             import fluidsynth
-            print("✓ FluidSynth imported successfully")
-            
-            # Create FluidSynth instance
-            self.fs = fluidsynth.Synth()
-            self.fs.start(driver="dsound")  # Use DirectSound on Windows
-            print("✓ FluidSynth synthesizer started")
+            log_load.debug("✓ FluidSynth imported successfully")
+            
+            # Get the shared FluidSynth instance and start our own output on it
+            self.fs = self.registry.synth(self.settings)
+            if self.start_audio:
+                for option, value in self.driver_settings.items():
+                    self.fs.setting(option, value)
+                self.fs.start(driver=self.driver)
+                self.audio_driver = self.fs.audio_driver
+                self.latency = self._effective_latency()
+                latency_text = f", {self.latency * 1000:.1f}ms latency" if self.latency else ""
+                log_load.info("✓ FluidSynth synthesizer started (%s%s)", self.driver, latency_text)
+            else:
+                log_load.info("✓ FluidSynth synthesizer created for offline rendering")
             
             # Load a soundfont
             soundfont_loaded = False
@@ -85,12 +330,13 @@ class FluidSynthPlayer:
             # Try user-specified soundfont first
             if self.soundfont_path and os.path.exists(self.soundfont_path):
                 try:
-                    sfid = self.fs.sfload(self.soundfont_path)
+                    sfid = self.registry.soundfont(self.soundfont_path, self.settings)
                     self.fs.program_select(0, sfid, 0, 0)  # Channel 0, Bank 0, Preset 0
-                    print(f"✓ Loaded custom soundfont: {self.soundfont_path}")
+                    self.sfid = sfid
+                    log_load.info("✓ Loaded custom soundfont: %s", self.soundfont_path)
                     soundfont_loaded = True
                 except Exception as e:
-                    print(f"⚠ Failed to load custom soundfont: {e}")
+                    log_load.warning("⚠ Failed to load custom soundfont: %s", e)
             
             # Try common Windows soundfont locations
             if not soundfont_loaded:
@@ -103,43 +349,46 @@ class FluidSynthPlayer:
                 for location in common_locations:
                     if os.path.exists(location):
                         try:
-                            sfid = self.fs.sfload(location)
+                            sfid = self.registry.soundfont(location, self.settings)
                             self.fs.program_select(0, sfid, 0, 0)
-                            print(f"✓ Loaded soundfont: {location}")
+                            self.sfid = sfid
+                            log_load.info("✓ Loaded soundfont: %s", location)
                             soundfont_loaded = True
                             break
                         except Exception as e:
-                            print(f"⚠ Failed to load {location}: {e}")
+                            log_load.warning("⚠ Failed to load %s: %s", location, e)
             
             if not soundfont_loaded:
-                print("⚠ No soundfont loaded - will use FluidSynth's built-in sounds")
+                log_load.warning("⚠ No soundfont loaded - will use FluidSynth's built-in sounds")
                 # FluidSynth can still work without a soundfont using built-in samples
             
             # Set this as available for compatibility
             self.midi_out = self  # Self-reference to indicate MIDI is available
             
-            # Test with a quick note
-            try:
-                self.fs.noteon(0, 60, 30)  # Channel 0, Middle C, velocity 30
-                time.sleep(0.1)
-                self.fs.noteoff(0, 60)
-                print("✓ FluidSynth test note played successfully")
-            except Exception as test_e:
-                print(f"⚠ FluidSynth initialized but test failed: {test_e}")
-            
-            print("✓ FluidSynth MIDI playback ready!")
+            log_load.info("✓ FluidSynth MIDI playback ready!")
                 
         except ImportError as e:
-            print(f"✗ FluidSynth import failed: {e}")
+            log_load.error("✗ FluidSynth import failed: %s", e)
             self._print_fluidsynth_setup_instructions()
             self.fs = None
             self.midi_out = None
         except Exception as e:
-            print(f"✗ Failed to initialize FluidSynth: {e}")
+            log_load.error("✗ Failed to initialize FluidSynth: %s", e)
+            self._stop_audio_driver()
             self.fs = None
             self.midi_out = None
             
-        print("=====================================\n")
+        log_load.debug("=====================================")
+    
+    def _effective_latency(self):
+        """Output buffer latency in seconds as FluidSynth applied it, or None"""
+        try:
+            period_size = self.fs.get_setting('audio.period-size')
+            periods = self.fs.get_setting('audio.periods')
+            sample_rate = self.fs.get_setting('synth.sample-rate')
+            return period_size * periods / sample_rate
+        except Exception:
+            return None
     
     def _print_fluidsynth_setup_instructions(self):
         """Print FluidSynth installation instructions"""
@@ -157,59 +406,1269 @@ class FluidSynthPlayer:
         print("🔄 Restart the application after installing pyfluidsynth")
         print("📖 The visualization will still work without MIDI audio")
     
-    def _note_on(self, channel, note, velocity=64):
+    def note_on(self, channel, note, velocity=64):
         """Send a note-on message"""
         if self.fs:
             try:
                 self.fs.noteon(channel, note, velocity)
             except Exception as e:
-                print(f"Error sending note_on: {e}")
+                log_playback.error("Error sending note_on: %s", e)
     
-    def _note_off(self, channel, note):
+    def note_off(self, channel, note):
         """Send a note-off message"""
         if self.fs:
             try:
                 self.fs.noteoff(channel, note)
             except Exception as e:
-                print(f"Error sending note_off: {e}")
+                log_playback.error("Error sending note_off: %s", e)
     
-    def close(self):
-        """Close the FluidSynth synthesizer"""
+    def cc(self, channel, control, value):
+        """Send a control change (sustain, volume, pan, bank select, ...)"""
+        if control == 0:
+            self.channel_banks[channel] = value
         if self.fs:
             try:
-                self.fs.delete()
-            except:
-                pass
+                self.fs.cc(channel, control, value)
+            except Exception as e:
+                log_playback.error("Error sending control_change: %s", e)
+    
+    def program(self, channel, program):
+        """Select an instrument on a channel from the loaded soundfont"""
+        if self.fs:
+            try:
+                if self.sfid is not None:
+                    # Drums live in bank 128 unless the file selects another bank
+                    bank = self.channel_banks.get(channel, 128 if channel == 9 else 0)
+                    self.fs.program_select(channel, self.sfid, bank, program)
+                else:
+                    self.fs.program_change(channel, program)
+            except Exception as e:
+                log_playback.error("Error sending program_change: %s", e)
+    
+    def pitch_bend(self, channel, value):
+        """Send a pitch bend (-8192..8191, 0 = centre)"""
+        if self.fs:
+            try:
+                self.fs.pitch_bend(channel, value)
+            except Exception as e:
+                log_playback.error("Error sending pitch_bend: %s", e)
+    
+    def panic(self):
+        """Release pedals and cut every sounding voice on all channels"""
+        if self.fs:
+            try:
+                for channel in range(16):
+                    self.fs.cc(channel, 64, 0)
+                    self.fs.all_sounds_off(channel)
+            except Exception as e:
+                log_playback.error("Error sending panic: %s", e)
+    
+    def render(self, frames):
+        """Pull frames of interleaved stereo int16 samples from the synth"""
+        if self.fs:
+            return self.fs.get_samples(frames)
+        return super().render(frames)
+    
+    def _stop_audio_driver(self):
+        """Stop this player's output; the shared synth stays loaded"""
+        if self.audio_driver is None:
+            return
+        try:
+            import fluidsynth
+            fluidsynth.delete_fluid_audio_driver(self.audio_driver)
+        except Exception:
+            pass
+        if self.fs is not None and getattr(self.fs, 'audio_driver', None) is self.audio_driver:
+            self.fs.audio_driver = None
+        self.audio_driver = None
+    
+    def close(self):
+        """Stop this player's audio output, keeping the synth and soundfonts cached"""
+        if self.fs:
+            self.panic()
+            self._stop_audio_driver()
             self.fs = None
             self.midi_out = None
 
 # Keep the old MidiNotePlayer as an alias for backwards compatibility
 MidiNotePlayer = FluidSynthPlayer
 
+SYNTH_BACKENDS = {
+    'fluidsynth': FluidSynthPlayer,
+    'null': NullBackend,
+    'recording': RecordingBackend,
+}
+
+
+def create_synth_backend(name='fluidsynth', **kwargs):
+    """Create a synth backend by name ('fluidsynth', 'null' or 'recording')"""
+    try:
+        backend_class = SYNTH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown synth backend: {name}") from None
+    return backend_class(**kwargs)
+
+class SynthLoader:
+    """Builds synth backends on a background thread so the UI never waits on them.
+
+    load(factory, on_ready) runs factory() on a worker thread and polls for the
+    result from the Tk loop, calling on_ready(backend) on the Tk thread
+    (backend is None if the factory failed). A newer load() or cancel()
+    supersedes a pending one; its backend is closed when it arrives.
+    """
+    POLL_MS = 50
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.loading = False
+        self._generation = 0
+
+    def load(self, factory, on_ready):
+        self._generation += 1
+        generation = self._generation
+        self.loading = True
+        result = {}
+
+        def work():
+            try:
+                result['backend'] = factory()
+            except Exception as e:
+                log_playback.error("⚠ Synth initialization failed: %s", e)
+
+        thread = threading.Thread(target=work, name='SynthLoader', daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                self.widget.after(self.POLL_MS, poll)
+                return
+            backend = result.get('backend')
+            if generation != self._generation:
+                # Superseded while loading
+                if backend is not None:
+                    backend.close()
+                return
+            self.loading = False
+            on_ready(backend)
+
+        self.widget.after(self.POLL_MS, poll)
+
+    def cancel(self):
+        """Drop any pending load"""
+        self._generation += 1
+        self.loading = False
+
+
+class NoteIntervalIndex:
+    """Time index over the note table answering "which notes sound at time t".
+
+    Notes are kept sorted by start time with an implicit balanced tree laid over
+    the sorted arrays. Every tree node stores the latest end time found in its
+    subtree, so a query only descends into branches that can still contain a
+    sounding note: O(log n + k) for k active notes instead of a full scan.
+    """
+    def __init__(self, notes=()):
+        # notes: sequence of (start_time, note, channel, duration) tuples.
+        # The position of a note in that sequence is its note id.
+        order = sorted(range(len(notes)), key=lambda i: notes[i][0])
+        self.ids = order
+        self.starts = [notes[i][0] for i in order]
+        self.ends = [notes[i][0] + notes[i][3] for i in order]
+        self.max_end = list(self.ends)
+        if order:
+            self._build(0, len(order))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build(self, lo, hi):
+        """Fill max_end for the subtree rooted at the middle of [lo, hi)"""
+        mid = (lo + hi) // 2
+        best = self.ends[mid]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self.max_end[mid] = best
+        return best
+
+    def active_at(self, t):
+        """Return the ids of notes with start <= t < end"""
+        result = []
+        if not self.ids:
+            return result
+        starts, ends, max_end, ids = self.starts, self.ends, self.max_end, self.ids
+        stack = [(0, len(ids))]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            # Skip subtrees that only start in the future or already ended
+            if starts[lo] > t or max_end[mid] <= t:
+                continue
+            if lo < mid:
+                stack.append((lo, mid))
+            if starts[mid] <= t:
+                if ends[mid] > t:
+                    result.append(ids[mid])
+                if mid + 1 < hi:
+                    stack.append((mid + 1, hi))
+        return result
+
+class KeyboardHighlighter:
+    """Colours keyboard keys for the active notes, touching only keys that changed.
+
+    The previously highlighted set is kept between frames so an unchanged frame
+    costs no Tk calls at all. tk_calls_last_frame reports the itemconfig calls
+    issued by the most recent update.
+    """
+    BLACK_SEMITONES = {1, 3, 6, 8, 10}
+    COLORS = {
+        # (is_black, highlighted) -> fill colour
+        (False, False): 'white',
+        (True, False): '#1a1a1a',
+        (False, True): '#B0D0FF',  # Light blue for white keys
+        (True, True): '#4080FF',   # Bright blue for black keys
+    }
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.keys = {}  # MIDI note number -> canvas item id
+        self.highlighted = set()
+        self.tk_calls_last_frame = 0
+        self.tk_calls_total = 0
+        self.frames = 0
+
+    def reset(self, keys):
+        """Track a freshly drawn keyboard whose keys all show their default colour"""
+        self.keys = keys
+        self.highlighted = set()
+
+    def _fill(self, note, highlighted):
+        is_black = note % 12 in self.BLACK_SEMITONES
+        self.canvas.itemconfig(self.keys[note], fill=self.COLORS[(is_black, highlighted)])
+
+    def update(self, notes):
+        """Highlight exactly the given note numbers; return the Tk calls issued"""
+        notes = {note for note in notes if note in self.keys}
+        calls = 0
+        for note in self.highlighted - notes:
+            self._fill(note, False)
+            calls += 1
+        for note in notes - self.highlighted:
+            self._fill(note, True)
+            calls += 1
+        self.highlighted = notes
+        self.tk_calls_last_frame = calls
+        self.tk_calls_total += calls
+        self.frames += 1
+        return calls
+
+class LedClockDisplay:
+    """LED-style MM:SS.mmm clock drawn once and updated segment by segment.
+
+    The 7-segment polygons and separator dots are created when the layout is
+    first needed. Each update recolours only the segments whose on/off state
+    changed, so a clock tick costs a handful of itemconfig calls.
+    """
+    ON_COLOR = '#00FF00'   # Bright green for active segments
+    OFF_COLOR = '#003300'  # Dark green for inactive segments
+    CHAR_WIDTH = 18        # Character width
+    CHAR_SPACING = 3       # Spacing between characters
+    CANVAS_WIDTH = 200
+    CANVAS_HEIGHT = 40
+    DIGIT_HEIGHT = 24
+
+    # 7-segment display patterns for digits 0-9
+    # (top, top-right, bottom-right, bottom, bottom-left, top-left, middle)
+    SEGMENTS = {
+        '0': (1, 1, 1, 1, 1, 1, 0),
+        '1': (0, 1, 1, 0, 0, 0, 0),
+        '2': (1, 1, 0, 1, 1, 0, 1),
+        '3': (1, 1, 1, 1, 0, 0, 1),
+        '4': (0, 1, 1, 0, 0, 1, 1),
+        '5': (1, 0, 1, 1, 0, 1, 1),
+        '6': (1, 0, 1, 1, 1, 1, 1),
+        '7': (1, 1, 1, 0, 0, 0, 0),
+        '8': (1, 1, 1, 1, 1, 1, 1),
+        '9': (1, 1, 1, 1, 0, 1, 1),
+    }
+    BLANK = (0, 0, 0, 0, 0, 0, 0)
+
+    # Segment coordinates (relative to the character position)
+    SEGMENT_COORDS = (
+        ((2, 3), (10, 3), (9, 4), (3, 4)),         # top
+        ((10, 4), (11, 5), (11, 11), (10, 12)),    # top-right
+        ((10, 13), (11, 14), (11, 20), (10, 21)),  # bottom-right
+        ((2, 21), (10, 21), (9, 20), (3, 20)),     # bottom
+        ((2, 13), (3, 14), (3, 20), (2, 21)),      # bottom-left
+        ((2, 4), (3, 5), (3, 11), (2, 12)),        # top-left
+        ((3, 12), (9, 12), (9, 13), (3, 13)),      # middle
+    )
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.layout = None      # Separator layout of the text currently drawn
+        self.digit_items = {}   # character index -> list of 7 segment item ids
+        self.digit_states = {}  # character index -> segment pattern shown
+        self.tk_calls_last_update = 0
+
+    @staticmethod
+    def format_position(position):
+        """Format a position in seconds as MM:SS.mmm"""
+        minutes = int(position // 60)
+        seconds = int(position % 60)
+        milliseconds = int((position % 1) * 1000)
+        return f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+    def _build(self, text):
+        """Create every segment and separator item for text's layout"""
+        self.canvas.delete('all')
+        self.digit_items = {}
+        self.digit_states = {}
+        total_text_width = len(text) * self.CHAR_WIDTH + (len(text) - 1) * self.CHAR_SPACING
+        # Center the text horizontally and the digits vertically in the canvas
+        start_x = (self.CANVAS_WIDTH - total_text_width) // 2
+        y_offset = (self.CANVAS_HEIGHT - self.DIGIT_HEIGHT) // 2
+        on = self.ON_COLOR
+        for i, char in enumerate(text):
+            x = start_x + i * (self.CHAR_WIDTH + self.CHAR_SPACING)
+            if char == ':':
+                # Colon as two dots
+                self.canvas.create_oval(x + 6, y_offset + 8, x + 12, y_offset + 14, fill=on, outline=on)
+                self.canvas.create_oval(x + 6, y_offset + 16, x + 12, y_offset + 22, fill=on, outline=on)
+            elif char == '.':
+                # Decimal point as a small dot
+                self.canvas.create_oval(x + 8, y_offset + 20, x + 14, y_offset + 26, fill=on, outline=on)
+            else:
+                items = []
+                for coords in self.SEGMENT_COORDS:
+                    abs_coords = []
+                    for px, py in coords:
+                        abs_coords.extend([x + px, y_offset + py])
+                    items.append(self.canvas.create_polygon(abs_coords, fill=self.OFF_COLOR,
+                                                            outline=self.OFF_COLOR))
+                self.digit_items[i] = items
+                self.digit_states[i] = self.BLANK
+        self.layout = tuple(c if c in ':.' else '#' for c in text)
+
+    def show(self, position):
+        """Display position (seconds); return the number of Tk calls issued"""
+        text = self.format_position(position)
+        layout = tuple(c if c in ':.' else '#' for c in text)
+        if layout != self.layout:
+            self._build(text)
+        calls = 0
+        for i, items in self.digit_items.items():
+            pattern = self.SEGMENTS.get(text[i], self.BLANK)
+            previous = self.digit_states[i]
+            if pattern == previous:
+                continue
+            for segment, (was_on, is_on) in enumerate(zip(previous, pattern)):
+                if was_on != is_on:
+                    color = self.ON_COLOR if is_on else self.OFF_COLOR
+                    self.canvas.itemconfig(items[segment], fill=color, outline=color)
+                    calls += 1
+            self.digit_states[i] = pattern
+        self.tk_calls_last_update = calls
+        return calls
+
+class FrameScheduler:
+    """Deadline-driven frame loop on top of Tk's after() timers.
+
+    Frames are aimed at fixed deadlines (1 / frame_rate apart) rather than a
+    fixed delay after the previous frame, so the cost of a frame is absorbed
+    instead of accumulating as drift. The frame callback receives under_load,
+    which is True when the previous frame overran its budget or the loop is
+    running behind; callers use it to skip non-essential work. At most
+    max_skipped_frames consecutive frames are flagged so optional work still
+    refreshes under sustained load.
+    """
+    def __init__(self, widget, frame_rate=60.0, load_threshold=0.8, max_skipped_frames=4):
+        self.widget = widget
+        self.frame_interval = 1.0 / max(1.0, float(frame_rate))
+        self.load_threshold = load_threshold
+        self.max_skipped_frames = max_skipped_frames
+        self.callback = None
+        self.after_id = None
+        self.generation = 0
+        self.next_deadline = 0.0
+        # Statistics
+        self.frames = 0
+        self.degraded_frames = 0
+        self.missed_deadlines = 0
+        self.last_frame_cost = 0.0
+        self.consecutive_degraded = 0
+
+    @property
+    def running(self):
+        return self.callback is not None
+
+    def start(self, callback):
+        """Run callback(under_load) once per frame until stop() or it returns False"""
+        self.stop()
+        self.callback = callback
+        self.last_frame_cost = 0.0
+        self.consecutive_degraded = 0
+        self.next_deadline = time.perf_counter()
+        self._run()
+
+    def stop(self):
+        """Cancel the pending frame"""
+        self.generation += 1
+        self.callback = None
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def _schedule(self):
+        delay_ms = int(round((self.next_deadline - time.perf_counter()) * 1000))
+        # Always yield at least 1 ms so Tk can service input between frames
+        self.after_id = self.widget.after(max(1, delay_ms), self._run)
+
+    def _run(self):
+        self.after_id = None
+        callback = self.callback
+        if callback is None:
+            return
+        generation = self.generation
+        frame_start = time.perf_counter()
+        lateness = frame_start - self.next_deadline
+        under_load = (self.last_frame_cost > self.frame_interval * self.load_threshold
+                      or lateness > self.frame_interval)
+        if under_load and self.consecutive_degraded >= self.max_skipped_frames:
+            under_load = False
+        if under_load:
+            self.consecutive_degraded += 1
+            self.degraded_frames += 1
+        else:
+            self.consecutive_degraded = 0
+
+        keep_running = callback(under_load)
+
+        self.last_frame_cost = time.perf_counter() - frame_start
+        self.frames += 1
+        if keep_running is False or generation != self.generation:
+            # Stopped (or restarted) from inside the frame
+            if generation == self.generation:
+                self.callback = None
+            return
+
+        # Advance to the next deadline; if more than a frame behind, drop the
+        # missed deadlines instead of firing a burst of catch-up frames
+        self.next_deadline += self.frame_interval
+        behind = time.perf_counter() - self.next_deadline
+        if behind > self.frame_interval:
+            missed = int(behind / self.frame_interval)
+            self.missed_deadlines += missed
+            self.next_deadline += missed * self.frame_interval
+        self._schedule()
+
+class MidiEventStream:
+    """Channel-voice messages packed into parallel arrays sorted by time.
+
+    Each event is (time in seconds, status byte, data1, data2): notes, control
+    changes (sustain, volume, ...), program changes, pressure and pitch bend.
+    Playback walks the arrays by index, so streaming allocates no per-message
+    objects.
+    """
+    # Status nibble for each mido channel message type
+    STATUS = {
+        'note_off': 0x80, 'note_on': 0x90, 'polytouch': 0xA0, 'control_change': 0xB0,
+        'program_change': 0xC0, 'aftertouch': 0xD0, 'pitchwheel': 0xE0,
+    }
+
+    def __init__(self):
+        self.times = array('d')
+        self.status = array('B')
+        self.data1 = array('B')
+        self.data2 = array('B')
+        self._held_keyframes = None  # Built by held_notes, rebuilt when events are added
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, t, status, data1=0, data2=0):
+        """Append an event; callers append in time order"""
+        self.times.append(t)
+        self.status.append(status)
+        self.data1.append(data1)
+        self.data2.append(data2)
+
+    @staticmethod
+    def encode(msg_type, get):
+        """Return (status, data1, data2) for a channel message type, or None.
+
+        get(name) returns the named attribute (int or numeric string), as for
+        XML message elements.
+        """
+        status = MidiEventStream.STATUS.get(msg_type)
+        if status is None:
+            return None
+        status |= int(get('channel') or 0)
+        if msg_type in ('note_on', 'note_off'):
+            return status, int(get('note') or 0), int(get('velocity') or 0)
+        if msg_type == 'control_change':
+            return status, int(get('control') or 0), int(get('value') or 0)
+        if msg_type == 'polytouch':
+            return status, int(get('note') or 0), int(get('value') or 0)
+        if msg_type == 'program_change':
+            return status, int(get('program') or 0), 0
+        if msg_type == 'aftertouch':
+            return status, int(get('value') or 0), 0
+        pitch = int(get('pitch') or 0) + 8192
+        return status, pitch & 0x7F, pitch >> 7
+
+    @classmethod
+    def from_midi_file(cls, mf):
+        """Compile every channel-voice message of a mido MidiFile"""
+        stream = cls()
+        abs_time = 0.0
+        for msg in mf:
+            abs_time += msg.time
+            if not msg.is_meta and hasattr(msg, 'channel'):
+                data = msg.bytes()
+                stream.append(abs_time, data[0], data[1], data[2] if len(data) > 2 else 0)
+        return stream
+
+    @classmethod
+    def from_events(cls, events):
+        """Build a stream from unsorted (time, status, data1, data2) tuples.
+
+        The sort is stable, so events at the same time keep their input order.
+        """
+        stream = cls()
+        for event in sorted(events, key=lambda e: e[0]):
+            stream.append(*event)
+        return stream
+
+    @classmethod
+    def from_notes(cls, notes, velocities):
+        """Build a note-only stream from (start, note, channel, duration) tuples.
+
+        velocities is indexed by note id. Note-offs sort before note-ons at the
+        same time so repeated notes are released before being retriggered.
+        """
+        events = []
+        for note_id, (start, note, channel, duration) in enumerate(notes):
+            if duration <= 0:
+                continue
+            events.append((start, 1, 0x90 | channel, note, velocities[note_id]))
+            events.append((start + duration, 0, 0x80 | channel, note, 0))
+        events.sort(key=lambda e: (e[0], e[1]))
+        stream = cls()
+        for t, _, status, data1, data2 in events:
+            stream.append(t, status, data1, data2)
+        return stream
+
+    def held_notes(self, position):
+        """Return (channel, note, velocity) for notes switched on before position and still held"""
+        keyframes = self._held_keyframes
+        if keyframes is None or keyframes.length != len(self.times):
+            keyframes = self._held_keyframes = HeldNoteKeyframes(self)
+        held = keyframes.held_at(bisect.bisect_left(self.times, position))
+        return [(channel, note, velocity) for (channel, note), velocity in held.items()]
+
+    def without_channel(self, channel):
+        """Return a copy with every event of channel removed"""
+        stream = MidiEventStream()
+        for i in range(len(self.times)):
+            if self.status[i] & 0x0F != channel:
+                stream.append(self.times[i], self.status[i], self.data1[i], self.data2[i])
+        return stream
+
+
+class HeldNoteKeyframes:
+    """Periodic snapshots of which notes are held in a MidiEventStream.
+
+    As with ControllerKeyframes, a snapshot every INTERVAL events bounds the
+    replay needed to find the held notes at any event index, so chasing notes
+    at a segment or preroll start costs the same anywhere in the song.
+    """
+    INTERVAL = 256
+
+    def __init__(self, stream, interval=None):
+        self.stream = stream
+        self.interval = interval or self.INTERVAL
+        self.length = len(stream)
+        self.states = []  # {(channel, note): velocity} before event k * interval
+        held = {}
+        for i in range(self.length):
+            if i % self.interval == 0:
+                self.states.append(dict(held))
+            self._apply(held, stream.status[i], stream.data1[i], stream.data2[i])
+
+    @staticmethod
+    def _apply(held, status, data1, data2):
+        kind = status & 0xF0
+        if kind == 0x90 and data2 > 0:
+            held[(status & 0x0F, data1)] = data2
+        elif kind == 0x80 or kind == 0x90:
+            held.pop((status & 0x0F, data1), None)
+
+    def held_at(self, cursor):
+        """Return {(channel, note): velocity} for notes held just before event index cursor"""
+        cursor = min(cursor, self.length)
+        k = min(cursor // self.interval, len(self.states) - 1)
+        if k < 0:
+            return {}
+        held = dict(self.states[k])
+        stream = self.stream
+        for i in range(k * self.interval, cursor):
+            self._apply(held, stream.status[i], stream.data1[i], stream.data2[i])
+        return held
+
+
+class ControllerKeyframes:
+    """Periodic snapshots of per-channel program, controller and pitch-bend state.
+
+    A snapshot is taken every INTERVAL events of a MidiEventStream. The state
+    at any event index is the nearest snapshot at or before it plus a replay
+    of at most INTERVAL events, so chasing costs the same anywhere in the song.
+    Controllers the song touches but has not set yet come back at their
+    defaults, so seeking backwards undoes later changes.
+    """
+    INTERVAL = 256
+    CC_DEFAULTS = {7: 100, 10: 64, 11: 127}  # Volume, pan, expression; others default to 0
+    BEND_CENTRE = (0x00, 0x40)  # (lsb, msb) of pitch bend 8192
+
+    def __init__(self, stream, interval=None):
+        self.stream = stream
+        self.interval = interval or self.INTERVAL
+        self.indexes = []  # Event index of each snapshot
+        self.states = []  # (programs, controllers, bends) at that index
+        self.defaults = ({}, {}, {})  # Same shape, for everything the song touches
+        programs, controllers, bends = {}, {}, {}
+        for i in range(len(stream)):
+            if i % self.interval == 0:
+                self.indexes.append(i)
+                self.states.append((dict(programs), dict(controllers), dict(bends)))
+            self._apply(programs, controllers, bends, stream.status[i], stream.data1[i], stream.data2[i])
+        default_programs, default_controllers, default_bends = self.defaults
+        for channel in programs:
+            default_programs[channel] = 0
+        for channel, control in controllers:
+            default_controllers[(channel, control)] = self.CC_DEFAULTS.get(control, 0)
+        for channel in bends:
+            default_bends[channel] = self.BEND_CENTRE
+
+    @staticmethod
+    def _apply(programs, controllers, bends, status, data1, data2):
+        kind = status & 0xF0
+        if kind == 0xB0:
+            controllers[(status & 0x0F, data1)] = data2
+        elif kind == 0xC0:
+            programs[status & 0x0F] = data1
+        elif kind == 0xE0:
+            bends[status & 0x0F] = (data1, data2)
+
+    def state_at(self, cursor):
+        """Return (programs, controllers, bends) in effect just before event index cursor"""
+        programs, controllers, bends = (dict(d) for d in self.defaults)
+        k = bisect.bisect_right(self.indexes, cursor) - 1
+        if k < 0:
+            return programs, controllers, bends
+        snapshot = self.states[k]
+        programs.update(snapshot[0])
+        controllers.update(snapshot[1])
+        bends.update(snapshot[2])
+        stream = self.stream
+        for i in range(self.indexes[k], min(cursor, len(stream))):
+            self._apply(programs, controllers, bends, stream.status[i], stream.data1[i], stream.data2[i])
+        return programs, controllers, bends
+
+
+class Transport:
+    """Song clock: owns position, rate, pause/resume and seek.
+
+    Time comes from the monotonic perf_counter_ns, so wall-clock changes
+    (NTP, suspend) cannot shift playback. All state lives in one tuple
+    (anchor_ns, anchor_position, rate, running) that is replaced whole on
+    every change, so any thread can read a consistent position without a
+    lock. Changes are made from one thread (the UI).
+    """
+    def __init__(self, clock=time.perf_counter_ns):
+        self._clock = clock
+        self._state = (clock(), 0.0, 1.0, False)
+
+    def position(self):
+        """Current song position in seconds"""
+        return self.song_time(self._clock())
+
+    def song_time(self, clock_ns):
+        """Song position at an earlier or later clock reading, under the current state"""
+        anchor_ns, anchor_position, rate, running = self._state
+        if not running:
+            return anchor_position
+        return anchor_position + (clock_ns - anchor_ns) * rate / 1e9
+
+    @property
+    def running(self):
+        return self._state[3]
+
+    @property
+    def rate(self):
+        return self._state[2]
+
+    def _reanchor(self, position=None, rate=None, running=None):
+        _, _, old_rate, old_running = self._state
+        if position is None:
+            position = self.position()
+        self._state = (self._clock(), position,
+                       old_rate if rate is None else rate,
+                       old_running if running is None else running)
+
+    def play(self):
+        if not self.running:
+            self._reanchor(running=True)
+
+    def pause(self):
+        if self.running:
+            self._reanchor(running=False)
+
+    def seek(self, position):
+        self._reanchor(position=max(0.0, position))
+
+    def set_rate(self, rate):
+        """Playback speed multiplier (1.0 = written tempo)"""
+        if rate <= 0:
+            raise ValueError(f"Transport rate must be positive, got {rate}")
+        self._reanchor(rate=rate)
+
+
+class ScrollCoalescer:
+    """Accumulates scroll input and applies it once per frame.
+
+    Wheel spins and key repeat deliver scroll events faster than a frame can
+    be drawn. scroll() adds to a pending delta (per unit kind) and moveto()
+    replaces everything queued before it; the first event of a burst
+    schedules flush() one frame later, which hands the net movement to
+    apply(*yview_args) once.
+    """
+    def __init__(self, widget, apply, frame_ms=16):
+        self.widget = widget
+        self.apply = apply
+        self.frame_ms = frame_ms
+        self.pending = {}  # 'units'/'pages' -> accumulated amount
+        self.pending_moveto = None
+        self._after_id = None
+        # Statistics
+        self.events = 0
+        self.frames = 0
+
+    def scroll(self, amount, what='units'):
+        self.pending[what] = self.pending.get(what, 0) + amount
+        self._request()
+
+    def moveto(self, fraction):
+        self.pending_moveto = fraction
+        self.pending.clear()
+        self._request()
+
+    def command(self, *args):
+        """Scrollbar command entry point: ('moveto', f) or ('scroll', n, what)"""
+        if args[0] == 'moveto':
+            self.moveto(float(args[1]))
+        else:
+            self.scroll(int(args[1]), args[2])
+
+    @property
+    def idle(self):
+        """True when no input is waiting for the next frame"""
+        return self._after_id is None
+
+    def _request(self):
+        self.events += 1
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        """Apply everything pending now"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        moveto, pending = self.pending_moveto, self.pending
+        self.pending_moveto = None
+        self.pending = {}
+        if moveto is not None:
+            self.apply('moveto', moveto)
+        for what, amount in pending.items():
+            if amount:
+                self.apply('scroll', amount, what)
+        self.frames += 1
+
+
+class PlaybackScheduler:
+    """Streams a MidiEventStream to the synth from a dedicated real-time thread.
+
+    While playing, the thread sleeps until the transport reaches each event's
+    time and sends it, so timing no longer depends on how often the Tk loop
+    gets to run. The UI reads the same transport and mirrors it.
+    Hidden channels are silenced by gating their note-ons; their controller
+    and program changes still reach the synth so unhiding sounds right.
+    """
+    SPIN_THRESHOLD = 0.004  # Below this, sleep directly instead of waiting on the stop event
+    MAX_WAIT = 0.05  # Re-read the transport at least this often, to follow rate changes
+    SYNTH_CALLS = {0x80: 'note_off', 0x90: 'note_on', 0xB0: 'cc', 0xC0: 'program', 0xE0: 'pitch_bend'}
+
+    def __init__(self, transport=None):
+        self.transport = transport or Transport()
+        self.stream = MidiEventStream()
+        self.keyframes = ControllerKeyframes(self.stream)
+        self.channels = None  # Channels allowed to sound (None = all)
+        self.player = None
+        self.sounding = {}  # (channel, note) -> note-ons not yet released, as voices may stack
+        self.sustained = set()  # Channels with the sustain pedal down
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()  # Cuts a wait short after seek() or stop()
+        self._lock = threading.Lock()  # Pairs a seek request with its transport seek
+        self._seek_request = None  # (position, initial_notes) for the thread to move to
+        # Statistics
+        self.events_sent = 0
+        self.max_lateness = 0.0
+
+    def load(self, stream):
+        """Replace the event stream and its controller keyframes; takes effect on the next start()"""
+        self.stream = stream
+        self.keyframes = ControllerKeyframes(stream)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def position(self):
+        """Current song position in seconds"""
+        return self.transport.position()
+
+    def start(self, position, player, initial_notes=()):
+        """Start playing from position; initial_notes are (channel, note, velocity) already sounding there"""
+        self.stop()
+        self._stop_event = threading.Event()
+        self._wake.clear()
+        self._seek_request = None
+        cursor = self.prepare(position, player, initial_notes)
+        self.transport.seek(position)
+        self.transport.play()
+        self._thread = threading.Thread(target=self._run, args=(cursor, self._stop_event),
+                                        name='PlaybackScheduler', daemon=True)
+        self._thread.start()
+
+    def prepare(self, position, player, initial_notes=()):
+        """Bring player to the state at position and return the first event index to send.
+
+        Used by start() and by the offline renderer, which sends events itself.
+        """
+        self.player = player
+        cursor = bisect.bisect_left(self.stream.times, position)
+        self._chase_controllers(cursor)
+        for channel, note, velocity in initial_notes:
+            if self.channels is None or channel in self.channels:
+                self.dispatch(0x90 | channel, note, velocity)
+        return cursor
+
+    def seek(self, position, initial_notes=()):
+        """Move playback to position without restarting the thread.
+
+        The running thread releases what is sounding, chases controllers and
+        initial_notes at position and carries on from there. When stopped,
+        only the transport moves.
+        """
+        with self._lock:
+            if self.running:
+                self._seek_request = (position, tuple(initial_notes))
+            self.transport.seek(position)
+        self._wake.set()
+
+    def _release_sounding(self):
+        for (channel, note), count in list(self.sounding.items()):
+            for _ in range(count):
+                self.dispatch(0x80 | channel, note, 0)
+
+    def allows(self, status):
+        """False for note-ons on channels that may not sound"""
+        channels = self.channels
+        return status & 0xF0 != 0x90 or channels is None or status & 0x0F in channels
+
+    def stop(self):
+        """Stop the thread and release every note and pedal it left down"""
+        if self._thread is None:
+            return
+        self.transport.pause()
+        self._stop_event.set()
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._release_sounding()
+        for channel in list(self.sustained):
+            self.dispatch(0xB0 | channel, 64, 0)
+
+    def _chase_controllers(self, cursor):
+        """Send the program, controller and pitch-bend state in effect before cursor"""
+        programs, controllers, bends = self.keyframes.state_at(cursor)
+        # Bank select must precede the program change it applies to
+        for (channel, control), value in sorted(controllers.items(), key=lambda item: item[0][1] not in (0, 32)):
+            self.dispatch(0xB0 | channel, control, value)
+        for channel, program in programs.items():
+            self.dispatch(0xC0 | channel, program, 0)
+        for channel, (lsb, msb) in bends.items():
+            self.dispatch(0xE0 | channel, lsb, msb)
+
+    def dispatch(self, status, data1, data2):
+        """Send one channel-voice event to the player"""
+        player = self.player
+        if player is None or not player.midi_out:
+            player = None
+        tracing = TRACER.enabled and player is not None
+        if tracing:
+            start = time.perf_counter_ns()
+        kind = status & 0xF0
+        channel = status & 0x0F
+        if kind == 0x90 and data2 > 0:
+            key = (channel, data1)
+            self.sounding[key] = self.sounding.get(key, 0) + 1
+            if player:
+                player.note_on(channel, data1, data2)
+        elif kind == 0x80 or kind == 0x90:
+            # Always forwarded: overlapping notes of one pitch each need their note-off
+            key = (channel, data1)
+            count = self.sounding.get(key, 0)
+            if count > 1:
+                self.sounding[key] = count - 1
+            else:
+                self.sounding.pop(key, None)
+            if player:
+                player.note_off(channel, data1)
+        elif kind == 0xB0:
+            if data1 == 64:
+                if data2 >= 64:
+                    self.sustained.add(channel)
+                else:
+                    self.sustained.discard(channel)
+            if player:
+                player.cc(channel, data1, data2)
+        elif kind == 0xC0:
+            if player:
+                player.program(channel, data1)
+        elif kind == 0xE0:
+            if player:
+                player.pitch_bend(channel, ((data2 << 7) | data1) - 8192)
+        self.events_sent += 1
+        if tracing:
+            name = 'note_off' if kind == 0x90 and not data2 else self.SYNTH_CALLS.get(kind, 'synth')
+            TRACER.complete(name, 'synth', start, {'channel': channel, 'data1': data1, 'data2': data2})
+
+    def _run(self, cursor, stop_event):
+        stream = self.stream
+        times, status, data1, data2 = stream.times, stream.status, stream.data1, stream.data2
+        transport = self.transport
+        count = len(times)
+        wake = self._wake
+        while cursor < count and not stop_event.is_set():
+            # A seek request and its transport seek are seen together, so
+            # events between the old and new positions are never sent
+            with self._lock:
+                request, self._seek_request = self._seek_request, None
+                now = transport.position()
+            if request is not None:
+                position, initial_notes = request
+                self._release_sounding()
+                cursor = self.prepare(position, self.player, initial_notes)
+                continue
+            if not transport.running:
+                wake.wait(self.MAX_WAIT)
+                wake.clear()
+                continue
+            delay = (times[cursor] - now) / transport.rate
+            if delay > self.SPIN_THRESHOLD:
+                # Coarse wait that still reacts to stop() and seek(); finish
+                # the last few milliseconds with sleep for better precision
+                wake.wait(min(delay - self.SPIN_THRESHOLD / 2, self.MAX_WAIT))
+                wake.clear()
+                continue
+            if delay > 0:
+                time.sleep(delay)
+                continue
+            tick_start = time.perf_counter_ns() if TRACER.enabled else 0
+            # Send everything that is due
+            while cursor < count and times[cursor] <= now:
+                event_status = status[cursor]
+                if self.allows(event_status):
+                    self.dispatch(event_status, data1[cursor], data2[cursor])
+                self.max_lateness = max(self.max_lateness, now - times[cursor])
+                cursor += 1
+            if tick_start:
+                TRACER.complete('scheduler tick', 'playback', tick_start)
+
+
+class OfflineRenderer:
+    """Renders a MidiEventStream to a WAV file as fast as the synth can go.
+
+    No audio driver is involved: the renderer pulls samples from the backend's
+    render() up to each event's sample position, sends the event, and streams
+    the samples to the file in chunks. A time range and a channel filter
+    select what is rendered; held notes and controller state at the range
+    start are chased as for playback.
+    """
+    CHUNK_FRAMES = 4096
+    TAIL_SECONDS = 1.0  # Release time rendered after the last event of a whole-song render
+
+    def __init__(self, backend, sample_rate=44100, chunk_frames=None):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.chunk_frames = chunk_frames or self.CHUNK_FRAMES
+        self.frames_written = 0
+
+    def render(self, stream, path, start=0.0, end=None, channels=None, tail=None):
+        """Render [start, end) of stream to path; returns the number of frames written.
+
+        end defaults to the last event plus TAIL_SECONDS of release.
+        """
+        import wave
+        if end is None:
+            last = stream.times[-1] if len(stream) else start
+            end = max(start, last) + (self.TAIL_SECONDS if tail is None else tail)
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            return self.render_to(stream, wav.writeframes, start, end, channels)
+
+    def render_to(self, stream, write, start, end, channels=None, preroll=0.0):
+        """Render [start, end) of stream, passing interleaved int16 sample bytes to write().
+
+        Sample positions are counted from time 0, so renders of adjacent
+        ranges join sample-exactly. With preroll, rendering starts up to that
+        many seconds early and the samples before start are discarded, so
+        chased notes and effects have settled by the first written sample.
+        """
+        rate = self.sample_rate
+        start_frame = round(start * rate)
+        end_frame = round(end * rate)
+        render_frame = max(0, start_frame - round(preroll * rate))
+        skip = [(start_frame - render_frame) * 4]  # Bytes of pre-roll still to discard
+
+        def sink(data):
+            if skip[0]:
+                dropped = min(skip[0], len(data))
+                skip[0] -= dropped
+                data = data[dropped:]
+            if data:
+                write(data)
+
+        render_start = render_frame / rate
+        scheduler = PlaybackScheduler()
+        scheduler.load(stream)
+        scheduler.channels = channels
+        cursor = scheduler.prepare(render_start, self.backend, stream.held_notes(render_start))
+        times, status, data1, data2 = stream.times, stream.status, stream.data1, stream.data2
+        self.frames_written = 0
+        while cursor < len(times) and times[cursor] < end:
+            # Event positions are rounded to the nearest sample
+            self._write(sink, round(times[cursor] * rate) - render_frame - self.frames_written)
+            if scheduler.allows(status[cursor]):
+                scheduler.dispatch(status[cursor], data1[cursor], data2[cursor])
+            cursor += 1
+        self._write(sink, end_frame - render_frame - self.frames_written)
+        self.frames_written -= start_frame - render_frame
+        return self.frames_written
+
+    def _write(self, write, frames):
+        while frames > 0:
+            count = min(frames, self.chunk_frames)
+            write(self.backend.render(count).tobytes())
+            self.frames_written += count
+            frames -= count
+
+
+def create_offline_synth(soundfont_path=None, sample_rate=44100):
+    """A FluidSynth backend with no audio driver, on its own synth, for OfflineRenderer"""
+    return FluidSynthPlayer(soundfont_path, settings={'synth.sample-rate': float(sample_rate)},
+                            registry=SynthRegistry(), start_audio=False)
+
+
+def midi_to_xml(mf):
+    """Element tree of every message in a MidiFile, as shown in the text screen"""
+    root = ET.Element('MidiFile', ticks_per_beat=str(mf.ticks_per_beat))
+    for i, track in enumerate(mf.tracks):
+        tr_elem = ET.SubElement(root, 'Track', name=track.name or f'Track_{i}')
+        for msg in track:
+            # 'time' is the delta in ticks, as create_gaps, saving and the note rebuild read it
+            attrs = msg.dict()
+            msg_elem = ET.SubElement(tr_elem, 'Message', type=msg.type, time=str(msg.time))
+            for attr, value in attrs.items():
+                if attr not in ('type', 'time'):
+                    msg_elem.set(attr, str(value))
+    return root
+
+
+def pretty_print_xml(root):
+    return minidom.parseString(ET.tostring(root, encoding='utf-8')).toprettyxml(indent="  ")
+
+
+def gap_xml(xml_content, gap_ticks):
+    """Shorten notes in MIDI XML so repeated notes are separated by at least gap_ticks.
+
+    Returns (formatted XML, number of notes shortened); the XML is None when
+    nothing was shortened.
+    """
+    root = ET.fromstring(xml_content)
+
+    total_modifications = 0
+    min_duration_ticks = max(10, gap_ticks // 4)  # Minimum note duration
+
+    # Process each track
+    for track_elem in root.findall('Track'):
+        log_gap.debug("Processing track with %d messages", len(track_elem.findall('Message')))
+
+        # Step 1: Parse all events into absolute time
+        events = []
+        abs_time = 0
+
+        for msg_elem in track_elem.findall('Message'):
+            delta_time = int(msg_elem.get('time', 0))
+            abs_time += delta_time
+
+            event = {
+                'element': msg_elem,
+                'original_abs_time': abs_time,
+                'new_abs_time': abs_time,  # Will be modified if needed
+                'original_delta': delta_time,
+                'type': msg_elem.get('type'),
+                'channel': int(msg_elem.get('channel', 0)) if msg_elem.get('channel') is not None else None,
+                'note': int(msg_elem.get('note', 0)) if msg_elem.get('note') is not None else None,
+                'velocity': int(msg_elem.get('velocity', 0)) if msg_elem.get('velocity') is not None else None
+            }
+            events.append(event)
+
+        # Step 2: Find note pairs (note_on -> note_off for same channel/pitch)
+        active_notes = {}  # (channel, note) -> start_event
+        note_pairs = []
+
+        for event in events:
+            if event['type'] == 'note_on' and event['velocity'] and event['velocity'] > 0:
+                key = (event['channel'], event['note'])
+                active_notes[key] = event
+            elif (event['type'] == 'note_off' or 
+                  (event['type'] == 'note_on' and (not event['velocity'] or event['velocity'] == 0))):
+                key = (event['channel'], event['note'])
+                if key in active_notes:
+                    start_event = active_notes[key]
+                    note_pairs.append((start_event, event))
+                    del active_notes[key]
+
+        # Step 3: Group note pairs by pitch and apply gap logic
+        notes_by_pitch = {}
+        for start_event, end_event in note_pairs:
+            key = (start_event['channel'], start_event['note'])
+            notes_by_pitch.setdefault(key, []).append((start_event, end_event))
+
+        track_modifications = 0
+
+        for key, notes in notes_by_pitch.items():
+            if len(notes) < 2:
+                continue
+
+            # Sort by original start time
+            notes.sort(key=lambda x: x[0]['original_abs_time'])
+
+            channel, pitch = key
+
+            for i in range(1, len(notes)):
+                prev_start_event, prev_end_event = notes[i-1]
+                curr_start_event, curr_end_event = notes[i]
+
+                # Calculate gap using current absolute times (which may have been modified)
+                prev_end_time = prev_end_event['new_abs_time']
+                curr_start_time = curr_start_event['new_abs_time']
+                gap = curr_start_time - prev_end_time
+
+                if gap < gap_ticks:
+                    # Calculate new end time for previous note
+                    new_prev_end_time = curr_start_time - gap_ticks
+
+                    # Check if new note duration would be acceptable
+                    prev_start_time = prev_start_event['new_abs_time']
+                    new_duration = new_prev_end_time - prev_start_time
+
+                    if new_duration >= min_duration_ticks:
+                        # Apply the modification
+                        prev_end_event['new_abs_time'] = new_prev_end_time
+                        track_modifications += 1
+
+                        if track_modifications <= 5:  # Debug first few
+                            log_gap.debug("  Modified Ch%d Note%d: gap %d -> %d ticks (shortened by %d)",
+                                          channel, pitch, gap, gap_ticks, prev_end_time - new_prev_end_time)
+                    else:
+                        if track_modifications <= 5:
+                            log_gap.debug("  Skipped Ch%d Note%d: would make note too short (%d < %d)",
+                                          channel, pitch, new_duration, min_duration_ticks)
+
+        log_gap.debug("Track modifications: %d", track_modifications)
+        total_modifications += track_modifications
+
+        # Step 4: Rebuild the entire track with new delta times
+        if track_modifications > 0:
+            # Sort all events by their new absolute times
+            events.sort(key=lambda x: x['new_abs_time'])
+
+            # Clear the track and rebuild it
+            for msg_elem in list(track_elem):
+                track_elem.remove(msg_elem)
+
+            # Recalculate delta times and add events back
+            prev_time = 0
+            for event in events:
+                new_delta = event['new_abs_time'] - prev_time
+                event['element'].set('time', str(new_delta))
+                track_elem.append(event['element'])
+                prev_time = event['new_abs_time']
+
+            log_gap.debug("Rebuilt track with %d events", len(events))
+
+    if total_modifications == 0:
+        return None, 0
+
+    # Convert modified XML back to a string formatted as in the text editor
+    xml_str = ET.tostring(root, encoding='unicode')
+    dom = minidom.parseString(xml_str)
+    pretty_xml = dom.toprettyxml(indent='  ')
+    lines = [line for line in pretty_xml.split('\n') if line.strip()]
+    formatted_xml = '\n'.join(lines[1:])
+    return formatted_xml, total_modifications
+
+
 class MidiGapperGUI(tk.Tk):
     # Map MIDI note number to note name
     NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+    STATS_PANEL_REFRESH_MS = 500
+    SEEK_CHASE_MS = 150  # Scroll or seek pause after which held notes are chased during playback
     
     def __init__(self):
+        # Tk callbacks show up in the opt-in trace (Ctrl+Shift+P)
+        diagnostics.trace_tk_callbacks()
         super().__init__()
         
-        # Enable debug timing output for troubleshooting
-        self.debug_timing = True
-        
         self.title('Python Midi Gapper 2')
-          # Initialize MIDI playback systems
-        self.init_midi_playback()
         
-        # MIDI playback state
-        self.playback_start_time = None  # When playback actually started
+        # Song clock shared by the note scheduler thread and the UI
+        self.transport = Transport()
         
-        # Scrolling performance optimization for large MIDI files
-        self.scroll_update_timer = None
-        self.scroll_throttle_delay = 100  # ms delay for highlighting updates during scroll
-        self.last_highlight_time = 0  # Track when highlighting was last updated
+        # Real-time note scheduler (audio runs on its own thread)
+        self.playback_scheduler = PlaybackScheduler(self.transport)
         
         # Load window geometry
         self.config_data = load_config()
+        
+        # Log levels, ring buffer size and debug timing come from config.json
+        diagnostics.configure_logging(self.config_data)
+        if self.config_data.get('trace_file'):
+            TRACER.start()
+        
+        # Initialize MIDI playback systems (the config picks the synth backend)
+        self.init_midi_playback()
         # Default tempo in microseconds per quarter note
         self.tempo_us = 500000        # Y-scale multiplier for visualization
         y_scale = self.config_data.get('y_scale', 1.0)
@@ -228,7 +1687,10 @@ class MidiGapperGUI(tk.Tk):
         
         # Keyboard highlighting state
         self.keyboard_keys = {}  # MIDI note number -> canvas object ID for highlighting
-        self.notes = []
+        self.notes = []  # (start_time, note, channel, duration); list position is the note id
+        self.note_velocities = []  # note id -> velocity
+        self.event_stream = MidiEventStream()  # All channel messages, for playback
+        self.note_index = NoteIntervalIndex()  # Time index over self.notes
         self.max_time = 1
         # Variables for channel visibility checkboxes
         self.channel_vars = {}
@@ -236,6 +1698,9 @@ class MidiGapperGUI(tk.Tk):
         self.scroll_to_bottom_on_next_draw = False
         # Create UI
         self.create_widgets()
+        # Log the UI thread's stack whenever the main loop freezes
+        stall_budget_ms = self.config_data.get('stall_budget_ms', 500)
+        self.stall_watchdog = diagnostics.StallWatchdog(self, stall_budget_ms / 1000.0, log_render)
         # Define visualization text font with default size for clarity
         default_font = tkfont.nametofont("TkDefaultFont")
         new_size = default_font.cget("size")  # use standard size
@@ -253,7 +1718,7 @@ class MidiGapperGUI(tk.Tk):
                 def force_scroll():
                     if self.canvas.winfo_width() > 1:  # ensure canvas is sized
                         self.canvas.yview_moveto(1.0)
-                        print(f"Scrolled to bottom, yview: {self.canvas.canvasy(0)}")
+                        log_render.debug("Scrolled to bottom, yview: %s", self.canvas.canvasy(0))
                     else:
                         self.after(100, force_scroll)  # retry if not ready
                 self.after(100, force_scroll)
@@ -273,25 +1738,22 @@ class MidiGapperGUI(tk.Tk):
         self.attributes('-topmost', True)
         self.after(100, lambda: self.attributes('-topmost', False))
         self.focus_force()
+        
+        # Arm the watchdog once the main loop is running, after startup work
+        # and the autoload queued above, so they are not reported as stalls
+        if stall_budget_ms > 0:
+            self.after_idle(self.stall_watchdog.start)
 
     def init_midi_playback(self):
-        """Initialize MIDI playback system using note-based output"""
+        """Set up the note player used by the playback scheduler.
+
+        The real synth is created in the background once the window has been
+        painted (see refresh_midi_devices); until then a silent placeholder
+        backend lets playback run visually.
+        """
         self.midi_playback_available = False
-        
-        # Initialize note-based MIDI player for highlighting-driven playback
-        try:
-            # Initialize without a specific device first, will be set later
-            self.note_player = MidiNotePlayer()
-            if self.note_player.midi_out:
-                self.midi_playback_available = True
-                print("✓ Note-based MIDI player initialized successfully")
-            else:
-                print("⚠ Note-based MIDI player available but no output device")
-                self.midi_playback_available = False
-        except Exception as e:
-            print(f"⚠ Could not initialize note-based MIDI player: {e}")
-            self.note_player = None
-            self.midi_playback_available = False
+        self.note_player = SynthBackend()
+        self.synth_loader = SynthLoader(self)
 
     def create_widgets(self):
         # Configure default TTK styles (removed black styling)
@@ -315,6 +1777,10 @@ class MidiGapperGUI(tk.Tk):
         save_button = ttk.Button(controls_frame, text='Save MIDI As...', command=self.save_midi_file)
         save_button.pack(side='top', pady=(0, 3), anchor='w')
         
+        # Offline render of the visible channels, for checking gaps by ear
+        render_button = ttk.Button(controls_frame, text='Render WAV...', command=self.render_wav_file)
+        render_button.pack(side='top', pady=(0, 3), anchor='w')
+        
         # Gap controls in separate frame
         gap_controls_frame = ttk.LabelFrame(top_section, text='Gap Controls')
         gap_controls_frame.pack(side='left', anchor='nw', padx=(10, 10))
@@ -345,7 +1811,7 @@ class MidiGapperGUI(tk.Tk):
         
         # Main play/pause button (toggles between play ▶ and pause ⏸)
         self.play_pause_button = tk.Button(buttons_frame, text='▶', width=4, height=2,
-                                         font=('Arial', 20, 'bold'), command=self.toggle_play_pause,
+                                         font=('Arial', 20, 'bold'), command=lambda: self.dispatch_input('play_pause'),
                                          bg='lightgreen', relief='raised', bd=3)
         self.play_pause_button.pack(side='left', padx=(0, 5))
         
@@ -367,12 +1833,13 @@ class MidiGapperGUI(tk.Tk):
                                  highlightthickness=2, highlightbackground='gray',
                                  relief='sunken', bd=2)
         self.led_clock.pack(side='top', pady=(3, 0))
+        self.led_display = LedClockDisplay(self.led_clock)
         
         # Initialize playback variables
         self.is_playing = False
         self.is_paused = False
         self.playback_position = 0.0
-        self.playback_timer = None
+        self.frame_scheduler = FrameScheduler(self, self.config_data.get('frame_rate', 60))
           # Draw initial LED display
         self.update_led_clock()
         
@@ -400,13 +1867,19 @@ class MidiGapperGUI(tk.Tk):
                                       highlightthickness=0)
         self.status_canvas.pack(side='left')
         
+        # Effective output latency of the connected synth
+        self.latency_label = ttk.Label(device_select_frame, text='')
+        self.latency_label.pack(side='left', padx=(3, 0))
+        
         # Refresh button to rescan MIDI devices
         refresh_button = ttk.Button(device_select_frame, text='🔄', width=3,
                                    command=self.refresh_midi_devices)
         refresh_button.pack(side='left', padx=(5, 0))
         
-        # Initialize MIDI device list and status
-        self.refresh_midi_devices()
+        # Initialize MIDI device list and status once the window has painted
+        self.update_midi_status_indicator()
+        self.after_idle(self.refresh_midi_devices)
+        self.after_idle(self.preload_soundfonts)
         
         # Center: MIDI info display
         info_frame = ttk.Frame(top_section)
@@ -513,8 +1986,14 @@ class MidiGapperGUI(tk.Tk):
           # Keyboard canvas underneath (fixed height, Synthesia style) - 2x scale
         self.keyboard_canvas = tk.Canvas(main_canvas_frame, bg='#2a2a2a', height=200)
         self.keyboard_canvas.pack(fill='x', side='bottom')
+        self.keyboard_highlighter = KeyboardHighlighter(self.keyboard_canvas)
           # Vertical scrollbar for visualization with MIDI position sync
-        v_scroll = ttk.Scrollbar(canvas_container, orient='vertical', command=self.on_scroll_with_midi_sync)
+        # Scroll input is coalesced and applied once per frame
+        self.scroll_coalescer = ScrollCoalescer(self, self.on_scroll_with_midi_sync,
+                                                max(1, int(1000 / self.config_data.get('frame_rate', 60))))
+        self._seek_chase_id = None
+        v_scroll = ttk.Scrollbar(canvas_container, orient='vertical',
+                                 command=lambda *args: self.dispatch_input('scrollbar', *args))
         v_scroll.pack(fill='y', side='right')
         self.canvas.configure(yscrollcommand=v_scroll.set)
           # Redraw visualization on canvas resize (fix autoload sizing issues)
@@ -532,17 +2011,27 @@ class MidiGapperGUI(tk.Tk):
         
         # Increase scroll speed by using a multiplier for faster scrolling
         scroll_factor = 75  # Increased for better performance with large MIDI files
-        self.bind_all('<MouseWheel>', lambda e: self.on_scroll_with_midi_sync('scroll', -scroll_factor * int(e.delta/120), 'units'))
-        self.bind_all('<Up>', lambda e: self.on_scroll_with_midi_sync('scroll', -scroll_factor, 'units'))
-        self.bind_all('<Down>', lambda e: self.on_scroll_with_midi_sync('scroll', scroll_factor, 'units'))
+        self.bind_all('<MouseWheel>', lambda e: self.dispatch_input('wheel', -scroll_factor * int(e.delta/120)))
+        self.bind_all('<Up>', lambda e: self.dispatch_input('arrow', -scroll_factor))
+        self.bind_all('<Down>', lambda e: self.dispatch_input('arrow', scroll_factor))
           # Add left/right arrow keys for time-based seeking
-        self.bind_all('<Left>', lambda e: self.seek_relative(-1.0))
-        self.bind_all('<Right>', lambda e: self.seek_relative(1.0))
-        self.bind_all('<Shift-Left>', lambda e: self.seek_relative(-5.0))
-        self.bind_all('<Shift-Right>', lambda e: self.seek_relative(5.0))
+        self.bind_all('<Left>', lambda e: self.dispatch_input('seek', -1.0))
+        self.bind_all('<Right>', lambda e: self.dispatch_input('seek', 1.0))
+        self.bind_all('<Shift-Left>', lambda e: self.dispatch_input('seek', -5.0))
+        self.bind_all('<Shift-Right>', lambda e: self.dispatch_input('seek', 5.0))
         
         # Add space bar for play/pause toggle
-        self.bind_all('<space>', lambda e: self.toggle_play_pause())
+        self.bind_all('<space>', lambda e: self.dispatch_input('play_pause'))
+        
+        # Diagnostics: toggle debug timing output and dump the recent log
+        self.bind_all('<Control-D>', lambda e: self.toggle_debug_timing())
+        self.bind_all('<Control-L>', lambda e: self.dump_debug_log())
+        self.bind_all('<Control-T>', lambda e: self.toggle_stats_panel())
+        self.bind_all('<Control-P>', lambda e: self.toggle_trace())
+        self.bind_all('<Control-I>', lambda e: self.toggle_input_recording())
+        self.bind_all('<Control-M>', lambda e: self.show_memory_report())
+        self.stats_panel = None
+        self.input_recorder = diagnostics.InputRecorder()
         
         # Text screen tab
         text_frame = ttk.Frame(notebook)
@@ -599,6 +2088,7 @@ class MidiGapperGUI(tk.Tk):
             self.channel_canvas.configure(height=self.collapsed_height)
 
     def process_midi(self, file_path):
+        stages = stage_timer('process_midi')
         # Display path and XML, then visualize notes
         self.text.delete('1.0', 'end')
         self.text.insert('end', f'Loaded MIDI file: {file_path}\n')
@@ -628,6 +2118,7 @@ class MidiGapperGUI(tk.Tk):
         # Track visibility: show all channels by default
         self.visible_channels = set(channels)
         self.update_channel_legend()
+        stages.lap('parse')
         
         # SIMPLIFIED: Use mido's built-in message iteration with proper timing
         self.notes_for_visualization = []
@@ -636,11 +2127,18 @@ class MidiGapperGUI(tk.Tk):
         tempo_changes = []
         active_on = {}
         
+        # Every channel-voice message is compiled into the playback stream
+        event_stream = MidiEventStream()
+        
         # Use mido.MidiFile iteration with proper absolute time calculation
         abs_time = 0.0  # Track absolute time by accumulating deltas
         for msg in mf:
             abs_time += msg.time  # Accumulate delta time to get absolute time
             
+            if not msg.is_meta and hasattr(msg, 'channel'):
+                data = msg.bytes()
+                event_stream.append(abs_time, data[0], data[1], data[2] if len(data) > 2 else 0)
+            
             if msg.is_meta and msg.type == 'set_tempo':
                 tempo_changes.append((abs_time, msg.tempo))
             elif hasattr(msg, 'channel') and hasattr(msg, 'note'):
@@ -665,29 +2163,23 @@ class MidiGapperGUI(tk.Tk):
         
         # Store tempo changes for playback
         self.tempo_changes = tempo_changes if tempo_changes else [(0.0, 500000)]
+        stages.lap('notes')
         
-        print(f"Processed {len(self.notes_for_visualization)} notes")
-        print(f"Found {len(tempo_changes)} tempo changes:")
-        for time, tempo in tempo_changes:
-            bpm = int(60000000 / tempo)
-            print(f"  Time {time:.2f}s: {bpm} BPM")
-        print(f"Total MIDI duration: {abs_time:.3f} seconds")
+        log_load.info("Processed %d notes", len(self.notes_for_visualization))
+        log_load.info("Found %d tempo changes:", len(tempo_changes))
+        if log_load.isEnabledFor(DEBUG):
+            for change_time, tempo in tempo_changes:
+                log_load.debug("  Time %.2fs: %d BPM", change_time, int(60000000 / tempo))
+        log_load.info("Total MIDI duration: %.3f seconds", abs_time)
         
         # Build XML for display (using simplified approach)
-        root = ET.Element('MidiFile', ticks_per_beat=str(mf.ticks_per_beat))
-        abs_time_xml = 0.0  # Reset for XML generation
-        for i, track in enumerate(mf.tracks):
-            tr_elem = ET.SubElement(root, 'Track', name=track.name or f'Track_{i}')
-            for msg in track:
-                abs_time_xml += msg.time
-                attrs = msg.dict()
-                msg_elem = ET.SubElement(tr_elem, 'Message', type=msg.type, time=str(abs_time_xml))
-                for attr, value in attrs.items():
-                    if attr not in ('type', 'time'):
-                        msg_elem.set(attr, str(value))
-        
-        pretty_xml = minidom.parseString(ET.tostring(root, encoding='utf-8')).toprettyxml(indent="  ")
+        root = midi_to_xml(mf)
+        stages.lap('xml')
+        
+        pretty_xml = pretty_print_xml(root)
+        stages.lap('pretty_print')
         self.text.insert('end', pretty_xml)
+        stages.lap('text_insert')
         
         # Save XML file to same directory as MIDI file
         try:
@@ -695,18 +2187,22 @@ class MidiGapperGUI(tk.Tk):
             xml_file_path = f"{base_name}.xml"
             with open(xml_file_path, 'w', encoding='utf-8') as xml_file:
                 xml_file.write(pretty_xml)
-            print(f"XML saved to: {xml_file_path}")
+            log_io.info("XML saved to: %s", xml_file_path)
         except Exception as e:
-            print(f"Failed to save XML file: {e}")
+            log_io.warning("Failed to save XML file: %s", e)
+        stages.lap('save_xml')
         
         # Populate visualization notes from processed MIDI data
-        self.notes = [(d['start_time'], d['note'], d['channel'], d['duration']) for d in self.notes_for_visualization]
+        self.set_notes([(d['start_time'], d['note'], d['channel'], d['duration']) for d in self.notes_for_visualization],
+                       [d['velocity'] for d in self.notes_for_visualization], event_stream)
+        stages.lap('index')
         
         # Calculate max_time as the maximum of last note end time and total MIDI duration
         notes_max_time = max((d['start_time'] + d['duration'] for d in self.notes_for_visualization), default=0)
         self.max_time = max(notes_max_time, abs_time)
         
-        print(f"Notes max time: {notes_max_time:.3f}s, MIDI duration: {abs_time:.3f}s, Using: {self.max_time:.3f}s")# Update the MIDI info labels with detailed information
+        log_load.debug("Notes max time: %.3fs, MIDI duration: %.3fs, Using: %.3fs", notes_max_time, abs_time, self.max_time)
+        # Update the MIDI info labels with detailed information
         fname = os.path.basename(file_path)
         
         # Get MIDI format type (0, 1, or 2)
@@ -760,7 +2256,10 @@ class MidiGapperGUI(tk.Tk):
         self.midi_duration_var.set(f"Duration: {duration_str}")
         # Draw visualization and request scroll-to-bottom
         self.scroll_to_bottom_on_next_draw = True
+        stages.lap('info')
         self.draw_visualization(self.notes, self.max_time)
+        stages.lap('draw')
+        stages.done()
 
     def load_midi_file(self):
         file_path = filedialog.askopenfilename(
@@ -772,6 +2271,63 @@ class MidiGapperGUI(tk.Tk):
             save_config(self.config_data)
             self.process_midi(file_path)
 
+    def render_wav_file(self):
+        """Render the visible channels of the current file to a WAV file in the background"""
+        if not len(self.event_stream):
+            messagebox.showwarning("No MIDI Data", "Please load a MIDI file first.")
+            return
+        
+        default_name = ""
+        if self.current_midi_file:
+            default_name = os.path.splitext(os.path.basename(self.current_midi_file))[0] + ".wav"
+        file_path = filedialog.asksaveasfilename(
+            title='Render to WAV',
+            initialfile=default_name,
+            defaultextension='.wav',
+            filetypes=[('WAV files', '*.wav'), ('All files', '*.*')]
+        )
+        if not file_path:
+            return
+        
+        self.sync_playback_channels()
+        channels = self.playback_scheduler.channels
+        stream = self.event_stream
+        soundfont_path = self.config_data.get('soundfont')
+        result = {}
+        
+        def work():
+            t0 = time.perf_counter()
+            try:
+                backend = create_offline_synth(soundfont_path)
+                try:
+                    if not backend.midi_out:
+                        raise RuntimeError("FluidSynth is not available")
+                    renderer = OfflineRenderer(backend)
+                    frames = renderer.render(stream, file_path, channels=channels)
+                finally:
+                    backend.close()
+                result['seconds'] = frames / renderer.sample_rate
+            except Exception as e:
+                result['error'] = e
+            result['elapsed'] = time.perf_counter() - t0
+        
+        thread = threading.Thread(target=work, name='OfflineRender', daemon=True)
+        thread.start()
+        log_render.info("Rendering %s...", os.path.basename(file_path))
+        
+        def poll():
+            if thread.is_alive():
+                self.after(100, poll)
+            elif 'error' in result:
+                messagebox.showerror("Render Failed", f"Could not render WAV:\n{result['error']}")
+            else:
+                message = (f"Rendered {result['seconds']:.1f}s of audio in {result['elapsed']:.1f}s "
+                           f"to:\n{file_path}")
+                log_render.info("✓ %s", message)
+                messagebox.showinfo("Render Complete", message)
+        
+        self.after(100, poll)
+    
     def save_midi_file(self):
         if not hasattr(self, 'midi_data') or self.midi_data is None:
             messagebox.showwarning("No MIDI Data", "Please load a MIDI file first.")
@@ -793,153 +2349,155 @@ class MidiGapperGUI(tk.Tk):
             return
             
         try:
-            # Parse current XML from text widget to rebuild MIDI
-            content = self.text.get('1.0', 'end')
-            xml_start = content.find('<MidiFile')
-            if xml_start == -1:
-                messagebox.showerror("Error", "No valid XML found in text editor.")
-                return
-                
-            xml_content = content[xml_start:]
-            root = ET.fromstring(xml_content)
+            self.write_midi_from_xml(file_path)
+            messagebox.showinfo("Success", f"MIDI file saved to: {file_path}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save MIDI file: {str(e)}")
+            traceback.print_exc()
+
+    def write_midi_from_xml(self, file_path):
+        """Rebuild a MIDI file from the XML in the text editor and save it to file_path"""
+        # Parse current XML from text widget to rebuild MIDI
+        content = self.text.get('1.0', 'end')
+        xml_start = content.find('<MidiFile')
+        if xml_start == -1:
+            raise ValueError("No valid XML found in text editor.")
             
+        xml_content = content[xml_start:]
+        root = ET.fromstring(xml_content)
+        
+        io_debug = log_io.isEnabledFor(DEBUG)
+        if io_debug:
             # Debug: check what we're actually parsing
-            print(f"XML content preview: {xml_content[:500]}...")
-            print(f"Found {len(root.findall('Track'))} tracks in XML")
-            print(f"Original MIDI had {len(self.midi_data.tracks)} tracks")
+            log_io.debug("XML content preview: %s...", xml_content[:500])
+            log_io.debug("Found %d tracks in XML", len(root.findall('Track')))
+            log_io.debug("Original MIDI had %d tracks", len(self.midi_data.tracks))
             
             # Debug: Compare original vs XML message counts
-            orig_msg_counts = [len(track) for track in self.midi_data.tracks]
-            xml_msg_counts = [len(track.findall('Message')) for track in root.findall('Track')]
-            print(f"Original message counts per track: {orig_msg_counts}")
-            print(f"XML message counts per track: {xml_msg_counts}")
-            
-            # Debug: Check ticks_per_beat
-            orig_tpb = self.midi_data.ticks_per_beat
-            xml_tpb = int(root.get('ticks_per_beat', 480))
-            print(f"Ticks per beat: Original={orig_tpb}, XML={xml_tpb}")
-            if orig_tpb != xml_tpb:
-                print("⚠️  WARNING: Ticks per beat mismatch!")
-            
-            # Create new MIDI file from XML
-            ticks_per_beat = int(root.get('ticks_per_beat', 480))
-            new_midi = MidiFile(ticks_per_beat=ticks_per_beat)
-            
-            for track_elem in root.findall('Track'):
-                track = MidiTrack()
-                track_name = track_elem.get('name', '')
-                track.name = track_name
-                
+            log_io.debug("Original message counts per track: %s", [len(track) for track in self.midi_data.tracks])
+            log_io.debug("XML message counts per track: %s",
+                         [len(track.findall('Message')) for track in root.findall('Track')])
+        
+        # Check ticks_per_beat
+        orig_tpb = self.midi_data.ticks_per_beat
+        xml_tpb = int(root.get('ticks_per_beat', 480))
+        log_io.debug("Ticks per beat: Original=%d, XML=%d", orig_tpb, xml_tpb)
+        if orig_tpb != xml_tpb:
+            log_io.warning("⚠️  WARNING: Ticks per beat mismatch!")
+        
+        # Create new MIDI file from XML
+        ticks_per_beat = int(root.get('ticks_per_beat', 480))
+        new_midi = MidiFile(ticks_per_beat=ticks_per_beat)
+        
+        for track_elem in root.findall('Track'):
+            track = MidiTrack()
+            track_name = track_elem.get('name', '')
+            track.name = track_name
+            
+            if io_debug:
                 # Debug: track processing
                 messages_found = track_elem.findall('Message')
-                print(f"Processing track '{track_name}': found {len(messages_found)} messages")
+                log_io.debug("Processing track '%s': found %d messages", track_name, len(messages_found))
                 
                 # Count different message types for debugging
                 msg_types = {}
                 for msg_elem in messages_found:
                     msg_type = msg_elem.get('type')
                     msg_types[msg_type] = msg_types.get(msg_type, 0) + 1
-                print(f"  Message types: {dict(sorted(msg_types.items()))}")
-                  # Sort messages by time for proper MIDI ordering                # Process messages in their original XML order (don't sort!)
-                # The XML already preserves the correct MIDI message order with proper delta times
-                for msg_elem in track_elem.findall('Message'):
-                    msg_type = msg_elem.get('type')
-                    delta_time = int(msg_elem.get('time', 0))  # This is the correct delta time from original MIDI
-                    
-                    try:
-                        # Build kwargs for message creation, excluding XML-specific attributes
-                        kwargs = {}
-                        for key, value in msg_elem.attrib.items():
-                            if key not in ('type', 'time', 'abs_time', 'duration'):
-                                # Convert string values back to appropriate types
-                                try:
-                                    # Try to convert to int first (most MIDI attributes are integers)
-                                    if isinstance(value, str) and value.lstrip('-').isdigit():
-                                        kwargs[key] = int(value)
-                                    elif key == 'data' and isinstance(value, str):
-                                        # Handle sysex data conversion
-                                        if value.startswith('[') and value.endswith(']'):
-                                            kwargs[key] = eval(value)
-                                        else:
-                                            kwargs[key] = []
+                log_io.debug("  Message types: %s", dict(sorted(msg_types.items())))
+              # Sort messages by time for proper MIDI ordering                # Process messages in their original XML order (don't sort!)
+            # The XML already preserves the correct MIDI message order with proper delta times
+            for msg_elem in track_elem.findall('Message'):
+                msg_type = msg_elem.get('type')
+                delta_time = int(msg_elem.get('time', 0))  # This is the correct delta time from original MIDI
+                
+                try:
+                    # Build kwargs for message creation, excluding XML-specific attributes
+                    kwargs = {}
+                    for key, value in msg_elem.attrib.items():
+                        if key not in ('type', 'time', 'abs_time', 'duration'):
+                            # Convert string values back to appropriate types
+                            try:
+                                # Try to convert to int first (most MIDI attributes are integers)
+                                if isinstance(value, str) and value.lstrip('-').isdigit():
+                                    kwargs[key] = int(value)
+                                elif key == 'data' and isinstance(value, str):
+                                    # Handle sysex data conversion
+                                    if value.startswith('[') and value.endswith(']'):
+                                        kwargs[key] = eval(value)
                                     else:
-                                        # Keep as string (for text, name, key attributes)
-                                        kwargs[key] = value
-                                except:
-                                    # If conversion fails, keep original value
+                                        kwargs[key] = []
+                                else:
+                                    # Keep as string (for text, name, key attributes)
                                     kwargs[key] = value
+                            except:
+                                # If conversion fails, keep original value
+                                kwargs[key] = value
+                    
+                    # Create message based on type - use generic approach to preserve all attributes
+                    try:
+                        # Determine if this is a meta message or regular message
+                        is_meta_message = msg_type in [
+                            'set_tempo', 'time_signature', 'key_signature', 'track_name', 'text', 
+                            'copyright', 'marker', 'cue_marker', 'lyrics', 'midi_port', 'end_of_track',
+                            'sequence_number', 'channel_prefix', 'device_name', 'instrument_name', 
+                            'program_name', 'smpte_offset', 'sequencer_specific'
+                        ]
                         
-                        # Create message based on type - use generic approach to preserve all attributes
-                        try:
-                            # Determine if this is a meta message or regular message
-                            is_meta_message = msg_type in [
-                                'set_tempo', 'time_signature', 'key_signature', 'track_name', 'text', 
-                                'copyright', 'marker', 'cue_marker', 'lyrics', 'midi_port', 'end_of_track',
-                                'sequence_number', 'channel_prefix', 'device_name', 'instrument_name', 
-                                'program_name', 'smpte_offset', 'sequencer_specific'
-                            ]
-                            
-                            if is_meta_message:
-                                # Create MetaMessage with all available kwargs
-                                msg = mido.MetaMessage(msg_type, time=delta_time, **kwargs)
-                            else:
-                                # Create regular Message with all available kwargs
-                                msg = mido.Message(msg_type, time=delta_time, **kwargs)
-                                
-                        except Exception as e:
-                            print(f"Failed to create message {msg_type} with kwargs {kwargs}: {e}")
-                            print(f"Message element attributes: {dict(msg_elem.attrib)}")
-                            # Try to provide more specific error information
-                            import traceback
-                            traceback.print_exc()
-                            continue
+                        if is_meta_message:
+                            # Create MetaMessage with all available kwargs
+                            msg = mido.MetaMessage(msg_type, time=delta_time, **kwargs)
+                        else:
+                            # Create regular Message with all available kwargs
+                            msg = mido.Message(msg_type, time=delta_time, **kwargs)
                             
-                        # Successfully created message
-                        track.append(msg)
-                        if msg_type not in ['note_on', 'note_off']:  # Don't spam with note messages
-                            print(f"Successfully created {msg_type} message: {msg}")
-                        
                     except Exception as e:
-                        print(f"Error processing message element {msg_elem.attrib}: {e}")
+                        log_io.error("Failed to create message %s with kwargs %s: %s", msg_type, kwargs, e)
+                        log_io.error("Message element attributes: %s", dict(msg_elem.attrib), exc_info=True)
                         continue
-                
-                # Add the completed track to the MIDI file
-                new_midi.tracks.append(track)
-                print(f"Added track '{track.name}' with {len(track)} messages to MIDI file")
-            
-            # Debug: Show how many tracks we created
-            print(f"Created MIDI file with {len(new_midi.tracks)} tracks")
+                        
+                    # Successfully created message
+                    track.append(msg)
+                    if io_debug and msg_type not in ['note_on', 'note_off']:  # Don't spam with note messages
+                        log_io.debug("Successfully created %s message: %s", msg_type, msg)
+                    
+                except Exception as e:
+                    log_io.error("Error processing message element %s: %s", msg_elem.attrib, e)
+                    continue
             
+            # Add the completed track to the MIDI file
+            new_midi.tracks.append(track)
+            log_io.debug("Added track '%s' with %d messages to MIDI file", track.name, len(track))
+        
+        log_io.info("Created MIDI file with %d tracks", len(new_midi.tracks))
+        
+        if io_debug:
             # Debug: Final summary of what we're saving
-            print("\n=== FINAL SAVE SUMMARY ===")
+            log_io.debug("=== FINAL SAVE SUMMARY ===")
             for i, track in enumerate(new_midi.tracks):
-                print(f"Track {i} ('{track.name}'): {len(track)} messages")
+                log_io.debug("Track %d ('%s'): %d messages", i, track.name, len(track))
                 # Count message types
                 msg_types = {}
                 for msg in track:
                     msg_types[msg.type] = msg_types.get(msg.type, 0) + 1
-                print(f"  Message types: {dict(sorted(msg_types.items()))}")
+                log_io.debug("  Message types: %s", dict(sorted(msg_types.items())))
                 
                 # Show first few messages
-                print(f"  First 3 messages:")
+                log_io.debug("  First 3 messages:")
                 for j, msg in enumerate(track[:3]):
-                    print(f"    {j}: {msg}")
-              # Compare with original
-            print(f"\nComparison with original:")
-            print(f"  Original: {len(self.midi_data.tracks)} tracks")
-            print(f"  Reconstructed: {len(new_midi.tracks)} tracks")
+                    log_io.debug("    %d: %s", j, msg)
+            # Compare with original
+            log_io.debug("Comparison with original:")
+            log_io.debug("  Original: %d tracks", len(self.midi_data.tracks))
+            log_io.debug("  Reconstructed: %d tracks", len(new_midi.tracks))
             
             for i, (orig_track, new_track) in enumerate(zip(self.midi_data.tracks, new_midi.tracks)):
-                print(f"  Track {i}: {len(orig_track)} → {len(new_track)} messages")
-            print("==========================")
-            
-            # Save the MIDI file
-            new_midi.save(file_path)
-            messagebox.showinfo("Success", f"MIDI file saved to: {file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save MIDI file: {str(e)}")
-            traceback.print_exc()
+                log_io.debug("  Track %d: %d → %d messages", i, len(orig_track), len(new_track))
+            log_io.debug("==========================")
+        
+        # Save the MIDI file
+        new_midi.save(file_path)
 
     def create_gaps(self):
         """Create gaps using absolute time reconstruction method that properly handles MIDI delta times."""
@@ -954,144 +2512,10 @@ class MidiGapperGUI(tk.Tk):
             if gap_ms > 1000:
                 messagebox.showwarning("Warning", "Gap value is very large (>1000ms). This may cause significant changes to the music.")
             
-            # Calculate gap in ticks
-            gap_seconds = gap_ms / 1000.0
-            ticks_per_second = self.midi_data.ticks_per_beat * (1e6 / self.tempo_us)
-            gap_ticks = int(gap_seconds * ticks_per_second)
-            print(f"[ROBUST GAP] Creating gaps of {gap_ms} ms ({gap_ticks} ticks)")
-
-            content = self.text.get('1.0', 'end')
-            xml_start = content.find('<MidiFile')
-            if xml_start == -1:
-                messagebox.showerror("Error", "No valid XML found in text editor.")
-                return
-            xml_content = content[xml_start:]
-            root = ET.fromstring(xml_content)
+            gap_ticks = self.gap_ticks(gap_ms)
+            log_gap.info("[ROBUST GAP] Creating gaps of %s ms (%d ticks)", gap_ms, gap_ticks)
 
-            total_modifications = 0
-            min_duration_ticks = max(10, gap_ticks // 4)  # Minimum note duration
-            
-            # Process each track
-            for track_elem in root.findall('Track'):
-                print(f"Processing track with {len(track_elem.findall('Message'))} messages")
-                
-                # Step 1: Parse all events into absolute time
-                events = []
-                abs_time = 0
-                
-                for msg_elem in track_elem.findall('Message'):
-                    delta_time = int(msg_elem.get('time', 0))
-                    abs_time += delta_time
-                    
-                    event = {
-                        'element': msg_elem,
-                        'original_abs_time': abs_time,
-                        'new_abs_time': abs_time,  # Will be modified if needed
-                        'original_delta': delta_time,
-                        'type': msg_elem.get('type'),
-                        'channel': int(msg_elem.get('channel', 0)) if msg_elem.get('channel') is not None else None,
-                        'note': int(msg_elem.get('note', 0)) if msg_elem.get('note') is not None else None,
-                        'velocity': int(msg_elem.get('velocity', 0)) if msg_elem.get('velocity') is not None else None
-                    }
-                    events.append(event)
-                
-                # Step 2: Find note pairs (note_on -> note_off for same channel/pitch)
-                active_notes = {}  # (channel, note) -> start_event
-                note_pairs = []
-                
-                for event in events:
-                    if event['type'] == 'note_on' and event['velocity'] and event['velocity'] > 0:
-                        key = (event['channel'], event['note'])
-                        active_notes[key] = event
-                    elif (event['type'] == 'note_off' or 
-                          (event['type'] == 'note_on' and (not event['velocity'] or event['velocity'] == 0))):
-                        key = (event['channel'], event['note'])
-                        if key in active_notes:
-                            start_event = active_notes[key]
-                            note_pairs.append((start_event, event))
-                            del active_notes[key]
-                
-                # Step 3: Group note pairs by pitch and apply gap logic
-                notes_by_pitch = {}
-                for start_event, end_event in note_pairs:
-                    key = (start_event['channel'], start_event['note'])
-                    notes_by_pitch.setdefault(key, []).append((start_event, end_event))
-                
-                track_modifications = 0
-                
-                for key, notes in notes_by_pitch.items():
-                    if len(notes) < 2:
-                        continue
-                    
-                    # Sort by original start time
-                    notes.sort(key=lambda x: x[0]['original_abs_time'])
-                    
-                    channel, pitch = key
-                    
-                    for i in range(1, len(notes)):
-                        prev_start_event, prev_end_event = notes[i-1]
-                        curr_start_event, curr_end_event = notes[i]
-                        
-                        # Calculate gap using current absolute times (which may have been modified)
-                        prev_end_time = prev_end_event['new_abs_time']
-                        curr_start_time = curr_start_event['new_abs_time']
-                        gap = curr_start_time - prev_end_time
-                        
-                        if gap < gap_ticks:
-                            # Calculate new end time for previous note
-                            new_prev_end_time = curr_start_time - gap_ticks
-                            
-                            # Check if new note duration would be acceptable
-                            prev_start_time = prev_start_event['new_abs_time']
-                            new_duration = new_prev_end_time - prev_start_time
-                            
-                            if new_duration >= min_duration_ticks:
-                                # Apply the modification
-                                prev_end_event['new_abs_time'] = new_prev_end_time
-                                track_modifications += 1
-                                
-                                if track_modifications <= 5:  # Debug first few
-                                    print(f"  Modified Ch{channel} Note{pitch}: gap {gap} -> {gap_ticks} ticks (shortened by {prev_end_time - new_prev_end_time})")
-                            else:
-                                if track_modifications <= 5:
-                                    print(f"  Skipped Ch{channel} Note{pitch}: would make note too short ({new_duration} < {min_duration_ticks})")
-                
-                print(f"Track modifications: {track_modifications}")
-                total_modifications += track_modifications
-                
-                # Step 4: Rebuild the entire track with new delta times
-                if track_modifications > 0:
-                    # Sort all events by their new absolute times
-                    events.sort(key=lambda x: x['new_abs_time'])
-                    
-                    # Clear the track and rebuild it
-                    for msg_elem in list(track_elem):
-                        track_elem.remove(msg_elem)
-                    
-                    # Recalculate delta times and add events back
-                    prev_time = 0
-                    for event in events:
-                        new_delta = event['new_abs_time'] - prev_time
-                        event['element'].set('time', str(new_delta))
-                        track_elem.append(event['element'])
-                        prev_time = event['new_abs_time']
-                    
-                    print(f"Rebuilt track with {len(events)} events")
-            
-            if total_modifications > 0:
-                # Convert modified XML back to string and update the text editor
-                xml_str = ET.tostring(root, encoding='unicode')
-                dom = minidom.parseString(xml_str)
-                pretty_xml = dom.toprettyxml(indent='  ')
-                lines = [line for line in pretty_xml.split('\n') if line.strip()]
-                formatted_xml = '\n'.join(lines[1:])
-                new_content = content[:xml_start] + formatted_xml
-                self.text.delete('1.0', 'end')
-                self.text.insert('1.0', new_content)
-                self.modifications_applied = True
-                self.text.event_generate('<<Modified>>')
-                
-                print(f"[ROBUST GAP] Successfully applied {total_modifications} gap modifications")
+            total_modifications = self.apply_gaps(gap_ticks)
             
             summary_msg = f"[ROBUST GAP] Created {gap_ms} ms gaps by modifying {total_modifications} note durations."
             messagebox.showinfo("Success", summary_msg)
@@ -1100,6 +2524,33 @@ class MidiGapperGUI(tk.Tk):
             messagebox.showerror("Error", f"Failed to create gaps: {str(e)}")
             traceback.print_exc()
 
+    def gap_ticks(self, gap_ms):
+        """A gap length in milliseconds as ticks at the file's tempo"""
+        ticks_per_second = self.midi_data.ticks_per_beat * (1e6 / self.tempo_us)
+        return int(gap_ms / 1000.0 * ticks_per_second)
+
+    @timed('apply_gaps')
+    def apply_gaps(self, gap_ticks):
+        """Shorten notes in the editor XML so repeated notes are separated by at least gap_ticks.
+
+        Returns the number of notes shortened; the editor is only rewritten when that is non-zero.
+        """
+        content = self.text.get('1.0', 'end')
+        xml_start = content.find('<MidiFile')
+        if xml_start == -1:
+            raise ValueError("No valid XML found in text editor.")
+        formatted_xml, total_modifications = gap_xml(content[xml_start:], gap_ticks)
+        if total_modifications > 0:
+            new_content = content[:xml_start] + formatted_xml
+            self.text.delete('1.0', 'end')
+            self.text.insert('1.0', new_content)
+            self.modifications_applied = True
+            self.text.event_generate('<<Modified>>')
+            
+            log_gap.info("[ROBUST GAP] Successfully applied %d gap modifications", total_modifications)
+        return total_modifications
+
+    @timed('draw_visualization')
     def draw_visualization(self, notes, max_time):
         self.canvas.delete('all')
         self.canvas.update_idletasks()
@@ -1183,6 +2634,7 @@ class MidiGapperGUI(tk.Tk):
             self.canvas.yview_moveto(1.0)
             self.scroll_to_bottom_on_next_draw = False
 
+    @timed('draw_keyboard')
     def draw_keyboard(self):
         """Draw an 88-key piano keyboard in Synthesia style underneath the visualization."""
         if not hasattr(self, 'keyboard_canvas'):
@@ -1193,6 +2645,7 @@ class MidiGapperGUI(tk.Tk):
         
         # Clear previous key references
         self.keyboard_keys = {}
+        self.keyboard_highlighter.reset(self.keyboard_keys)
         
         width = self.keyboard_canvas.winfo_width()
         height = self.keyboard_canvas.winfo_height()
@@ -1272,166 +2725,67 @@ class MidiGapperGUI(tk.Tk):
                 
                 white_key_x += white_key_width
 
+    def set_notes(self, notes, velocities, event_stream=None):
+        """Replace the note table; velocities[i] belongs to notes[i] (the note id).
+
+        event_stream is the full channel-message stream for playback; without
+        one, a note-only stream is compiled from the table.
+        """
+        self.notes = notes
+        self.note_velocities = velocities
+        if event_stream is None:
+            event_stream = MidiEventStream.from_notes(notes, velocities)
+        self.event_stream = event_stream
+        self.rebuild_note_index()
+
+    def rebuild_note_index(self):
+        """Rebuild the time index over self.notes and hand the event stream to playback"""
+        self.note_index = NoteIntervalIndex(self.notes)
+        if hasattr(self, 'playback_scheduler'):
+            self.playback_scheduler.load(self.event_stream)
+
+    def sync_playback_channels(self):
+        """Tell the playback scheduler which channels may sound"""
+        deleted_channels = getattr(self, 'deleted_channels', set())
+        self.playback_scheduler.channels = frozenset(
+            ch for ch in getattr(self, 'visible_channels', set()) if ch not in deleted_channels)
+
+    def get_active_notes(self, position):
+        """Return the set of (note, channel) pairs sounding at position (seconds)"""
+        active = set()
+        note_index = getattr(self, 'note_index', None)
+        if note_index is None:
+            return active
+        visible_channels = getattr(self, 'visible_channels', set())
+        deleted_channels = getattr(self, 'deleted_channels', set())
+        for note_id in note_index.active_at(position):
+            _, note, channel, _ = self.notes[note_id]
+            if channel in visible_channels and channel not in deleted_channels:
+                active.add((note, channel))
+        return active
+
+    @timed('update_keyboard_highlighting')
     def update_keyboard_highlighting(self):
-        """Update keyboard key highlighting based on notes visible in current viewport"""
+        """Update keyboard key highlighting for the notes sounding at the current position"""
         if not hasattr(self, 'keyboard_canvas') or not hasattr(self, 'keyboard_keys'):
             return
             
-        # Reset all keys to their default colors first
-        for note, key_id in self.keyboard_keys.items():
-            semitone = note % 12
-            if semitone in [1, 3, 6, 8, 10]:  # Black keys
-                self.keyboard_canvas.itemconfig(key_id, fill='#1a1a1a')
-            else:  # White keys
-                self.keyboard_canvas.itemconfig(key_id, fill='white')        # IMPROVED: Use visual rectangle positions for accurate highlighting
-        # This eliminates all coordinate mapping errors and timing drift issues
-        currently_playing_notes = set()
-        
-        if hasattr(self, 'canvas') and hasattr(self, 'rect_data'):
-            try:
-                # FIXED: Use direct canvas coordinate methods to eliminate drift
-                # Get the actual visible area using canvas methods that don't drift
-                canvas_height = self.canvas.winfo_height()
-                
-                # Get the top-left corner of the visible area in canvas coordinates
-                visible_top_y = self.canvas.canvasy(0)  # Top of visible area
-                visible_bottom_y = self.canvas.canvasy(canvas_height)  # Bottom of visible area
-                
-                # The blue line is at the bottom edge of the visible viewport
-                # This is where notes should be highlighted (when they touch the keyboard)
-                blue_line_y = visible_bottom_y                
-                # Use a small tolerance around the blue line for intersection
-                highlight_tolerance = 5.0  # Very tight tolerance for precise highlighting
-                
-                # OPTIMIZED: Use spatial query to only check notes near the blue line
-                # This dramatically improves performance for large MIDI files
-                search_top = blue_line_y - highlight_tolerance - 50  # Extra margin for safety
-                search_bottom = blue_line_y + highlight_tolerance + 50
-                
-                # Get canvas width for the search area
-                try:
-                    canvas_width = float(self.canvas.cget('scrollregion').split()[2])
-                except:
-                    canvas_width = self.canvas.winfo_width()
-                
-                # Find only rectangles that overlap with the blue line area
-                # This is much faster than checking every single note
-                overlapping_items = self.canvas.find_overlapping(0, search_top, canvas_width, search_bottom)
-                
-                # Check only the notes found in the spatial query
-                for item in overlapping_items:
-                    try:
-                        # Get the tags for this canvas item
-                        tags = self.canvas.gettags(item)
-                        
-                        # Find the note data tag (skip system tags like 'current')
-                        note_tag = None
-                        for tag in tags:
-                            if tag in self.rect_data:
-                                note_tag = tag
-                                break
-                        
-                        if note_tag:
-                            note_data = self.rect_data[note_tag]
-                            
-                            # Skip notes from deleted channels
-                            if note_data.get('channel') in getattr(self, 'deleted_channels', set()):
-                                continue
-                            
-                            # Get precise coordinates for intersection test
-                            coords = self.canvas.coords(item)
-                            if len(coords) >= 4:
-                                rect_top_y = coords[1]  # y1
-                                rect_bottom_y = coords[3]  # y2
-                                
-                                # Check if note rectangle intersects with the blue line
-                                if (rect_top_y <= blue_line_y + highlight_tolerance and 
-                                    rect_bottom_y >= blue_line_y - highlight_tolerance):
-                                    currently_playing_notes.add((note_data['note'], note_data.get('channel', 0)))
-                    except:
-                        # If coordinate lookup fails, skip this note
-                        continue
-                            
-            except:
-                # Fallback: if visual approach fails, use audio position
-                audio_position = self.get_actual_audio_position()
-                if audio_position >= 0:
-                    for note_data in getattr(self, 'notes_for_visualization', []):
-                        if note_data.get('channel') in getattr(self, 'deleted_channels', set()):
-                            continue
-                        note_start = note_data.get('start_time', 0)
-                        note_end = note_start + note_data.get('duration', 0)
-                        if note_start <= audio_position <= note_end:
-                            currently_playing_notes.add((note_data['note'], note_data.get('channel', 0)))
+        # Query the note time index at the playback position. The position at the
+        # blue line is the same value the scroll sync derives from the viewport, so
+        # no canvas items need to be inspected.
+        currently_playing_notes = self.get_active_notes(self.get_actual_audio_position())
           
-        # Update MIDI playback based on highlighted notes
-        if self.is_playing and hasattr(self, 'note_player') and self.note_player.midi_out:
-            self._update_midi_notes_from_highlighting(currently_playing_notes)
-        
-        # Highlight currently playing notes (extract just the note numbers for display)
+        # Highlight currently playing notes (extract just the note numbers for display).
+        # Only keys whose state changed since the last frame are reconfigured.
         display_notes = {note for note, channel in currently_playing_notes}
-        for note in display_notes:
-            if note in self.keyboard_keys:
-                key_id = self.keyboard_keys[note]
-                semitone = note % 12
-                
-                if semitone in [1, 3, 6, 8, 10]:  # Black keys
-                    # Highlight black keys with bright blue
-                    self.keyboard_canvas.itemconfig(key_id, fill='#4080FF')
-                else:  # White keys
-                    # Highlight white keys with light blue
-                    self.keyboard_canvas.itemconfig(key_id, fill='#B0D0FF')
-
-    def _update_midi_notes_from_highlighting(self, currently_playing_notes):
-        """Update MIDI note playback based on currently highlighted notes"""
-        if not hasattr(self, 'active_midi_notes'):
-            self.active_midi_notes = set()
-        
-        # Get sets of (note, channel) tuples for comparison
-        new_notes = currently_playing_notes
-        active_notes = self.active_midi_notes
-          # Notes to turn OFF (were playing but no longer highlighted)
-        notes_to_stop = active_notes - new_notes
-        for note, channel in notes_to_stop:
-            if channel not in getattr(self, 'visible_channels', set()):
-                continue  # Skip invisible channels
-            try:
-                if hasattr(self, 'note_player') and self.note_player and self.note_player.midi_out:
-                    self.note_player._note_off(channel, note)
-            except:
-                pass
-        
-        # Notes to turn ON (newly highlighted)
-        notes_to_start = new_notes - active_notes
-        for note, channel in notes_to_start:
-            if channel not in getattr(self, 'visible_channels', set()):
-                continue  # Skip invisible channels
-            try:
-                # Get velocity from note data if available
-                velocity = 64  # Default velocity
-                for note_data in getattr(self, 'notes_for_visualization', []):
-                    if note_data.get('note') == note and note_data.get('channel') == channel:
-                        velocity = note_data.get('velocity', 64)
-                        break
-                
-                if hasattr(self, 'note_player') and self.note_player and self.note_player.midi_out:
-                    self.note_player._note_on(channel, note, velocity)
-            except:
-                pass
-        
-        # Update the active notes set
-        self.active_midi_notes = new_notes.copy()
+        self.keyboard_highlighter.update(display_notes)
 
     def get_actual_audio_position(self):
-        """Calculate the actual audio playback position with perfect timing synchronization"""
-        if not self.is_playing or self.playback_start_time is None:
+        """Return the playback position, read from the transport while playing"""
+        if not self.is_playing:
             # If not playing, use the visual position for manual seeking
             return self.playback_position
-          # Calculate elapsed time since audio started
-        elapsed_time = time.time() - self.playback_start_time
-        
-        # The playback_start_time represents the current playback position
-        return elapsed_time
+        return self.transport.position()
 
     def on_text_modified(self, event):
         # Reset modified flag
@@ -1450,14 +2804,173 @@ class MidiGapperGUI(tk.Tk):
                     # This ensures gaps and other modifications are reflected
                     self.rebuild_notes_from_xml(root)
                 except Exception as e:
-                    print(f"Error parsing XML for visualization: {e}")
+                    log_load.error("Error parsing XML for visualization: %s", e)
                     return
 
+    @property
+    def debug_timing(self):
+        """DEBUG output for the render and playback categories, switchable at runtime"""
+        return diagnostics.debug_timing_enabled()
+    
+    @debug_timing.setter
+    def debug_timing(self, enabled):
+        diagnostics.set_debug_timing(enabled)
+    
+    def toggle_debug_timing(self):
+        self.debug_timing = not self.debug_timing
+        log_playback.info("Debug timing %s", "on" if self.debug_timing else "off")
+    
+    def dump_debug_log(self):
+        """Write the in-memory log ring buffer next to config.json"""
+        path = os.path.join(os.path.dirname(CONFIG_FILE), 'midigapper-log.txt')
+        try:
+            diagnostics.dump_log(path)
+            log_io.info("Log written to: %s", path)
+        except OSError as e:
+            log_io.error("Failed to write log: %s", e)
+    
+    def trace_path(self):
+        return self.config_data.get('trace_file') or os.path.join(os.path.dirname(CONFIG_FILE), 'trace.json')
+    
+    def toggle_trace(self):
+        """Start recording a Chrome trace, or stop and write it"""
+        if not TRACER.enabled:
+            TRACER.start()
+            log_io.info("Trace recording started")
+            return
+        self.save_trace()
+    
+    def save_trace(self):
+        TRACER.stop()
+        path = self.trace_path()
+        try:
+            TRACER.save(path)
+            log_io.info("Trace written to: %s (open in ui.perfetto.dev or chrome://tracing)", path)
+        except OSError as e:
+            log_io.error("Failed to write trace: %s", e)
+    
+    def toggle_input_recording(self):
+        """Start recording scroll/seek/play inputs to a file, or stop"""
+        if self.input_recorder.recording:
+            self.input_recorder.stop()
+            log_io.info("Input recording stopped")
+            return
+        path = self.config_data.get('input_recording_file') or os.path.join(
+            os.path.dirname(CONFIG_FILE), 'input-recording.jsonl')
+        try:
+            self.input_recorder.start(path)
+            log_io.info("Recording input to: %s", path)
+        except OSError as e:
+            log_io.error("Failed to start input recording: %s", e)
+    
+    def toggle_stats_panel(self):
+        """Show or hide the live hot-path timing table"""
+        if self.stats_panel is not None:
+            if self.stats_panel.refresh_id is not None:
+                self.after_cancel(self.stats_panel.refresh_id)
+            self.stats_panel.destroy()
+            self.stats_panel = None
+            return
+        panel = tk.Toplevel(self)
+        panel.title('Timing Stats (ms)')
+        panel.protocol("WM_DELETE_WINDOW", self.toggle_stats_panel)
+        panel.text = tk.Text(panel, width=80, height=20, font=('Courier', 9), wrap='none')
+        panel.text.pack(fill='both', expand=True)
+        panel.refresh_id = None
+        self.stats_panel = panel
+        self.refresh_stats_panel()
+    
+    def refresh_stats_panel(self):
+        panel = self.stats_panel
+        if panel is None:
+            return
+        panel.text.delete('1.0', 'end')
+        panel.text.insert('end', TIMING_STATS.format_table())
+        panel.refresh_id = self.after(self.STATS_PANEL_REFRESH_MS, self.refresh_stats_panel)
+    
+    def memory_structures(self):
+        """Bytes held by each loaded data structure, in the order they are charged"""
+        seen = set()  # Objects shared between structures count once, for the first
+        structures = {}
+        for name in ('midi_data', 'notes_for_visualization', 'notes', 'note_velocities',
+                     'event_stream', 'note_index', 'rect_data'):
+            structures[name] = diagnostics.deep_sizeof(getattr(self, name, None), seen)
+        # The editor's text lives in Tk, outside Python's allocator; count its UTF-8 size
+        structures['xml_text (Tk, estimate)'] = len(self.text.get('1.0', 'end').encode('utf-8'))
+        return structures
+
+    def memory_report(self, top=0, gap_ms=None):
+        """Allocations of load, gap, save and redraw, and bytes per loaded structure and note.
+
+        Nothing the user has loaded is changed: load parses the current file
+        into a throwaway XML tree, gap runs on a copy of the editor XML, the
+        save goes to a temporary file and redraw repaints the same notes.
+        gap_ms defaults to the gap field.
+        """
+        if self.midi_data is None or not self.current_midi_file:
+            raise ValueError("Load a MIDI file first.")
+        structures = self.memory_structures()
+        measure = diagnostics.measure_memory
+        phases = {}
+
+        def load():
+            root = midi_to_xml(MidiFile(self.current_midi_file))
+            return len(pretty_print_xml(root))
+        _, phases['load'] = measure(load, top)
+
+        if gap_ms is None:
+            try:
+                gap_ms = float(self.gap_var.get())
+            except ValueError:
+                gap_ms = 50.0
+        content = self.text.get('1.0', 'end')
+        xml_content = content[max(0, content.find('<MidiFile')):]
+        _, phases['gap'] = measure(lambda: gap_xml(xml_content, self.gap_ticks(gap_ms)), top)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            _, phases['save'] = measure(lambda: self.write_midi_from_xml(os.path.join(tmp, 'memory.mid')), top)
+        _, phases['redraw'] = measure(lambda: self.draw_visualization(self.notes, self.max_time), top)
+
+        total = sum(structures.values())
+        notes = len(self.notes)
+        return {'notes': notes, 'phases': phases, 'structures': structures,
+                'structure_bytes': total, 'bytes_per_note': total / notes if notes else 0.0}
+
+    def show_memory_report(self):
+        """Log the memory report for the loaded file"""
+        try:
+            report = self.memory_report(top=5)
+        except Exception as e:
+            log_io.error("Memory report failed: %s", e)
+            return
+        log_io.info("Memory report for %s:\n%s", self.current_midi_file,
+                    diagnostics.format_memory_report(report))
+        for phase, usage in report['phases'].items():
+            for site, size in usage['top']:
+                log_io.debug("%s: %+d bytes at %s", phase, size, site)
+
     def on_closing(self):
+        # Export hot-path timings if config.json asks for them
+        stats_path = self.config_data.get('timing_stats_file')
+        if stats_path:
+            try:
+                TIMING_STATS.export(stats_path)
+                log_io.info("Timing stats written to: %s", stats_path)
+            except OSError as e:
+                log_io.error("Failed to write timing stats: %s", e)
+        if TRACER.enabled:
+            self.save_trace()
+        self.input_recorder.stop()
+        if self.stats_panel is not None:
+            self.toggle_stats_panel()
+        
         # Stop any ongoing playback
         self.stop_midi()
+        self.stall_watchdog.stop()
         
         # Clean up MIDI note player
+        self.playback_scheduler.stop()
+        self.synth_loader.cancel()
         if hasattr(self, 'note_player') and self.note_player:
             self.note_player.close()
         
@@ -1521,6 +3034,7 @@ class MidiGapperGUI(tk.Tk):
             self.visible_channels.add(ch)
         else:
             self.visible_channels.discard(ch)
+        self.sync_playback_channels()
         self.draw_visualization(self.notes, self.max_time)
 
     def select_only_channel(self, ch):
@@ -1539,6 +3053,7 @@ class MidiGapperGUI(tk.Tk):
                 else:
                     var.set(False)
             self.visible_channels = {ch}
+        self.sync_playback_channels()
         # Redraw visualization with updated visibility
         self.draw_visualization(self.notes, self.max_time)
 
@@ -1597,7 +3112,9 @@ class MidiGapperGUI(tk.Tk):
     def rebuild_notes_from_xml(self, root):
         """Rebuild note visualization data from XML by processing note on/off pairs"""
         notes = []
-        active_notes = {}  # key: (channel, note) -> start_time
+        velocities = []
+        channel_events = []  # (time, status, data1, data2) for the playback stream
+        active_notes = {}  # key: (channel, note) -> (start_time, velocity)
         
         # Get ticks per beat for time conversion
         ticks_per_beat = int(root.get('ticks_per_beat', 480))
@@ -1616,7 +3133,7 @@ class MidiGapperGUI(tk.Tk):
                         abs_time_ticks = int(float(abs_time_str))
                         abs_time = (abs_time_ticks / ticks_per_beat) * (tempo_us / 1e6)
                     except (ValueError, TypeError) as e:
-                        print(f"Warning: Invalid abs_time value '{abs_time_str}', falling back to delta time calculation")
+                        log_load.warning("Warning: Invalid abs_time value '%s', falling back to delta time calculation", abs_time_str)
                         delta_time = int(msg_elem.get('time', 0))
                         abs_time += (delta_time / ticks_per_beat) * (tempo_us / 1e6)
                 else:
@@ -1626,6 +3143,10 @@ class MidiGapperGUI(tk.Tk):
                 
                 msg_type = msg_elem.get('type')
                 
+                encoded = MidiEventStream.encode(msg_type, msg_elem.get)
+                if encoded is not None:
+                    channel_events.append((abs_time,) + encoded)
+                
                 # Update tempo for time calculations
                 if msg_type == 'set_tempo':
                     tempo_us = int(msg_elem.get('tempo', 500000))
@@ -1638,28 +3159,30 @@ class MidiGapperGUI(tk.Tk):
                     
                     if velocity > 0:
                         # Note on
-                        active_notes[(channel, note)] = abs_time
+                        active_notes[(channel, note)] = (abs_time, velocity)
                     else:
                         # Note off (velocity 0)
                         key = (channel, note)
                         if key in active_notes:
-                            start_time = active_notes.pop(key)
+                            start_time, start_velocity = active_notes.pop(key)
                             duration = abs_time - start_time
                             if duration > 0:
                                 notes.append((start_time, note, channel, duration))
+                                velocities.append(start_velocity)
                 
                 elif msg_type == 'note_off':
                     note = int(msg_elem.get('note', 0))
                     channel = int(msg_elem.get('channel', 0))
                     key = (channel, note)
                     if key in active_notes:
-                        start_time = active_notes.pop(key)
+                        start_time, start_velocity = active_notes.pop(key)
                         duration = abs_time - start_time
                         if duration > 0:
                             notes.append((start_time, note, channel, duration))
+                            velocities.append(start_velocity)
         
         # Update visualization data
-        self.notes = notes
+        self.set_notes(notes, velocities, MidiEventStream.from_events(channel_events))
         self.max_time = max((t + d for t, _, _, d in notes), default=1)
         self.draw_visualization(self.notes, self.max_time)
 
@@ -1959,6 +3482,7 @@ class MidiGapperGUI(tk.Tk):
                 del self.channel_vars[channel]
             if channel in self.visible_channels:
                 self.visible_channels.discard(channel)
+            self.sync_playback_channels()
             
             # Remove from visualization data
             self.notes_for_visualization = [
@@ -1967,8 +3491,10 @@ class MidiGapperGUI(tk.Tk):
             ]
             
             # Update notes list for visualization
-            self.notes = [(d['start_time'], d['note'], d['channel'], d['duration']) 
-                         for d in self.notes_for_visualization]
+            self.set_notes([(d['start_time'], d['note'], d['channel'], d['duration']) 
+                            for d in self.notes_for_visualization],
+                           [d['velocity'] for d in self.notes_for_visualization],
+                           self.event_stream.without_channel(channel))
             self.max_time = max((d['start_time'] + d['duration'] for d in self.notes_for_visualization), default=1)
             
             # Remove from XML in text widget
@@ -1980,7 +3506,7 @@ class MidiGapperGUI(tk.Tk):
             # Redraw visualization
             self.draw_visualization(self.notes, self.max_time)
             
-            print(f"Channel {channel} deleted successfully")
+            log_gap.info("Channel %d deleted successfully", channel)
             
         except Exception as e:
             import tkinter.messagebox as msgbox
@@ -2020,7 +3546,7 @@ class MidiGapperGUI(tk.Tk):
             self.text.delete('1.0', 'end')
             self.text.insert('1.0', clean_xml)
         except Exception as e:
-            print(f"Error removing channel {channel} from XML: {e}")
+            log_gap.error("Error removing channel %d from XML: %s", channel, e)
 
     def rewind_to_start(self):
         """Rewind playback to the beginning"""
@@ -2030,39 +3556,51 @@ class MidiGapperGUI(tk.Tk):
                 self.stop_midi()
               # Reset position to start
             self.playback_position = 0.0
-            self.playback_start_time = None
             
             # Update displays
             self.update_led_clock()
             self.sync_scrollbar_to_midi_position()
             self.update_keyboard_highlighting()
             
-            print("Rewound to start")
+            log_playback.info("Rewound to start")
             
         except Exception as e:
-            print(f"Error rewinding to start: {e}")
+            log_playback.error("Error rewinding to start: %s", e)
+
+    def dispatch_input(self, kind, *args):
+        """Apply one scroll, seek or transport input; recorded while input recording is on.
 
+        kind is 'wheel' or 'arrow' (scroll units), 'scrollbar' (scrollbar
+        command arguments), 'seek' (seconds) or 'play_pause'. Interaction
+        replays feed recorded inputs back through here.
+        """
+        self.input_recorder.record(kind, *args)
+        if kind in ('wheel', 'arrow'):
+            self.scroll_coalescer.scroll(*args)
+        elif kind == 'scrollbar':
+            self.scroll_coalescer.command(*args)
+        elif kind == 'seek':
+            self.seek_relative(*args)
+        elif kind == 'play_pause':
+            self.toggle_play_pause()
+        else:
+            raise ValueError(f"Unknown input kind: {kind}")
+    
     def toggle_play_pause(self):
-        """Toggle between play and pause using highlighting-driven playback"""
-        print("=== toggle_play_pause() called ===")
+        """Toggle between play and pause"""
+        log_playback.debug("=== toggle_play_pause() called ===")
         try:
-            print(f"Current MIDI file: {getattr(self, 'current_midi_file', 'None')}")
-            print(f"Has note_player: {hasattr(self, 'note_player')}")
-            if hasattr(self, 'note_player'):
-                print(f"note_player.midi_out: {getattr(self.note_player, 'midi_out', 'None')}")
+            log_playback.debug("Current MIDI file: %s", getattr(self, 'current_midi_file', 'None'))
+            log_playback.debug("note_player.midi_out: %s", getattr(getattr(self, 'note_player', None), 'midi_out', 'None'))
             
             if not self.current_midi_file:
-                print("❌ No MIDI file loaded")
+                log_playback.warning("❌ No MIDI file loaded")
                 return
                 
             if not hasattr(self, 'note_player') or not self.note_player.midi_out:
-                print("❌ Note-based MIDI playback not available")
-                print("⚠ Continuing anyway for testing (no audio will be heard)")
-                # Temporarily bypass MIDI output requirement for testing
-                # return
+                log_playback.warning("⚠ No synth output - playing visually without audio")
             
-            # DEBUG: Print current playback position
-            print(f"Current playback_position: {self.playback_position:.2f}s")
+            log_playback.debug("Current playback_position: %.2fs", self.playback_position)
             
             if self.is_playing:
                 # Currently playing, so pause
@@ -2072,121 +3610,133 @@ class MidiGapperGUI(tk.Tk):
                 self.play_midi()
             else:
                 # Not playing, so start
-                print(f"Starting highlighting-driven playback from position: {self.playback_position:.2f}s")
+                log_playback.debug("Starting playback from position: %.2fs", self.playback_position)
                 self.play_midi()
                 
         except Exception as e:
-            print(f"Error toggling play/pause: {e}")
-            import traceback
-            traceback.print_exc()
+            log_playback.error("Error toggling play/pause: %s", e, exc_info=True)
 
     def play_midi(self):
-        """Start highlighting-driven MIDI playback"""
-        print("=== play_midi() called ===")
+        """Start scheduled MIDI playback"""
+        log_playback.debug("=== play_midi() called ===")
         
         if not self.current_midi_file:
-            print("❌ No MIDI file loaded")
+            log_playback.warning("❌ No MIDI file loaded")
             return
             
-        print(f"✓ MIDI file loaded: {self.current_midi_file}")
+        log_playback.debug("✓ MIDI file loaded: %s", self.current_midi_file)
         
         if not hasattr(self, 'note_player'):
-            print("❌ note_player not found")
+            log_playback.error("❌ note_player not found")
             return
             
-        print(f"✓ note_player exists: {type(self.note_player)}")
+        log_playback.debug("✓ note_player exists: %s", type(self.note_player))
         
         if not self.note_player.midi_out:
-            print("⚠ Note-based MIDI playback not available - no MIDI output device")
-            print("✓ Visualization playback will continue without audio")
+            log_playback.info("⚠ No MIDI output device - visualization playback will continue without audio")
         else:
-            print(f"✓ MIDI output device available")
+            log_playback.debug("✓ MIDI output device available")
             
-        print(f"✓ Notes loaded: {len(getattr(self, 'notes_for_visualization', []))}")
-        print(f"✓ Current position: {self.playback_position:.2f}s")
+        log_playback.debug("✓ Notes loaded: %d", len(getattr(self, 'notes_for_visualization', [])))
+        log_playback.debug("✓ Current position: %.2fs", self.playback_position)
         
         try:
-            # Initialize active notes tracking
-            if not hasattr(self, 'active_midi_notes'):
-                self.active_midi_notes = set()
-            
-            # Set timing state for highlighting-driven playback
-            self.playback_start_time = time.time() - self.playback_position
+            self.start_scheduled_playback()
             self.is_playing = True
             self.is_paused = False
             
-            print(f"✓ Highlighting-driven playback state updated: is_playing={self.is_playing}")
+            log_playback.debug("✓ Playback state updated: is_playing=%s", self.is_playing)
               # Update button states
             self.play_pause_button.config(text='⏸', bg='yellow')
-            print("✓ Button updated to pause symbol")
+            log_playback.debug("✓ Button updated to pause symbol")
             
-            # Start the playback timer - this will drive everything through highlighting
-            self.update_playback_timer()
-            print("✓ Playback timer started")
+            # Start the frame loop that mirrors the scheduler in the UI
+            self.frame_scheduler.start(self.update_playback_timer)
+            log_playback.debug("✓ Playback timer started")
             
-            print(f"✓ Highlighting-driven MIDI playback started at position {self.playback_position:.2f}s")
+            log_playback.info("✓ Scheduled MIDI playback started at position %.2fs", self.playback_position)
             
         except Exception as e:
-            print(f"❌ Error in play_midi(): {e}")
-            import traceback
-            traceback.print_exc()
+            log_playback.error("❌ Error in play_midi(): %s", e, exc_info=True)
 
     def start_midi_playback(self):
-        """Start highlighting-driven MIDI playback"""
+        """Start scheduled MIDI playback"""
         self.play_midi()
 
+    def start_scheduled_playback(self):
+        """(Re)start the scheduler thread at playback_position.
+
+        Notes already sounding there are chased from the note index and the
+        program, controller and pitch-bend state from the scheduler's
+        keyframes, so playing or seeking anywhere sounds the same as
+        playing through to that point.
+        """
+        self.sync_playback_channels()
+        self.playback_scheduler.start(self.playback_position, self.note_player,
+                                      self.held_notes_at(self.playback_position))
+
+    def held_notes_at(self, position):
+        """(channel, note, velocity) for notes started before position and still sounding"""
+        held = []
+        for note_id in self.note_index.active_at(position):
+            start, note, channel, _ = self.notes[note_id]
+            if start < position:
+                held.append((channel, note, self.note_velocities[note_id]))
+        return held
+
+    def seek_scheduled_playback(self):
+        """Move running playback to playback_position for a scroll frame or seek key.
+
+        The scheduler thread keeps running and only re-chases controllers;
+        held notes are chased once scrolling or key repeat pauses, so notes
+        are not restruck on every input.
+        """
+        if not self.playback_scheduler.running:
+            self.start_scheduled_playback()
+            return
+        self.playback_scheduler.seek(self.playback_position)
+        if self._seek_chase_id is not None:
+            self.after_cancel(self._seek_chase_id)
+        self._seek_chase_id = self.after(self.SEEK_CHASE_MS, self.chase_held_notes)
+
+    def chase_held_notes(self):
+        self._seek_chase_id = None
+        scheduler = self.playback_scheduler
+        if self.is_playing and scheduler.running:
+            position = scheduler.position()
+            scheduler.seek(position, self.held_notes_at(position))
+
     def pause_midi(self):
-        """Pause highlighting-driven MIDI playback"""
+        """Pause scheduled MIDI playback"""
         if self.is_playing:
             try:
-                # Stop all currently playing MIDI notes
-                if hasattr(self, 'active_midi_notes') and hasattr(self, 'note_player') and self.note_player.midi_out:
-                    for note, channel in self.active_midi_notes:
-                        try:
-                            self.note_player._note_off(channel, note)
-                        except:
-                            pass
-                    self.active_midi_notes.clear()
+                # Stop the scheduler (releases all sounding notes) and keep its position
+                self.playback_scheduler.stop()
+                self.playback_position = self.transport.position()
                 
                 self.is_playing = False
                 self.is_paused = True
                 
-                if self.playback_timer:
-                    self.after_cancel(self.playback_timer)
-                    self.playback_timer = None
-                
-                # Update playback position to current position when paused
-                # Update playback position to current position when paused
-                if self.playback_start_time:
-                    self.playback_position = time.time() - self.playback_start_time
+                self.frame_scheduler.stop()
                 
                 # Update button to show play symbol when paused
                 self.play_pause_button.config(text='▶', bg='lightgreen')
                 
-                print(f"✓ Highlighting-driven MIDI playback paused at {self.playback_position:.2f}s")
+                log_playback.info("✓ Scheduled MIDI playback paused at %.2fs", self.playback_position)
             except Exception as e:
-                print(f"Error pausing MIDI: {e}")
+                log_playback.error("Error pausing MIDI: %s", e)
 
     def stop_midi(self):
-        """Stop highlighting-driven MIDI playback and reset position"""
+        """Stop scheduled MIDI playback and reset position"""
         try:
-            # Stop all currently playing MIDI notes
-            if hasattr(self, 'active_midi_notes') and hasattr(self, 'note_player') and self.note_player.midi_out:
-                for note, channel in self.active_midi_notes:
-                    try:
-                        self.note_player._note_off(channel, note)
-                    except:
-                        pass
-                self.active_midi_notes.clear()
+            # Stop the scheduler thread (releases all sounding notes)
+            self.playback_scheduler.stop()
                 
             self.is_playing = False
             self.is_paused = False
             self.playback_position = 0.0
-            self.playback_start_time = None
                 
-            if self.playback_timer:
-                self.after_cancel(self.playback_timer)
-                self.playback_timer = None
+            self.frame_scheduler.stop()
             
             # Reset button to play symbol when stopped
             self.play_pause_button.config(text='▶', bg='lightgreen')
@@ -2194,19 +3744,13 @@ class MidiGapperGUI(tk.Tk):
             self.update_led_clock()
             self.sync_scrollbar_to_midi_position()
             self.update_keyboard_highlighting()  # Clear any highlighted keys
-            print("✓ Highlighting-driven MIDI playback stopped")
+            log_playback.info("✓ Scheduled MIDI playback stopped")
         except Exception as e:
-            print(f"Error stopping MIDI: {e}")
+            log_playback.error("Error stopping MIDI: %s", e)
             self.playback_position = 0.0
-            self.playback_start_time = None
                 
-            if self.playback_timer:
-                self.after_cancel(self.playback_timer)
-                self.playback_timer = None
-              # Stop playback thread if running
-            if self.playback_thread and self.playback_thread.is_alive():
-                self.playback_stop_event.set()
-                self.playback_thread.join(timeout=1.0)
+            self.frame_scheduler.stop()
+            self.playback_scheduler.stop()
             
             # Reset button to play symbol when stopped
             self.play_pause_button.config(text='▶', bg='lightgreen')
@@ -2214,123 +3758,48 @@ class MidiGapperGUI(tk.Tk):
             self.update_led_clock()
             self.sync_scrollbar_to_midi_position()
             self.update_keyboard_highlighting()  # Clear any highlighted keys
-            print("MIDI playback stopped")
+            log_playback.info("MIDI playback stopped")
         except Exception as e:
-            print(f"Error stopping MIDI: {e}")
-
-    def update_playback_timer(self):
-        """Update playback position and schedule next update"""
-        if self.is_playing and not self.is_paused:
-            # Calculate accurate playback position using the unified timing approach
-            if self.playback_start_time is not None:
-                # Use the same logic as get_actual_audio_position()
-                self.playback_position = self.get_actual_audio_position()
-            
-            # Check if we've reached the end
-            if hasattr(self, 'max_time') and self.playback_position >= self.max_time:
-                self.stop_midi()
-                return
-            
+            log_playback.error("Error stopping MIDI: %s", e)
+
+    def update_playback_timer(self, under_load=False):
+        """Advance one playback frame; called by the frame scheduler.
+
+        Audio is sent by the playback scheduler thread; this only mirrors its
+        position. Position and highlighting run every frame. The LED clock and
+        scroll sync are skipped when the frame scheduler reports the previous
+        frame overran its budget.
+        """
+        if not (self.is_playing and not self.is_paused):
+            return False
+        self.playback_position = self.get_actual_audio_position()
+        
+        # Check if we've reached the end
+        if hasattr(self, 'max_time') and self.playback_position >= self.max_time:
+            self.stop_midi()
+            return False
+        
+        if not under_load:
             # Update LED display
             self.update_led_clock()
             
             # Sync scrollbar position with playback position
             self.sync_scrollbar_to_midi_position()
-              # Update keyboard highlighting
-            self.update_keyboard_highlighting()
-            
-            # Schedule next update (faster update for smoother highlighting)
-            self.playback_timer = self.after(50, self.update_playback_timer)
+        
+        # Update keyboard highlighting
+        self.update_keyboard_highlighting()
+        return True
 
+    @timed('update_led_clock')
     def update_led_clock(self):
         """Update the LED-style position clock display"""
-        self.led_clock.delete('all')
-        
-        # Convert position to minutes:seconds.milliseconds
-        minutes = int(self.playback_position // 60)
-        seconds = int(self.playback_position % 60)
-        milliseconds = int((self.playback_position % 1) * 1000)
-          # Format as MM:SS.mmm
-        time_str = f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
-          # LED segment colors
-        led_on_color = '#00FF00'  # Bright green for active segments
-        led_off_color = '#003300'  # Dark green for inactive segments
-          # Draw LED-style digits (scaled up for larger display and centered)
-        char_width = 18  # Character width
-        char_spacing = 3  # Spacing between characters
-        
-        # Calculate total width needed for the time string
-        total_text_width = len(time_str) * char_width + (len(time_str) - 1) * char_spacing
-          # Center the text horizontally in the 200px wide canvas
-        canvas_width = 200
-        start_x = (canvas_width - total_text_width) // 2
-        
-        # Vertical offset to center the 24px tall digits in the 40px canvas
-        y_offset = (40 - 24) // 2
-        
-        for i, char in enumerate(time_str):
-            x_pos = start_x + i * (char_width + char_spacing)
-            
-            if char == ':':
-                # Draw colon as two dots (centered vertically)
-                self.led_clock.create_oval(x_pos + 6, y_offset + 8, x_pos + 12, y_offset + 14, 
-                                         fill=led_on_color, outline=led_on_color)
-                self.led_clock.create_oval(x_pos + 6, y_offset + 16, x_pos + 12, y_offset + 22, 
-                                         fill=led_on_color, outline=led_on_color)
-            elif char == '.':
-                # Draw decimal point as a small dot (centered vertically)
-                self.led_clock.create_oval(x_pos + 8, y_offset + 20, x_pos + 14, y_offset + 26, 
-                                         fill=led_on_color, outline=led_on_color)
-            else:                # Draw digit using 7-segment display pattern
-                self.draw_led_digit(x_pos, y_offset, char, led_on_color, led_off_color)
-
-    def draw_led_digit(self, x, y_offset, digit, on_color, off_color):
-        """Draw a single LED digit using 7-segment display pattern"""
-        # 7-segment display patterns for digits 0-9
-        segments = {
-            '0': [1, 1, 1, 1, 1, 1, 0],  # top, top-right, bottom-right, bottom, bottom-left, top-left, middle
-            '1': [0, 1, 1, 0, 0, 0, 0],
-            '2': [1, 1, 0, 1, 1, 0, 1],
-            '3': [1, 1, 1, 1, 0, 0, 1],
-            '4': [0, 1, 1, 0, 0, 1, 1],
-            '5': [1, 0, 1, 1, 0, 1, 1],
-            '6': [1, 0, 1, 1, 1, 1, 1],
-            '7': [1, 1, 1, 0, 0, 0, 0],
-            '8': [1, 1, 1, 1, 1, 1, 1],
-            '9': [1, 1, 1, 1, 0, 1, 1]
-        }
-        
-        pattern = segments.get(digit, [0, 0, 0, 0, 0, 0, 0])
-        
-        # Segment coordinates (relative to x position)
-        seg_coords = [
-            # top
-            [(2, 3), (10, 3), (9, 4), (3, 4)],
-            # top-right  
-            [(10, 4), (11, 5), (11, 11), (10, 12)],
-            # bottom-right
-            [(10, 13), (11, 14), (11, 20), (10, 21)],
-            # bottom
-            [(2, 21), (10, 21), (9, 20), (3, 20)],
-            # bottom-left
-            [(2, 13), (3, 14), (3, 20), (2, 21)],
-            # top-left
-            [(2, 4), (3, 5), (3, 11), (2, 12)],
-            # middle
-            [(3, 12), (9, 12), (9, 13), (3, 13)]
-        ]
-          # Draw each segment
-        for i, coords in enumerate(seg_coords):
-            color = on_color if pattern[i] else off_color
-            # Convert relative coordinates to absolute (with vertical centering)
-            abs_coords = []
-            for px, py in coords:
-                abs_coords.extend([x + px, y_offset + py])
-            
-            self.led_clock.create_polygon(abs_coords, fill=color, outline=color)
-    
+        self.led_display.show(self.playback_position)
+
     def on_scroll_with_midi_sync(self, *args):
-        """Handle scrollbar movement and sync MIDI playback position"""
+        """Apply one frame's net scroll movement and sync the MIDI playback position.
+
+        Called by the scroll coalescer with yview arguments.
+        """
         # Update canvas view first
         self.canvas.yview(*args)
         
@@ -2350,51 +3819,21 @@ class MidiGapperGUI(tk.Tk):
             time_position = (1.0 - scroll_bottom) * self.max_time
               # Update MIDI playback position
             self.playback_position = max(0.0, min(time_position, self.max_time))
-            print(f"DEBUG: Scroll position updated to {self.playback_position:.2f}s (from scroll_bottom: {scroll_bottom:.3f})")
+            log_render.debug("Scroll position updated to %.2fs (from scroll_bottom: %.3f)", self.playback_position, scroll_bottom)
+            if self.is_playing and self.playback_position < self.max_time:
+                # Keep playing from the dragged-to position
+                self.seek_scheduled_playback()
               # Update LED clock immediately (lightweight)
             self.update_led_clock()
             
-            # Smart highlighting updates: immediate for small files, throttled for large files
-            if hasattr(self, 'rect_data') and len(self.rect_data) > 3000:
-                # Large file: Use throttling but allow periodic updates during continuous scrolling
-                if hasattr(self, 'scroll_update_timer') and self.scroll_update_timer:
-                    # Check if enough time has passed for a periodic update during scroll
-                    current_time = time.time()
-                    if not hasattr(self, 'last_highlight_time'):
-                        self.last_highlight_time = 0
-                    
-                    # Allow highlighting every 200ms during continuous scrolling
-                    if current_time - self.last_highlight_time > 0.2:
-                        self.update_keyboard_highlighting()
-                        self.last_highlight_time = current_time
-                        # Cancel the pending timer since we just updated
-                        self.after_cancel(self.scroll_update_timer)
-                        self.scroll_update_timer = None
-                    else:
-                        # Still within the 200ms window, keep the existing timer
-                        pass
-                else:
-                    # No pending timer, schedule immediate update for large files
-                    self.update_keyboard_highlighting()
-                    self.last_highlight_time = time.time()
-                
-                # Always schedule a final update when scrolling stops
-                if hasattr(self, 'scroll_update_timer') and self.scroll_update_timer:
-                    self.after_cancel(self.scroll_update_timer)
-                self.scroll_update_timer = self.after(self.scroll_throttle_delay, self.delayed_highlight_update)
-            else:
-                # Small file: Update immediately for responsive feel
-                self.update_keyboard_highlighting()
+            # Input is coalesced per frame, so highlight on every applied frame
+            self.update_keyboard_highlighting()
             
             # If we're at the end, stop playback
             if self.playback_position >= self.max_time and self.is_playing:
                 self.stop_midi()
     
-    def delayed_highlight_update(self):
-        """Update keyboard highlighting after scroll throttle delay"""
-        self.update_keyboard_highlighting()
-        self.scroll_update_timer = None
-
+    @timed('sync_scrollbar_to_midi_position')
     def sync_scrollbar_to_midi_position(self):
         """Update scrollbar position to match current MIDI playback position"""
         if hasattr(self, 'max_time') and self.max_time > 0:
@@ -2425,54 +3864,33 @@ class MidiGapperGUI(tk.Tk):
             return
             
         # Calculate new position
-        new_position = max(0.0, min(self.playback_position + delta_seconds, self.max_time))
+        new_position = max(0.0, min(self.get_actual_audio_position() + delta_seconds, self.max_time))
         
         # Update playback position
         self.playback_position = new_position
-          # If currently playing, restart playback from new position
-        # This ensures consistent timing regardless of seek distance
+        # If currently playing, the running scheduler carries on from the new
+        # position; held notes are chased once key repeat pauses
         if self.is_playing:
-            # Stop current playback and restart from new position
-            self.stop_midi()
-            self.start_midi_playback()
+            self.seek_scheduled_playback()
             
         # Update scrollbar to match new position
         self.sync_scrollbar_to_midi_position()
         
         # Update LED clock
         self.update_led_clock()
-          # Update keyboard highlighting        self.update_keyboard_highlighting()    def destroy(self):
-        """Clean up resources when closing the application"""
-        try:
-            # Stop any playing MIDI
-            if self.is_playing:
-                self.stop_midi()
-            
-            # Save window geometry
-            geometry = self.geometry()
-            config = self.config_data
-            config['geometry'] = geometry
-            config['y_scale'] = self.y_scale_var.get()
-            save_config(config)
-            
-        except Exception as e:
-            print(f"Warning: Error during cleanup: {e}")
-            
-        # Call parent destroy
-        super().destroy()
+        
+        # Update keyboard highlighting
+        self.update_keyboard_highlighting()
         
     def refresh_midi_devices(self):
         """Refresh FluidSynth availability and setup"""
         try:
-            # Try to import fluidsynth to check if it's available
-            try:
-                import fluidsynth
-                fluidsynth_available = True
-            except ImportError:
-                fluidsynth_available = False
+            # Check fluidsynth is installed without importing it (and its
+            # native library) on the UI thread
+            fluidsynth_available = importlib.util.find_spec('fluidsynth') is not None
             
             if not fluidsynth_available:
-                print("⚠ pyfluidsynth not installed. MIDI output will not be available.")
+                log_playback.warning("⚠ pyfluidsynth not installed. MIDI output will not be available.")
                 print("ℹ To install: pip install pyfluidsynth")
                 print("ℹ FluidSynth provides software MIDI synthesis - no external devices needed!")
                 self.midi_output_dropdown['values'] = ['FluidSynth not installed - see console for help']
@@ -2482,13 +3900,12 @@ class MidiGapperGUI(tk.Tk):
               # FluidSynth is available - it's always a single "device"
             output_names = ['FluidSynth Software Synthesizer']
             
-            print("✓ FluidSynth available - software MIDI synthesis ready")
-            print("ℹ FluidSynth provides built-in piano sounds with no external setup required")
+            log_playback.info("✓ FluidSynth available - software MIDI synthesis ready")
             
             # Update dropdown values
             self.midi_output_dropdown['values'] = output_names
             self.midi_output_var.set(output_names[0])
-            print(f"✓ MIDI output: {output_names[0]}")
+            log_playback.info("✓ MIDI output: %s", output_names[0])
                     
             # Automatically connect to FluidSynth
             self.on_midi_output_changed()
@@ -2497,7 +3914,7 @@ class MidiGapperGUI(tk.Tk):
             self.update_midi_status_indicator()
             
         except Exception as e:
-            print(f"Error checking FluidSynth availability: {e}")
+            log_playback.error("Error checking FluidSynth availability: %s", e)
             self.midi_output_dropdown['values'] = ['Error checking FluidSynth - see console']
             self.midi_output_var.set('Error checking FluidSynth - see console')
             self.update_midi_status_indicator()
@@ -2509,32 +3926,57 @@ class MidiGapperGUI(tk.Tk):
         if 'not installed' in selected_device or 'Error' in selected_device:
             return
             
-        print(f"Initializing FluidSynth: {selected_device}")
+        log_playback.info("Initializing FluidSynth: %s", selected_device)
         
         # Save selected device to config
         self.config_data['last_midi_output'] = selected_device
         save_config(self.config_data)
         
-        # Initialize FluidSynth player
-        try:
-            if hasattr(self, 'note_player') and self.note_player:
-                self.note_player.close()
-            
-            # Create new FluidSynth player (no device parameter needed)
-            self.note_player = FluidSynthPlayer()
-            
-            if self.note_player.midi_out:  # This means FluidSynth initialized successfully
-                self.midi_playback_available = True
-                print(f"✓ FluidSynth ready for MIDI playback")
-            else:
-                self.midi_playback_available = False
-                print(f"⚠ Failed to initialize FluidSynth")
-                
-        except Exception as e:
-            print(f"Error initializing FluidSynth: {e}")
+        # Build the synth in the background; 'synth_backend' in config.json
+        # selects 'null' for silent/headless runs
+        backend_name = self.config_data.get('synth_backend', 'fluidsynth')
+        options = self.synth_backend_options(backend_name)
+        self.synth_loader.load(lambda: create_synth_backend(backend_name, **options), self.on_synth_ready)
+        
+        # Update status indicator (shows loading)
+        self.update_midi_status_indicator()
+    
+    def synth_backend_options(self, backend_name):
+        """Constructor arguments for a synth backend, from config.json"""
+        if backend_name != 'fluidsynth':
+            return {}
+        driver, settings, driver_settings = fluidsynth_config(self.config_data)
+        return {'soundfont_path': self.config_data.get('soundfont'), 'settings': settings,
+                'driver': driver, 'driver_settings': driver_settings}
+    
+    def preload_soundfonts(self):
+        """Load the soundfonts listed in config.json into the shared synth in the background"""
+        paths = list(self.config_data.get('preload_soundfonts', []))
+        if self.config_data.get('synth_backend', 'fluidsynth') != 'fluidsynth' or not paths:
+            return
+        if importlib.util.find_spec('fluidsynth') is None:
+            return
+        SYNTH_REGISTRY.preload(paths, fluidsynth_config(self.config_data)[1])
+    
+    def on_synth_ready(self, backend):
+        """Swap in a synth backend built by the background loader"""
+        old_player = self.note_player
+        self.note_player = backend if backend is not None else SynthBackend()
+        if old_player is not None and old_player is not self.note_player:
+            old_player.close()
+        
+        if self.note_player.midi_out:  # This means FluidSynth initialized successfully
+            self.midi_playback_available = True
+            log_playback.info("✓ FluidSynth ready for MIDI playback")
+        else:
             self.midi_playback_available = False
-            
-        # Update status indicator
+            log_playback.warning("⚠ Failed to initialize FluidSynth")
+        
+        # Playback already running continues on the new synth from where it is
+        if self.is_playing:
+            self.playback_position = self.get_actual_audio_position()
+            self.start_scheduled_playback()
+        
         self.update_midi_status_indicator()
     
     def update_midi_status_indicator(self):
@@ -2545,17 +3987,32 @@ class MidiGapperGUI(tk.Tk):
         is_connected = (hasattr(self, 'note_player') and 
                        self.note_player and 
                        self.note_player.midi_out is not None)
+        is_loading = self.synth_loader.loading
         
         # Draw status circle
-        color = '#00aa00' if is_connected else '#aa0000'  # Green if connected, red if not
+        if is_loading:
+            color = '#ddaa00'  # Amber while the synth starts in the background
+        else:
+            color = '#00aa00' if is_connected else '#aa0000'  # Green if connected, red if not
         self.status_canvas.create_oval(2, 2, 14, 14, fill=color, outline='#333333')
         
         # Create tooltip information
-        if is_connected:
+        if is_loading:
+            tooltip_text = "Starting synthesizer..."
+        elif is_connected:
             device_name = getattr(self.note_player.midi_out, 'name', 'Unknown Device')
             tooltip_text = f"Connected to: {device_name}"
+            driver = getattr(self.note_player, 'driver', None)
+            if driver:
+                tooltip_text += f" via {driver}"
         else:
             tooltip_text = "Not connected - select a MIDI device"
+        
+        # Show the effective output latency next to the indicator
+        latency = self.note_player.latency if is_connected and not is_loading else None
+        if latency:
+            tooltip_text += f" ({latency * 1000:.1f}ms latency)"
+        self.latency_label.config(text=f"{latency * 1000:.0f} ms" if latency else '')
             
         # Simple status display on click
         def show_status():
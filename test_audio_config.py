@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the audio driver and latency settings read from config.json.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import FluidSynthPlayer, default_audio_driver, fluidsynth_config
+
+
+def test_defaults():
+    driver, settings, driver_settings = fluidsynth_config({})
+    assert driver == default_audio_driver()
+    assert settings == {} and driver_settings == {}
+
+
+def test_keys_keep_fluidsynth_types():
+    config = {'audio.driver': 'alsa', 'audio.period-size': '64', 'audio.periods': 2,
+              'synth.sample-rate': 48000, 'y_scale': 1.0}
+    driver, settings, driver_settings = fluidsynth_config(config)
+    assert driver == 'alsa'
+    assert settings == {'synth.sample-rate': 48000.0}
+    assert isinstance(settings['synth.sample-rate'], float)
+    assert driver_settings == {'audio.period-size': 64, 'audio.periods': 2}
+
+
+def test_file_driver_name():
+    config = {'audio.driver': 'file', 'audio.file.name': 'out.wav'}
+    _, _, driver_settings = fluidsynth_config(config)
+    assert driver_settings == {'audio.file.name': 'out.wav'}
+
+
+class FakeSynth:
+    def __init__(self, values):
+        self.values = values
+
+    def get_setting(self, name):
+        return self.values[name]
+
+
+def test_effective_latency():
+    player = FluidSynthPlayer.__new__(FluidSynthPlayer)
+    player.fs = FakeSynth({'audio.period-size': 64, 'audio.periods': 2, 'synth.sample-rate': 48000.0})
+    assert abs(player._effective_latency() - 128 / 48000) < 1e-12
+    player.fs = FakeSynth({})
+    assert player._effective_latency() is None
+
+
+if __name__ == "__main__":
+    print("=== Audio Config Test ===")
+    test_defaults()
+    print("✓ Driver defaults to the platform's")
+    test_keys_keep_fluidsynth_types()
+    test_file_driver_name()
+    print("✓ Config keys map to typed FluidSynth settings")
+    test_effective_latency()
+    print("✓ Effective latency is period size x periods / sample rate")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for keyframed controller-state and held-note snapshots used to chase on seek.
+Compares keyframe lookups against a full linear replay at every position.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import ControllerKeyframes, HeldNoteKeyframes, MidiEventStream, PlaybackScheduler, RecordingBackend
+
+
+def random_stream(count, seed=7):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        channel = rng.randrange(16)
+        kind = rng.choice((0x90, 0x80, 0xB0, 0xC0, 0xE0))
+        events.append((i * 0.01, kind | channel, rng.randrange(128), rng.randrange(128)))
+    return MidiEventStream.from_events(events)
+
+
+def linear_state(stream, cursor):
+    programs, controllers, bends = {}, {}, {}
+    for i in range(cursor):
+        ControllerKeyframes._apply(programs, controllers, bends,
+                                   stream.status[i], stream.data1[i], stream.data2[i])
+    return programs, controllers, bends
+
+
+def test_matches_linear_replay():
+    stream = random_stream(1000)
+    keyframes = ControllerKeyframes(stream, interval=64)
+    for cursor in range(0, len(stream) + 1, 7):
+        programs, controllers, bends = keyframes.state_at(cursor)
+        expected = linear_state(stream, cursor)
+        # Everything set so far matches; the rest is at its default
+        assert {ch: programs[ch] for ch in expected[0]} == expected[0]
+        assert {key: controllers[key] for key in expected[1]} == expected[1]
+        assert {ch: bends[ch] for ch in expected[2]} == expected[2]
+
+
+def test_seeking_back_restores_defaults():
+    stream = MidiEventStream.from_events([
+        (0.0, 0x90, 60, 90), (1.0, 0xC0, 40, 0), (1.0, 0xB0, 7, 20), (1.0, 0xE0, 0, 0)])
+    keyframes = ControllerKeyframes(stream)
+    assert keyframes.state_at(1) == ({0: 0}, {(0, 7): 100}, {0: (0, 64)})
+    assert keyframes.state_at(4) == ({0: 40}, {(0, 7): 20}, {0: (0, 0)})
+
+
+def test_scheduler_chases_from_keyframes():
+    scheduler = PlaybackScheduler()
+    scheduler.load(random_stream(2000))
+    cursor = 1500
+    player = RecordingBackend()
+    scheduler.player = player
+    scheduler._chase_controllers(cursor)
+    programs, controllers, bends = scheduler.keyframes.state_at(cursor)
+    sent = [call for call in player.calls if call[1] in ('cc', 'program', 'pitch_bend')]
+    assert len(sent) == len(programs) + len(controllers) + len(bends)
+    # Bank selects go out before any program change
+    kinds = [(kind, number) for _, kind, _, number, _ in sent]
+    last_bank = max((i for i, (kind, number) in enumerate(kinds) if kind == 'cc' and number in (0, 32)), default=-1)
+    first_program = min(i for i, (kind, _) in enumerate(kinds) if kind == 'program')
+    assert last_bank < first_program
+
+
+def test_seek_cost_independent_of_position():
+    stream = random_stream(200000)
+    keyframes = ControllerKeyframes(stream)
+    costs = []
+    for cursor in (1000, 100000, 199000):
+        t0 = time.perf_counter()
+        for _ in range(50):
+            keyframes.state_at(cursor)
+        costs.append((time.perf_counter() - t0) / 50)
+    print(f"state_at cost near start/middle/end: {', '.join(f'{c * 1e6:.0f}us' for c in costs)}")
+    assert max(costs) < 0.01
+
+
+
+def test_held_notes_match_linear_replay():
+    stream = random_stream(1000)
+    keyframes = HeldNoteKeyframes(stream, interval=64)
+    for cursor in range(0, len(stream) + 1, 7):
+        held = {}
+        for i in range(cursor):
+            HeldNoteKeyframes._apply(held, stream.status[i], stream.data1[i], stream.data2[i])
+        assert list(keyframes.held_at(cursor).items()) == list(held.items())
+    held = {}
+    for i in range(len(stream)):
+        HeldNoteKeyframes._apply(held, stream.status[i], stream.data1[i], stream.data2[i])
+    assert stream.held_notes(100.0) == [(ch, note, vel) for (ch, note), vel in held.items()]
+    # held_notes rebuilds its keyframes when events are appended
+    stream.append(100.0, 0x90, 60, 99)
+    assert (0, 60, 99) in stream.held_notes(101.0)
+
+
+if __name__ == "__main__":
+    print("=== Controller Keyframe Test ===")
+    test_matches_linear_replay()
+    print("✓ Keyframe lookups match a full replay")
+    test_seeking_back_restores_defaults()
+    print("✓ Seeking before a change restores controller defaults")
+    test_scheduler_chases_from_keyframes()
+    print("✓ Scheduler chases state from keyframes, bank before program")
+    test_seek_cost_independent_of_position()
+    print("✓ Seek cost does not grow with position")
+    test_held_notes_match_linear_replay()
+    print("✓ Held-note keyframes match a full replay")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for categorised, levelled logging.
+Checks per-category levels, the debug timing switch and the ring buffer dump.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import diagnostics
+from diagnostics import get_logger, set_level, set_debug_timing
+
+
+def reset(capacity=diagnostics.DEFAULT_CAPACITY):
+    diagnostics.configure_logging({'log_level': 'WARNING', 'log_buffer_size': capacity})
+    diagnostics.ring_buffer.records.clear()
+
+
+def messages():
+    return [record.getMessage() for record in diagnostics.ring_buffer.records]
+
+
+def test_levels_filter_before_formatting():
+    reset()
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted a disabled record")
+
+    get_logger('gap').debug("note %s", Exploding())
+    get_logger('gap').warning("gap %d ms", 30)
+    assert messages() == ["gap 30 ms"]
+
+
+def test_per_category_level():
+    reset()
+    set_level('DEBUG', 'io')
+    get_logger('io').debug("io detail")
+    get_logger('load').debug("load detail")
+    assert messages() == ["io detail"]
+
+
+def test_debug_timing_switch():
+    reset()
+    get_logger('playback').debug("tick")
+    set_debug_timing(True)
+    assert diagnostics.debug_timing_enabled()
+    get_logger('playback').debug("tick %d", 1)
+    get_logger('render').debug("frame %d", 1)
+    get_logger('gap').debug("not a timing category")
+    set_debug_timing(False)
+    get_logger('playback').debug("tick %d", 2)
+    assert messages() == ["tick 1", "frame 1"]
+
+
+def test_ring_buffer_is_bounded_and_dumps():
+    reset(capacity=3)
+    for i in range(10):
+        get_logger('load').error("line %d", i)
+    assert messages() == ["line 7", "line 8", "line 9"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'log.txt')
+        text = diagnostics.dump_log(path)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == text + '\n'
+    assert text.splitlines()[-1].endswith("midigapper.load: line 9")
+    reset()
+
+
+def test_unknown_category():
+    try:
+        get_logger('audio')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    print("=== Diagnostics Logging Test ===")
+    test_levels_filter_before_formatting()
+    print("✓ Disabled levels are dropped before formatting")
+    test_per_category_level()
+    print("✓ Levels are set per category")
+    test_debug_timing_switch()
+    print("✓ Debug timing switches render and playback detail at runtime")
+    test_ring_buffer_is_bounded_and_dumps()
+    print("✓ Ring buffer keeps the most recent lines and dumps them")
+    test_unknown_category()
+    print("✓ Unknown categories are rejected")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive playback frame scheduler.
+Drives FrameScheduler with a fake Tk widget and checks load detection and deadlines.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import FrameScheduler
+
+
+class FakeWidget:
+    """Stores after() callbacks so the test can fire them by hand"""
+    def __init__(self):
+        self.pending = {}
+        self.delays = []
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = func
+        self.delays.append(ms)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def fire(self):
+        after_id, func = self.pending.popitem()
+        func()
+
+
+def test_fast_frames_are_not_under_load():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget, frame_rate=60)
+    flags = []
+    scheduler.start(lambda under_load: flags.append(under_load) or True)
+    for _ in range(5):
+        time.sleep(scheduler.frame_interval)
+        widget.fire()
+    assert flags == [False] * 6
+    assert scheduler.frames == 6
+
+
+def test_slow_frame_flags_next_frame_and_shortens_delay():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget, frame_rate=50)  # 20 ms budget
+    flags = []
+
+    def frame(under_load):
+        flags.append(under_load)
+        if len(flags) == 1:
+            time.sleep(0.018)  # Over 80% of the budget
+        return True
+
+    scheduler.start(frame)
+    # The next deadline is 20 ms after the first one, so only ~2 ms remain
+    assert widget.delays[-1] <= 5
+    widget.fire()
+    assert flags == [False, True]
+
+
+def test_optional_work_forced_under_sustained_load():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget, frame_rate=100, max_skipped_frames=2)
+    flags = []
+
+    def frame(under_load):
+        flags.append(under_load)
+        time.sleep(0.012)  # Every frame overruns its 10 ms budget
+        return True
+
+    scheduler.start(frame)
+    for _ in range(5):
+        widget.fire()
+    assert flags == [False, True, True, False, True, True]
+    assert scheduler.missed_deadlines > 0
+
+
+def test_stop_from_inside_frame():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget, frame_rate=60)
+
+    def frame(under_load):
+        scheduler.stop()
+        return True
+
+    scheduler.start(frame)
+    assert not scheduler.running
+    assert not widget.pending
+
+
+def test_callback_returning_false_ends_loop():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget, frame_rate=60)
+    scheduler.start(lambda under_load: False)
+    assert not scheduler.running
+    assert not widget.pending
+
+
+if __name__ == "__main__":
+    print("=== Frame Scheduler Test ===")
+    test_fast_frames_are_not_under_load()
+    print("✓ Frames within budget run all work")
+    test_slow_frame_flags_next_frame_and_shortens_delay()
+    print("✓ Slow frames flag load and shorten the next delay")
+    test_optional_work_forced_under_sustained_load()
+    print("✓ Optional work still refreshes under sustained load")
+    test_stop_from_inside_frame()
+    test_callback_returning_false_ends_loop()
+    print("✓ Loop stops cleanly")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for input recording and interaction replay.
+Replays into a stand-in app whose Tk loop runs after() callbacks by hand;
+inputs go through the GUI's real dispatch_input.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from diagnostics import InputRecorder, load_input_recording
+from interaction_replay import INTERACTION_KINDS, latency_report, replay, synthetic_session
+from main import MidiGapperGUI, ScrollCoalescer
+
+
+class ReplayApp:
+    """Tk-free app: after() callbacks run from update() once due"""
+    dispatch_input = MidiGapperGUI.dispatch_input
+
+    def __init__(self, frame_ms=16):
+        self.input_recorder = InputRecorder()
+        self.timers = []
+        self.applied = []
+        self.seeks = []
+        self.is_playing = False
+        self.scroll_coalescer = ScrollCoalescer(self, lambda *args: self.applied.append(args), frame_ms)
+
+    def after(self, ms, func):
+        timer = [time.perf_counter() + ms / 1000, func]
+        self.timers.append(timer)
+        return id(timer)
+
+    def after_cancel(self, after_id):
+        self.timers = [timer for timer in self.timers if id(timer) != after_id]
+
+    def update(self):
+        now = time.perf_counter()
+        due = [timer for timer in self.timers if timer[0] <= now]
+        self.timers = [timer for timer in self.timers if timer[0] > now]
+        for _, func in due:
+            func()
+
+    def update_idletasks(self):
+        pass
+
+    def toggle_play_pause(self):
+        self.is_playing = not self.is_playing
+
+    def seek_relative(self, delta_seconds):
+        self.seeks.append(delta_seconds)
+
+
+def test_recorder_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.jsonl')
+        recorder = InputRecorder()
+        recorder.record('wheel', 75)  # Not recording yet
+        recorder.start(path)
+        recorder.record('wheel', -75)
+        recorder.record('scrollbar', 'moveto', '0.5')
+        recorder.record('play_pause')
+        recorder.stop()
+        events = load_input_recording(path)
+    assert [(kind, args) for _, kind, args in events] == [
+        ('wheel', (-75,)), ('scrollbar', ('moveto', '0.5')), ('play_pause', ())]
+    assert events[0][0] <= events[1][0] <= events[2][0]
+    assert recorder.count == 3 and not recorder.recording
+
+
+def test_synthetic_session_is_seeded_and_varied():
+    events = synthetic_session(duration=30.0, seed=4)
+    assert events == synthetic_session(duration=30.0, seed=4)
+    assert {kind for _, kind, _ in events} == set(INTERACTION_KINDS)
+    times = [t for t, _, _ in events]
+    assert times == sorted(times)
+
+
+def test_replay_measures_coalesced_paint_latency():
+    app = ReplayApp(frame_ms=16)
+    burst = [(i * 0.002, 'wheel', (75,)) for i in range(5)]
+    events = burst + [(0.1, 'seek', (1.0,)), (0.15, 'play_pause', ())]
+    latencies = replay(app, events)
+    # The burst collapses into one frame; every input in it waits for that frame
+    assert app.applied == [('scroll', 375, 'units')]
+    assert len(latencies['wheel']) == 5
+    assert max(latencies['wheel']) >= 0.015
+    assert min(latencies['wheel']) < max(latencies['wheel'])
+    assert app.seeks == [1.0]
+    assert latencies['seek'][0] < 0.016
+    assert not app.is_playing  # Replay leaves playback stopped
+    report = latency_report(latencies)
+    assert report['wheel']['count'] == 5
+    assert report['wheel']['p50_ms'] <= report['wheel']['p95_ms'] <= report['wheel']['max_ms']
+
+
+def test_dispatch_routes_and_records_inputs():
+    app = ReplayApp()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.jsonl')
+        app.input_recorder.start(path)
+        app.dispatch_input('arrow', -75)
+        app.dispatch_input('scrollbar', 'moveto', '0.25')
+        app.dispatch_input('seek', -5.0)
+        app.input_recorder.stop()
+        kinds = [kind for _, kind, _ in load_input_recording(path)]
+    assert kinds == ['arrow', 'scrollbar', 'seek']
+    # The scrollbar jump replaces the queued arrow press
+    app.scroll_coalescer.flush()
+    assert app.applied == [('moveto', 0.25)]
+    assert app.seeks == [-5.0]
+    try:
+        app.dispatch_input('pinch', 2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown input kinds must be rejected")
+
+
+if __name__ == "__main__":
+    print("=== Interaction Replay Test ===")
+    test_recorder_round_trip()
+    print("✓ Inputs are recorded as timestamped JSON lines")
+    test_synthetic_session_is_seeded_and_varied()
+    print("✓ Synthetic sessions are seeded and cover every interaction type")
+    test_replay_measures_coalesced_paint_latency()
+    print("✓ Replay reports input-to-paint latency per interaction type")
+    test_dispatch_routes_and_records_inputs()
+    print("✓ Inputs are routed and recorded by the GUI's dispatch_input")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for diff-based keyboard highlighting.
+Counts the itemconfig calls issued per frame with a fake keyboard canvas.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import KeyboardHighlighter
+
+
+class FakeCanvas:
+    """Records itemconfig calls instead of talking to Tk"""
+    def __init__(self):
+        self.fills = {}
+        self.calls = 0
+
+    def itemconfig(self, item, fill=None):
+        self.calls += 1
+        self.fills[item] = fill
+
+
+def make_highlighter():
+    canvas = FakeCanvas()
+    highlighter = KeyboardHighlighter(canvas)
+    highlighter.reset({note: 1000 + note for note in range(21, 109)})
+    return canvas, highlighter
+
+
+def test_unchanged_frame_costs_nothing():
+    canvas, highlighter = make_highlighter()
+    assert highlighter.update({60, 64, 67}) == 3
+    assert highlighter.update({60, 64, 67}) == 0
+    assert highlighter.tk_calls_last_frame == 0
+    assert canvas.calls == 3
+
+
+def test_only_changed_keys_are_touched():
+    canvas, highlighter = make_highlighter()
+    highlighter.update({60, 64})
+    # 60 released, 61 pressed, 64 held
+    assert highlighter.update({61, 64}) == 2
+    assert canvas.fills[1060] == 'white'
+    assert canvas.fills[1061] == '#4080FF'
+    assert canvas.fills[1064] == '#B0D0FF'
+
+
+def test_reset_forgets_previous_frame():
+    canvas, highlighter = make_highlighter()
+    highlighter.update({60})
+    # A redrawn keyboard starts with default colours, so 60 must be re-highlighted
+    highlighter.reset({note: 2000 + note for note in range(21, 109)})
+    assert highlighter.update({60}) == 1
+    assert canvas.fills[2060] == '#B0D0FF'
+
+
+def test_notes_outside_keyboard_are_ignored():
+    _, highlighter = make_highlighter()
+    assert highlighter.update({5, 120}) == 0
+
+
+if __name__ == "__main__":
+    print("=== Diff-based Keyboard Highlighting Test ===")
+    test_unchanged_frame_costs_nothing()
+    print("✓ Unchanged frames issue no Tk calls")
+    test_only_changed_keys_are_touched()
+    print("✓ Only keys that changed state are reconfigured")
+    test_reset_forgets_previous_frame()
+    print("✓ Redrawn keyboards are re-highlighted")
+    test_notes_outside_keyboard_are_ignored()
+    print("✓ Notes outside the 88 keys are ignored")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the retained-mode LED clock.
+Checks that segments are created once and only changed segments are recoloured.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import LedClockDisplay
+
+
+class FakeCanvas:
+    """Counts item creation and reconfiguration instead of talking to Tk"""
+    def __init__(self):
+        self.items = {}
+        self.created = 0
+        self.configured = 0
+        self.deletes = 0
+
+    def _create(self, fill):
+        self.created += 1
+        self.items[self.created] = fill
+        return self.created
+
+    def create_polygon(self, coords, fill=None, outline=None):
+        return self._create(fill)
+
+    def create_oval(self, *coords, fill=None, outline=None):
+        return self._create(fill)
+
+    def itemconfig(self, item, fill=None, outline=None):
+        self.configured += 1
+        self.items[item] = fill
+
+    def delete(self, tag):
+        self.deletes += 1
+        self.items.clear()
+
+
+def lit_segments(display, canvas, index):
+    return tuple(int(canvas.items[item] == LedClockDisplay.ON_COLOR) for item in display.digit_items[index])
+
+
+def test_format_position():
+    assert LedClockDisplay.format_position(0.0) == "00:00.000"
+    assert LedClockDisplay.format_position(83.25) == "01:23.250"
+
+
+def test_segments_created_once():
+    canvas = FakeCanvas()
+    display = LedClockDisplay(canvas)
+    display.show(0.0)
+    created = canvas.created
+    # 7 digits x 7 segments + 2 colon dots + 1 decimal point
+    assert created == 7 * 7 + 3
+    for i in range(200):
+        display.show(i * 0.05)
+    assert canvas.created == created
+    assert canvas.deletes == 1
+
+
+def test_only_changed_segments_recoloured():
+    canvas = FakeCanvas()
+    display = LedClockDisplay(canvas)
+    display.show(0.0)
+    # 00:00.000 -> 00:00.001 only changes the last digit: 0 -> 1 toggles 4 segments
+    assert display.show(0.0011) == 4
+    assert display.show(0.0011) == 0
+    assert lit_segments(display, canvas, 8) == LedClockDisplay.SEGMENTS['1']
+
+
+def test_layout_change_rebuilds():
+    canvas = FakeCanvas()
+    display = LedClockDisplay(canvas)
+    display.show(0.0)
+    display.show(100 * 60.0)  # 100:00.000 needs an extra digit
+    assert len(display.digit_items) == 8
+    assert lit_segments(display, canvas, 0) == LedClockDisplay.SEGMENTS['1']
+
+
+if __name__ == "__main__":
+    print("=== Retained-mode LED Clock Test ===")
+    test_format_position()
+    print("✓ Positions format as MM:SS.mmm")
+    test_segments_created_once()
+    print("✓ Segment items are created once")
+    test_only_changed_segments_recoloured()
+    print("✓ Only changed segments are recoloured")
+    test_layout_change_rebuilds()
+    print("✓ Clock re-lays out when minutes gain a digit")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory accounting used by the memory report (Ctrl+Shift+M).
+"""
+
+import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from diagnostics import deep_sizeof, format_memory_report, measure_memory
+
+
+class Slotted:
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = values
+
+
+def test_deep_sizeof_follows_containers_and_attributes():
+    notes = [(i * 0.5, 60 + i % 12, 0, 0.25) for i in range(100)]
+    flat = sys.getsizeof(notes)
+    assert deep_sizeof(notes) > flat + 100 * sys.getsizeof(notes[0])
+    assert deep_sizeof({'notes': notes}) > deep_sizeof(notes)
+    assert deep_sizeof(Slotted(notes)) > deep_sizeof(notes)
+    stream = array('d', range(1000))
+    assert deep_sizeof(stream) >= 8000
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = list(range(1000))
+    seen = set()
+    first = deep_sizeof({'a': shared}, seen)
+    second = deep_sizeof({'b': shared}, seen)
+    assert first > deep_sizeof(shared) - 1
+    assert second < first / 10  # Only the second dict and its key are new
+
+
+def test_measure_memory_retained_and_peak():
+    kept = []
+
+    def work():
+        kept.append(bytearray(2_000_000))
+        transient = bytearray(5_000_000)
+        return len(transient)
+
+    result, usage = measure_memory(work, top=3)
+    assert result == 5_000_000
+    assert 1_900_000 < usage['retained_bytes'] < 2_500_000
+    assert usage['peak_bytes'] >= 6_900_000
+    assert usage['top'] and usage['top'][0][1] >= 1_900_000
+
+
+def test_format_memory_report():
+    report = {'notes': 10,
+              'phases': {'load': {'retained_bytes': 0, 'peak_bytes': 4096, 'top': []}},
+              'structures': {'notes': 2048, 'rect_data': 1024},
+              'structure_bytes': 3072, 'bytes_per_note': 307.2}
+    table = format_memory_report(report)
+    assert 'load' in table and '4.0' in table
+    assert 'total' in table and '307.2' in table
+
+
+if __name__ == "__main__":
+    print("=== Memory Report Test ===")
+    test_deep_sizeof_follows_containers_and_attributes()
+    print("✓ deep_sizeof follows containers, __dict__ and __slots__")
+    test_deep_sizeof_counts_shared_objects_once()
+    print("✓ Shared objects are charged to the first structure only")
+    test_measure_memory_retained_and_peak()
+    print("✓ Retained bytes, transient peak and top allocation sites are reported")
+    test_format_memory_report()
+    print("✓ Report table lists phases, structures and bytes per note")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic MIDI corpus generator.
+Checks reproducibility, that files parse with mido, and the shape parameters.
+"""
+
+import os
+import sys
+import tempfile
+
+import mido
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import generate_midi_corpus
+from generate_midi_corpus import corpus_name, corpus_path, generate_corpus, varlen
+
+
+def generate(tmp, name, **options):
+    return mido.MidiFile(generate_corpus(os.path.join(tmp, name), **options)['path'])
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_varlen():
+    assert varlen(0) == b'\x00'
+    assert varlen(0x7F) == b'\x7F'
+    assert varlen(0x80) == b'\x81\x00'
+    assert varlen(0x0FFFFFFF) == b'\xFF\xFF\xFF\x7F'
+
+
+def test_same_seed_same_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = generate_corpus(os.path.join(tmp, 'a.mid'), notes=2000, seed=7)['path']
+        b = generate_corpus(os.path.join(tmp, 'b.mid'), notes=2000, seed=7)['path']
+        c = generate_corpus(os.path.join(tmp, 'c.mid'), notes=2000, seed=8)['path']
+        assert read_bytes(a) == read_bytes(b)
+        assert read_bytes(a) != read_bytes(c)
+
+
+def test_parses_with_requested_shape():
+    with tempfile.TemporaryDirectory() as tmp:
+        mf = generate(tmp, 'shape.mid', notes=3001, tracks=3, channels=5, tempo_changes=4, sysex=30)
+    assert mf.type == 1 and len(mf.tracks) == 4
+    tempos = [msg for msg in mf.tracks[0] if msg.type == 'set_tempo']
+    assert len(tempos) == 5
+    note_ons = [msg for track in mf.tracks[1:] for msg in track if msg.type == 'note_on' and msg.velocity]
+    assert len(note_ons) == 3001
+    assert {msg.channel for msg in note_ons} == set(range(5))
+    assert 10 <= sum(msg.type == 'sysex' for track in mf.tracks for msg in track) <= 60
+
+
+def test_polyphony_and_repeated_notes():
+    with tempfile.TemporaryDirectory() as tmp:
+        mf = generate(tmp, 'poly.mid', notes=2000, tracks=1, polyphony=3, repeat_density=0.5)
+    sounding, max_sounding, ends, tiny_gaps = set(), 0, {}, 0
+    tick = 0
+    for msg in mf.tracks[1]:
+        tick += msg.time
+        if msg.type == 'note_on' and msg.velocity:
+            key = (msg.channel, msg.note)
+            assert key not in sounding  # Never retriggered while still on
+            if key in ends and tick - ends[key] <= 480 // 32:
+                tiny_gaps += 1
+            sounding.add(key)
+            max_sounding = max(max_sounding, len(sounding))
+        elif msg.type in ('note_on', 'note_off'):
+            sounding.discard((msg.channel, msg.note))
+            ends[(msg.channel, msg.note)] = tick
+    assert max_sounding == 3 and not sounding
+    assert tiny_gaps > 500
+
+
+def test_running_status_shrinks_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        with_rs = generate_corpus(os.path.join(tmp, 'rs.mid'), notes=2000, channels=1, tracks=1)
+        without = generate_corpus(os.path.join(tmp, 'plain.mid'), notes=2000, channels=1, tracks=1,
+                                  running_status=False)
+        mf = mido.MidiFile(without['path'])
+    assert with_rs['bytes'] < without['bytes'] * 0.8
+    assert sum(msg.type == 'note_off' for msg in mf.tracks[1]) == 2000
+
+
+def test_corpus_path_generates_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = corpus_path(1000, directory=tmp, seed=1, tracks=2)
+        mtime = os.path.getmtime(path)
+        assert corpus_path(1000, directory=tmp, seed=1, tracks=2) == path
+        assert os.path.getmtime(path) == mtime
+        assert os.listdir(tmp) == [os.path.basename(path)]
+
+
+def test_cli_corpus_names_match_corpus_path():
+    assert corpus_name(1000, tracks=4, channels=4) == corpus_name(1000)  # Defaults stay out of the name
+    with tempfile.TemporaryDirectory() as tmp:
+        assert generate_midi_corpus.main(['--corpus', tmp, '--sizes', '200', '--tracks', '2', '--seed', '3']) == 0
+        assert os.listdir(tmp) == [corpus_name(200, seed=3, tracks=2)]
+        # The CLI file is reused for the same options, never for the defaults
+        assert corpus_path(200, directory=tmp, seed=3, tracks=2) == os.path.join(tmp, os.listdir(tmp)[0])
+        assert corpus_path(200, directory=tmp, seed=3) != corpus_path(200, directory=tmp, seed=3, tracks=2)
+
+
+if __name__ == "__main__":
+    print("=== Synthetic MIDI Corpus Test ===")
+    test_varlen()
+    test_same_seed_same_file()
+    print("✓ Output is reproducible from the seed")
+    test_parses_with_requested_shape()
+    print("✓ Files parse with the requested tracks, channels, tempos and sysex")
+    test_polyphony_and_repeated_notes()
+    print("✓ Polyphony is capped and repeated notes leave tiny gaps")
+    test_running_status_shrinks_file()
+    print("✓ Running status is used unless disabled")
+    test_corpus_path_generates_once()
+    print("✓ Corpus files are generated once and reused")
+    test_cli_corpus_names_match_corpus_path()
+    print("✓ CLI corpus files are named by their options, as corpus_path expects")
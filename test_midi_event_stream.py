@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled full-fidelity playback event stream.
+Checks that controllers, programs and pitch bend are compiled and streamed,
+and that starting mid-song chases the controller state.
+"""
+
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import mido
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, MidiGapperGUI, PlaybackScheduler, RecordingBackend
+from test_playback_scheduler import wait_until_done
+
+
+class NoteTableStub:
+    """Just enough of MidiGapperGUI to rebuild the note table without Tk"""
+    set_notes = MidiGapperGUI.set_notes
+    rebuild_note_index = MidiGapperGUI.rebuild_note_index
+    rebuild_notes_from_xml = MidiGapperGUI.rebuild_notes_from_xml
+
+    def __init__(self):
+        self.playback_scheduler = PlaybackScheduler()
+
+    def draw_visualization(self, notes, max_time):
+        pass
+
+
+def make_midi_file():
+    mf = mido.MidiFile(ticks_per_beat=480)
+    track = mido.MidiTrack()
+    track.append(mido.MetaMessage('set_tempo', tempo=500000, time=0))
+    track.append(mido.Message('program_change', channel=2, program=40, time=0))
+    track.append(mido.Message('control_change', channel=2, control=64, value=127, time=0))
+    track.append(mido.Message('note_on', channel=2, note=60, velocity=100, time=0))
+    track.append(mido.Message('pitchwheel', channel=2, pitch=-8192, time=48))
+    track.append(mido.Message('note_off', channel=2, note=60, velocity=0, time=48))
+    track.append(mido.Message('control_change', channel=2, control=64, value=0, time=0))
+    mf.tracks.append(track)
+    return mf
+
+
+def test_compile_midi_file():
+    stream = MidiEventStream.from_midi_file(make_midi_file())
+    assert list(stream.status) == [0xC2, 0xB2, 0x92, 0xE2, 0x82, 0xB2]
+    assert list(stream.data1) == [40, 64, 60, 0, 60, 64]
+    assert list(stream.data2) == [0, 127, 100, 0, 0, 0]
+    assert abs(stream.times[3] - 0.05) < 1e-9
+
+
+def test_encode_matches_mido_bytes():
+    for msg in (mido.Message('pitchwheel', channel=3, pitch=1234),
+                mido.Message('control_change', channel=9, control=7, value=99),
+                mido.Message('program_change', channel=1, program=5),
+                mido.Message('aftertouch', channel=4, value=77)):
+        attrs = msg.dict()
+        encoded = MidiEventStream.encode(msg.type, attrs.get)
+        data = msg.bytes()
+        assert encoded == (data[0], data[1], data[2] if len(data) > 2 else 0)
+    assert MidiEventStream.encode('set_tempo', {}.get) is None
+
+
+def test_xml_rebuild_keeps_controllers():
+    xml = """<MidiFile ticks_per_beat="480">
+      <Track name="Strings">
+        <Message type="program_change" time="0" channel="2" program="40"/>
+        <Message type="control_change" time="0" channel="2" control="64" value="127"/>
+        <Message type="note_on" time="0" channel="2" note="60" velocity="100"/>
+        <Message type="note_off" time="480" channel="2" note="60" velocity="0"/>
+      </Track>
+    </MidiFile>"""
+    table = NoteTableStub()
+    table.rebuild_notes_from_xml(ET.fromstring(xml))
+    assert list(table.playback_scheduler.stream.status) == [0xC2, 0xB2, 0x92, 0x82]
+
+
+def test_without_channel():
+    stream = MidiEventStream.from_events([(0.0, 0x90, 60, 90), (0.0, 0xC1, 3, 0), (0.5, 0x80, 60, 0)])
+    assert list(MidiEventStream.from_events(
+        zip(stream.times, stream.status, stream.data1, stream.data2)).status) == [0x90, 0xC1, 0x80]
+    assert list(stream.without_channel(0).status) == [0xC1]
+
+
+def test_streams_controllers_and_releases_sustain():
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_events([
+        (0.0, 0xC2, 40, 0), (0.0, 0xB2, 64, 127), (0.0, 0x92, 60, 100),
+        (0.01, 0xE2, 0, 0), (5.0, 0x82, 60, 0)]))
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    time.sleep(0.05)
+    scheduler.stop()
+    kinds = [(kind, channel, a, b) for _, kind, channel, a, b in player.calls]
+    # Starting resets everything the song touches, then streams it
+    assert kinds[:3] == [('cc', 2, 64, 0), ('program', 2, 0, 0), ('pitch_bend', 2, 0, 0)]
+    assert kinds[3:] == [('program', 2, 40, 0), ('cc', 2, 64, 127), ('note_on', 2, 60, 100),
+                     ('pitch_bend', 2, -8192, 0), ('note_off', 2, 60, 0), ('cc', 2, 64, 0)]
+
+
+def test_start_mid_song_chases_controllers():
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_events([
+        (0.0, 0xC0, 10, 0), (0.1, 0xC0, 20, 0), (0.2, 0xB0, 7, 50),
+        (0.3, 0xE0, 0, 0x40), (1.0, 0x90, 60, 90), (1.01, 0x80, 60, 0)]))
+    player = RecordingBackend()
+    scheduler.start(0.99, player)
+    wait_until_done(scheduler)
+    kinds = [(kind, a, b) for _, kind, _, a, b in player.calls]
+    assert kinds == [('cc', 7, 50), ('program', 20, 0), ('pitch_bend', 0, 0), ('note_on', 60, 90), ('note_off', 60, 0)]
+
+
+def test_repeated_note_released_before_retrigger():
+    notes = [(0.0, 60, 0, 0.01), (0.01, 60, 0, 0.01)]
+    stream = MidiEventStream.from_notes(notes, [64, 64])
+    kinds = list(zip(stream.times, stream.status))
+    assert kinds == [(0.0, 0x90), (0.01, 0x80), (0.01, 0x90), (0.02, 0x80)]
+
+
+if __name__ == "__main__":
+    print("=== Full-fidelity Event Stream Test ===")
+    test_compile_midi_file()
+    test_encode_matches_mido_bytes()
+    print("✓ Channel messages compile to packed status/data arrays")
+    test_xml_rebuild_keeps_controllers()
+    print("✓ Controllers and programs survive rebuilding from XML")
+    test_without_channel()
+    print("✓ Deleting a channel drops its events")
+    test_streams_controllers_and_releases_sustain()
+    print("✓ Controllers, programs and pitch bend are streamed; sustain is released on stop")
+    test_start_mid_song_chases_controllers()
+    print("✓ Starting mid-song chases program, controller and bend state")
+    test_repeated_note_released_before_retrigger()
+    print("✓ Repeated notes are released before being retriggered")
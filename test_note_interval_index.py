@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the time-indexed active-note query (NoteIntervalIndex).
+Compares index queries against a brute-force scan of the note table.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import NoteIntervalIndex
+
+
+def brute_force_active(notes, t):
+    return sorted(i for i, (start, _, _, dur) in enumerate(notes) if start <= t < start + dur)
+
+
+def make_notes(count, seed=1):
+    rng = random.Random(seed)
+    notes = []
+    for _ in range(count):
+        start = rng.uniform(0, 120)
+        # Mostly short notes with a few very long ones to stress pruning
+        dur = rng.uniform(5, 30) if rng.random() < 0.02 else rng.uniform(0.0, 1.0)
+        notes.append((start, rng.randint(21, 108), rng.randint(0, 15), dur))
+    return notes
+
+
+def test_matches_brute_force():
+    notes = make_notes(2000)
+    index = NoteIntervalIndex(notes)
+    for t in [0.0, 0.5, 10.0, 59.99, 60.0, 119.0, 150.0, -1.0]:
+        assert sorted(index.active_at(t)) == brute_force_active(notes, t)
+
+
+def test_half_open_intervals():
+    # Back-to-back repeats of the same pitch must not overlap at the boundary
+    notes = [(0.0, 60, 0, 1.0), (1.0, 60, 0, 1.0)]
+    index = NoteIntervalIndex(notes)
+    assert index.active_at(0.0) == [0]
+    assert index.active_at(1.0) == [1]
+    assert index.active_at(2.0) == []
+
+
+def test_empty_index():
+    index = NoteIntervalIndex()
+    assert len(index) == 0
+    assert index.active_at(1.0) == []
+
+
+if __name__ == "__main__":
+    print("=== NoteIntervalIndex Test ===")
+    test_matches_brute_force()
+    print("✓ Index matches brute-force scan")
+    test_half_open_intervals()
+    print("✓ Note boundaries are half-open")
+    test_empty_index()
+    print("✓ Empty index returns no notes")
+
+    notes = make_notes(100000)
+    index = NoteIntervalIndex(notes)
+    queries = [i * 0.05 for i in range(2400)]
+    t0 = time.perf_counter()
+    for t in queries:
+        index.active_at(t)
+    per_query_us = (time.perf_counter() - t0) / len(queries) * 1e6
+    print(f"✓ 100k notes: {per_query_us:.1f} µs per query")
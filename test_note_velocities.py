@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for per-note velocities keyed by note id.
+Repeated notes of the same pitch must each play with their own velocity,
+including after the note table is rebuilt from edited XML.
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, MidiGapperGUI, PlaybackScheduler
+
+
+class NoteTableStub:
+    """Just enough of MidiGapperGUI to rebuild the note table without Tk"""
+    set_notes = MidiGapperGUI.set_notes
+    rebuild_note_index = MidiGapperGUI.rebuild_note_index
+    rebuild_notes_from_xml = MidiGapperGUI.rebuild_notes_from_xml
+
+    def __init__(self):
+        self.playback_scheduler = PlaybackScheduler()
+
+    def draw_visualization(self, notes, max_time):
+        pass
+
+
+XML = """<MidiFile ticks_per_beat="480">
+  <Track name="Piano">
+    <Message type="note_on" time="0" channel="0" note="60" velocity="20"/>
+    <Message type="note_off" time="480" channel="0" note="60" velocity="0"/>
+    <Message type="note_on" time="0" channel="0" note="60" velocity="110"/>
+    <Message type="note_on" time="480" channel="0" note="60" velocity="0"/>
+  </Track>
+</MidiFile>"""
+
+
+def note_on_velocities(stream):
+    return [stream.data2[i] for i in range(len(stream)) if stream.status[i] & 0xF0 == 0x90 and stream.data2[i]]
+
+
+def test_each_note_keeps_its_own_velocity():
+    notes = [(0.0, 60, 0, 0.5), (0.5, 60, 0, 0.5)]
+    assert note_on_velocities(MidiEventStream.from_notes(notes, [20, 110])) == [20, 110]
+
+
+def test_velocities_survive_xml_rebuild():
+    table = NoteTableStub()
+    table.rebuild_notes_from_xml(ET.fromstring(XML))
+    assert table.notes == [(0.0, 60, 0, 0.5), (0.5, 60, 0, 0.5)]
+    assert table.note_velocities == [20, 110]
+    assert note_on_velocities(table.playback_scheduler.stream) == [20, 110]
+
+
+if __name__ == "__main__":
+    print("=== Per-note Velocity Test ===")
+    test_each_note_keeps_its_own_velocity()
+    print("✓ Repeated pitches play with their own velocity")
+    test_velocities_survive_xml_rebuild()
+    print("✓ Velocities survive rebuilding notes from XML")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for faster-than-real-time offline rendering to WAV.
+Uses a backend whose samples count the notes sounding, so event placement
+can be checked sample by sample without FluidSynth.
+"""
+
+import os
+import sys
+import tempfile
+import wave
+from array import array
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, OfflineRenderer, RecordingBackend
+
+
+class CountingBackend(RecordingBackend):
+    """Every rendered sample holds the number of notes currently on"""
+    def __init__(self):
+        super().__init__()
+        self.on = set()
+
+    def note_on(self, channel, note, velocity=64):
+        super().note_on(channel, note, velocity)
+        self.on.add((channel, note))
+
+    def note_off(self, channel, note):
+        super().note_off(channel, note)
+        self.on.discard((channel, note))
+
+    def render(self, frames):
+        self._record('render', None, frames)
+        return array('h', [len(self.on)] * (2 * frames))
+
+
+def read_wav(path):
+    with wave.open(path, 'rb') as wav:
+        assert wav.getnchannels() == 2 and wav.getsampwidth() == 2
+        samples = array('h', wav.readframes(wav.getnframes()))
+        return wav.getframerate(), samples[::2]
+
+
+NOTES = [(0.5, 60, 0, 1.0), (1.0, 64, 1, 1.0)]
+
+
+def render(**kwargs):
+    stream = MidiEventStream.from_notes(NOTES, [90, 90])
+    backend = CountingBackend()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'out.wav')
+        frames = OfflineRenderer(backend, sample_rate=1000, chunk_frames=256).render(stream, path, **kwargs)
+        rate, left = read_wav(path)
+    assert len(left) == frames and rate == 1000
+    return backend, left
+
+
+def test_events_land_on_exact_samples():
+    backend, left = render()
+    # 2.0s of events plus a 1.0s release tail
+    assert len(left) == 3000
+    assert left[499] == 0 and left[500] == 1
+    assert left[999] == 1 and left[1000] == 2
+    assert left[1499] == 2 and left[1500] == 1
+    assert left[2000] == 0
+    # Rendering is chunked
+    assert max(call[3] for call in backend.calls if call[1] == 'render') <= 256
+
+
+def test_time_range_chases_held_notes():
+    _, left = render(start=0.75, end=1.25)
+    assert len(left) == 500
+    assert left[0] == 1  # Note 60 was already held at 0.75
+    assert left[249] == 1 and left[250] == 2
+
+
+def test_channel_filter():
+    _, left = render(channels=frozenset({1}))
+    assert max(left[:1000]) == 0
+    assert left[1000] == 1
+
+
+if __name__ == "__main__":
+    print("=== Offline Render Test ===")
+    test_events_land_on_exact_samples()
+    print("✓ Events land on exact sample positions, rendered in chunks")
+    test_time_range_chases_held_notes()
+    print("✓ Time ranges chase notes already held at the start")
+    test_channel_filter()
+    print("✓ Only the selected channels are rendered")
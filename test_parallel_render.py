@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel chunked offline rendering.
+Renders a generated song in segments across processes and checks the joined
+file is sample-identical to a single-process render. The counting backend's
+output depends only on the events it receives; FluidSynth's reverb and chorus
+tails can still differ after the preroll.
+"""
+
+import os
+import sys
+import tempfile
+import wave
+
+import mido
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, OfflineRenderer
+from offline_render import render_file_parallel
+from test_offline_render import CountingBackend
+
+
+def counting_backend(soundfont_path, sample_rate):
+    return CountingBackend()
+
+
+def write_song(path):
+    mf = mido.MidiFile(ticks_per_beat=480)
+    track = mido.MidiTrack()
+    track.append(mido.MetaMessage('set_tempo', tempo=500000, time=0))
+    # A long held note crossing every segment boundary plus a run of short notes
+    track.append(mido.Message('note_on', channel=0, note=40, velocity=80, time=0))
+    for i in range(40):
+        track.append(mido.Message('note_on', channel=1, note=60 + i % 12, velocity=90, time=37))
+        track.append(mido.Message('note_off', channel=1, note=60 + i % 12, velocity=0, time=53))
+    track.append(mido.Message('note_off', channel=0, note=40, velocity=0, time=0))
+    mf.tracks.append(track)
+    mf.save(path)
+
+
+def read_frames(path):
+    with wave.open(path, 'rb') as wav:
+        return wav.readframes(wav.getnframes())
+
+
+def test_parallel_matches_single_process():
+    with tempfile.TemporaryDirectory() as directory:
+        midi_path = os.path.join(directory, 'song.mid')
+        write_song(midi_path)
+        serial_path = os.path.join(directory, 'serial.wav')
+        parallel_path = os.path.join(directory, 'parallel.wav')
+
+        stream = MidiEventStream.from_midi_file(mido.MidiFile(midi_path))
+        OfflineRenderer(CountingBackend(), sample_rate=8000).render(stream, serial_path)
+        # Odd segment length so boundaries fall between events
+        render_file_parallel(midi_path, parallel_path, sample_rate=8000, workers=3,
+                             segment_seconds=0.37, preroll=0.1, backend_factory=counting_backend)
+        serial = read_frames(serial_path)
+        assert len(serial) > 0
+        assert read_frames(parallel_path) == serial
+
+
+def test_range_render_in_parallel():
+    with tempfile.TemporaryDirectory() as directory:
+        midi_path = os.path.join(directory, 'song.mid')
+        write_song(midi_path)
+        serial_path = os.path.join(directory, 'serial.wav')
+        parallel_path = os.path.join(directory, 'parallel.wav')
+
+        stream = MidiEventStream.from_midi_file(mido.MidiFile(midi_path))
+        OfflineRenderer(CountingBackend(), sample_rate=8000).render(stream, serial_path, start=1.0, end=2.5)
+        seconds, _ = render_file_parallel(midi_path, parallel_path, start=1.0, end=2.5, sample_rate=8000,
+                                          workers=2, backend_factory=counting_backend)
+        assert seconds == 1.5
+        assert read_frames(parallel_path) == read_frames(serial_path)
+
+
+if __name__ == "__main__":
+    print("=== Parallel Offline Render Test ===")
+    test_parallel_matches_single_process()
+    print("✓ Segments join sample-exactly to match a single-process render (stateless backend)")
+    test_range_render_in_parallel()
+    print("✓ Time ranges render in parallel too")
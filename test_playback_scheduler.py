@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for the real-time playback scheduler thread.
+Uses the recording synth backend, which timestamps every call it receives.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, MidiGapperGUI, NoteIntervalIndex, PlaybackScheduler, RecordingBackend
+
+
+def load_scheduler(notes):
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_notes(notes, [90] * len(notes)))
+    return scheduler
+
+
+def wait_until_done(scheduler, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while scheduler.running and time.perf_counter() < deadline:
+        time.sleep(0.005)
+
+
+def test_events_sent_in_order_and_on_time():
+    # Includes a 5 ms note that a 50 ms UI tick would never see
+    notes = [(0.02, 60, 0, 0.005), (0.05, 64, 0, 0.03), (0.05, 67, 1, 0.03)]
+    scheduler = load_scheduler(notes)
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    wait_until_done(scheduler)
+    kinds = [(kind, note) for _, kind, _, note, _ in player.calls]
+    assert kinds[:2] == [('note_on', 60), ('note_off', 60)]
+    assert sorted(kinds[2:4]) == [('note_on', 64), ('note_on', 67)]
+    assert sorted(kinds[4:]) == [('note_off', 64), ('note_off', 67)]
+    first_on = player.calls[0][0]
+    assert abs(first_on - 0.02) < 0.015
+    assert all(velocity == 90 for _, kind, _, _, velocity in player.calls if kind == 'note_on')
+
+
+def test_start_mid_song_chases_and_skips_past_events():
+    notes = [(0.0, 60, 0, 5.05), (0.0, 62, 0, 0.01), (5.02, 64, 0, 0.01)]
+    scheduler = load_scheduler(notes)
+    player = RecordingBackend()
+    scheduler.start(5.0, player, initial_notes=[(0, 60, 80)])
+    wait_until_done(scheduler)
+    notes_on = [note for _, kind, _, note, _ in player.calls if kind == 'note_on']
+    assert notes_on == [60, 64]
+
+
+def test_stop_releases_sounding_notes():
+    notes = [(0.0, 60, 0, 5.0)]
+    scheduler = load_scheduler(notes)
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    time.sleep(0.02)
+    scheduler.stop()
+    assert not scheduler.running
+    assert [kind for _, kind, _, _, _ in player.calls] == ['note_on', 'note_off']
+    assert 0.01 < scheduler.position() < 0.5
+
+
+def test_channel_filter():
+    notes = [(0.0, 60, 0, 0.01), (0.0, 62, 1, 0.01)]
+    scheduler = load_scheduler(notes)
+    scheduler.channels = frozenset({1})
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    wait_until_done(scheduler)
+    # Hidden channels get no note-ons; note-offs are always forwarded
+    assert {channel for _, kind, channel, _, _ in player.calls if kind == 'note_on'} == {1}
+
+
+def test_overlapping_same_pitch_notes_each_released():
+    # Merged tracks can start a pitch again before its first note ends
+    notes = [(0.0, 60, 0, 0.04), (0.02, 60, 0, 0.04)]
+    scheduler = load_scheduler(notes)
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    wait_until_done(scheduler)
+    kinds = [kind for _, kind, _, note, _ in player.calls if note == 60]
+    assert kinds == ['note_on', 'note_on', 'note_off', 'note_off']
+    assert not scheduler.sounding
+
+
+def test_seek_moves_running_thread():
+    notes = [(0.0, 60, 0, 10.0), (5.02, 64, 0, 0.01), (5.5, 67, 0, 0.01)]
+    scheduler = load_scheduler(notes)
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    time.sleep(0.02)
+    thread = scheduler._thread
+    scheduler.seek(5.0, [(0, 62, 70)])
+    time.sleep(0.06)
+    assert scheduler._thread is thread and scheduler.running
+    kinds = [(kind, note) for _, kind, _, note, _ in player.calls]
+    # The old note is released, the chased note sounds and playback carries on from 5.0
+    assert kinds[:4] == [('note_on', 60), ('note_off', 60), ('note_on', 62), ('note_on', 64)]
+    assert 5.03 < scheduler.position() < 5.2
+    scheduler.stop()
+
+
+
+class SeekApp:
+    """The GUI's seek path without Tk; after() callbacks are kept to run by hand"""
+    SEEK_CHASE_MS = MidiGapperGUI.SEEK_CHASE_MS
+    seek_relative = MidiGapperGUI.seek_relative
+    seek_scheduled_playback = MidiGapperGUI.seek_scheduled_playback
+    chase_held_notes = MidiGapperGUI.chase_held_notes
+    held_notes_at = MidiGapperGUI.held_notes_at
+
+    def __init__(self, notes):
+        self.notes = notes
+        self.note_velocities = [90] * len(notes)
+        self.note_index = NoteIntervalIndex(notes)
+        self.max_time = 10.0
+        self.is_playing = True
+        self.playback_position = 0.0
+        self.playback_scheduler = load_scheduler(notes)
+        self._seek_chase_id = None
+        self.timers = {}
+
+    def get_actual_audio_position(self):
+        return self.playback_scheduler.position()
+
+    def after(self, ms, func):
+        after_id = f'after#{id(func)}-{time.perf_counter_ns()}'
+        self.timers[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def sync_scrollbar_to_midi_position(self):
+        pass
+
+    update_led_clock = update_keyboard_highlighting = sync_scrollbar_to_midi_position
+
+
+def test_seek_keys_reuse_running_thread():
+    notes = [(0.0, 60, 0, 10.0), (4.0, 64, 0, 5.0)]
+    app = SeekApp(notes)
+    player = RecordingBackend()
+    app.playback_scheduler.start(0.0, player)
+    thread = app.playback_scheduler._thread
+    for _ in range(3):  # Key repeat
+        app.seek_relative(2.0)
+    time.sleep(0.06)
+    assert app.playback_scheduler._thread is thread
+    assert len(app.timers) == 1  # One pending chase, not one per press
+    list(app.timers.values())[0]()
+    time.sleep(0.06)
+    kinds = [(kind, note) for _, kind, _, note, _ in player.calls]
+    # Only the chase once the keys stop restrikes the held notes
+    assert kinds.count(('note_on', 60)) == 2 and kinds.count(('note_on', 64)) == 1
+    assert 6.0 < app.playback_scheduler.position() < 6.3
+    app.playback_scheduler.stop()
+
+
+if __name__ == "__main__":
+    print("=== Playback Scheduler Thread Test ===")
+    test_events_sent_in_order_and_on_time()
+    print("✓ Events are sent in order and on time, including sub-frame notes")
+    test_start_mid_song_chases_and_skips_past_events()
+    print("✓ Starting mid-song chases held notes and skips past events")
+    test_stop_releases_sounding_notes()
+    print("✓ Stopping releases sounding notes")
+    test_channel_filter()
+    print("✓ Hidden channels do not sound")
+    test_overlapping_same_pitch_notes_each_released()
+    print("✓ Overlapping notes of one pitch each get their note-off")
+    test_seek_moves_running_thread()
+    print("✓ Seeking moves the running thread without restarting it")
+    test_seek_keys_reuse_running_thread()
+    print("✓ Seek keys move the running thread and chase held notes once")
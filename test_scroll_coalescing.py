@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for per-frame coalescing of scroll, wheel and arrow-key input.
+Uses a fake Tk widget whose after() callbacks are fired by hand.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import ScrollCoalescer
+from test_frame_scheduler import FakeWidget
+
+
+def make_coalescer():
+    widget = FakeWidget()
+    applied = []
+    coalescer = ScrollCoalescer(widget, lambda *args: applied.append(args), frame_ms=16)
+    return widget, coalescer, applied
+
+
+def test_burst_applied_once_per_frame():
+    widget, coalescer, applied = make_coalescer()
+    for _ in range(30):
+        coalescer.scroll(-75)  # A fast wheel spin
+    coalescer.scroll(75)  # One Down key
+    assert applied == []
+    assert len(widget.pending) == 1  # Only one frame scheduled for the burst
+    widget.fire()
+    assert applied == [('scroll', -29 * 75, 'units')]
+    assert coalescer.events == 31 and coalescer.frames == 1
+
+
+def test_moveto_replaces_earlier_scrolling():
+    widget, coalescer, applied = make_coalescer()
+    coalescer.command('scroll', '5', 'units')
+    coalescer.command('moveto', '0.25')
+    coalescer.command('moveto', '0.5')
+    coalescer.command('scroll', '1', 'pages')
+    widget.fire()
+    assert applied == [('moveto', 0.5), ('scroll', 1, 'pages')]
+
+
+def test_cancelled_out_input_does_nothing():
+    widget, coalescer, applied = make_coalescer()
+    coalescer.scroll(3)
+    coalescer.scroll(-3)
+    widget.fire()
+    assert applied == []
+
+
+def test_next_burst_schedules_new_frame():
+    widget, coalescer, applied = make_coalescer()
+    coalescer.scroll(1)
+    widget.fire()
+    coalescer.scroll(2)
+    assert len(widget.pending) == 1
+    coalescer.flush()  # Flushing early cancels the scheduled frame
+    assert not widget.pending
+    assert applied == [('scroll', 1, 'units'), ('scroll', 2, 'units')]
+
+
+if __name__ == "__main__":
+    print("=== Scroll Coalescing Test ===")
+    test_burst_applied_once_per_frame()
+    print("✓ Bursts of wheel/key input apply once per frame")
+    test_moveto_replaces_earlier_scrolling()
+    print("✓ Scrollbar drags replace earlier pending movement")
+    test_cancelled_out_input_does_nothing()
+    test_next_burst_schedules_new_frame()
+    print("✓ Frames are scheduled only while input is pending")
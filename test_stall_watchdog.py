@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the UI-thread stall watchdog.
+Blocks the main thread past the budget and checks the stack that gets logged.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import diagnostics
+from diagnostics import StallWatchdog
+from test_frame_scheduler import FakeWidget
+
+
+def logged():
+    return [record.getMessage() for record in diagnostics.ring_buffer.records]
+
+
+def pretty_print_huge_xml():
+    time.sleep(0.3)  # Stands in for minidom blocking the Tk thread
+
+
+def test_stall_logs_main_thread_stack_and_duration():
+    diagnostics.ring_buffer.records.clear()
+    widget = FakeWidget()
+    watchdog = StallWatchdog(widget, budget=0.1)
+    watchdog.start()
+    try:
+        pretty_print_huge_xml()
+        assert watchdog.stalls == 1
+        assert 'pretty_print_huge_xml' in watchdog.last_stack
+        widget.fire()  # The heartbeat finally runs
+    finally:
+        watchdog.stop()
+    messages = logged()
+    stall = next(m for m in messages if 'stalled' in m)
+    assert 'budget 100 ms' in stall and 'pretty_print_huge_xml' in stall
+    resumed = next(m for m in messages if 'resumed' in m)
+    assert int(resumed.split()[5]) >= 200  # "UI thread resumed after a N ms stall"
+    assert not widget.pending
+
+
+def test_responsive_loop_is_not_reported():
+    widget = FakeWidget()
+    watchdog = StallWatchdog(widget, budget=0.1)
+    watchdog.start()
+    try:
+        for _ in range(6):
+            time.sleep(StallWatchdog.HEARTBEAT_MS / 1000)
+            widget.fire()
+    finally:
+        watchdog.stop()
+    assert watchdog.stalls == 0
+    assert not watchdog.running
+
+
+def test_one_report_per_stall():
+    widget = FakeWidget()
+    watchdog = StallWatchdog(widget, budget=0.01)
+    watchdog.main_ident = None
+    watchdog.last_beat = time.perf_counter() - 1.0
+    assert watchdog.check()
+    assert not watchdog.check()
+    watchdog.beat()
+    watchdog.last_beat -= 1.0
+    assert watchdog.check()
+    assert watchdog.stalls == 2
+
+
+if __name__ == "__main__":
+    print("=== UI Stall Watchdog Test ===")
+    test_stall_logs_main_thread_stack_and_duration()
+    print("✓ Stalls are logged with the main thread's stack and duration")
+    test_responsive_loop_is_not_reported()
+    print("✓ A responsive main loop is not reported")
+    test_one_report_per_stall()
+    print("✓ Each stall is reported once")
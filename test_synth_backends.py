@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable synth backends.
+Runs the playback scheduler headlessly against the null and recording backends.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import (MidiEventStream, NullBackend, PlaybackScheduler, RecordingBackend,
+                  SynthBackend, create_synth_backend)
+from test_playback_scheduler import wait_until_done
+
+
+def test_factory():
+    assert isinstance(create_synth_backend('null'), NullBackend)
+    assert isinstance(create_synth_backend('recording'), RecordingBackend)
+    try:
+        create_synth_backend('dsound')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backend accepted")
+
+
+def test_recording_backend_timestamps_every_call():
+    backend = RecordingBackend()
+    backend.note_on(0, 60, 100)
+    backend.cc(0, 64, 127)
+    backend.program(1, 5)
+    backend.pitch_bend(1, -100)
+    backend._note_off(0, 60)  # Old underscored name still works
+    backend.panic()
+    samples = backend.render(128)
+    assert len(samples) == 256 and not any(samples)
+    methods = [call[1] for call in backend.calls]
+    assert methods == ['note_on', 'cc', 'program', 'pitch_bend', 'note_off', 'panic', 'render']
+    times = [call[0] for call in backend.calls]
+    assert times == sorted(times)
+
+
+def test_headless_playback_throughput():
+    # 10,000 note pairs due at once: measures dispatch cost without an audio device
+    notes = [(0.0, 36 + i % 60, i % 16, 0.001) for i in range(10000)]
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_notes(notes, [80] * len(notes)))
+    backend = NullBackend()
+    t0 = time.perf_counter()
+    scheduler.start(0.0, backend)
+    wait_until_done(scheduler, timeout=10.0)
+    elapsed = time.perf_counter() - t0
+    assert not scheduler.running
+    assert scheduler.events_sent >= len(notes)
+    print(f"Null backend: {scheduler.events_sent} events in {elapsed * 1000:.1f}ms")
+
+
+def test_backend_without_output_is_skipped():
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_notes([(0.0, 60, 0, 0.01)], [90]))
+    scheduler.start(0.0, SynthBackend())
+    wait_until_done(scheduler)
+    assert not scheduler.sounding
+
+
+if __name__ == "__main__":
+    print("=== Synth Backend Test ===")
+    test_factory()
+    print("✓ Backends are created by name")
+    test_recording_backend_timestamps_every_call()
+    print("✓ Recording backend timestamps every call")
+    test_headless_playback_throughput()
+    print("✓ Playback runs headlessly on the null backend")
+    test_backend_without_output_is_skipped()
+    print("✓ Backends without output are not driven")
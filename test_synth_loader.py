@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for background synth initialisation.
+Drives SynthLoader with a fake Tk widget whose after() callbacks are fired by hand.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import NullBackend, SynthLoader
+
+
+class FakeWidget:
+    """Queues after() callbacks; pump() runs them like the Tk loop would"""
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, func):
+        self.pending.append(func)
+
+    def pump(self, timeout=2.0):
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            func = self.pending.pop(0)
+            func()
+            time.sleep(0.001)
+
+
+def test_load_returns_immediately_and_delivers_on_ui_thread():
+    widget = FakeWidget()
+    loader = SynthLoader(widget)
+    release = threading.Event()
+    ready = []
+
+    def slow_factory():
+        release.wait(1.0)
+        return NullBackend()
+
+    t0 = time.perf_counter()
+    loader.load(slow_factory, lambda backend: ready.append((backend, threading.current_thread())))
+    assert time.perf_counter() - t0 < 0.05
+    assert loader.loading and not ready
+    release.set()
+    widget.pump()
+    assert not loader.loading
+    backend, thread = ready[0]
+    assert isinstance(backend, NullBackend)
+    assert thread is threading.main_thread()
+
+
+def test_failed_factory_reports_none():
+    widget = FakeWidget()
+    loader = SynthLoader(widget)
+    ready = []
+
+    def broken_factory():
+        raise RuntimeError("no audio device")
+
+    loader.load(broken_factory, ready.append)
+    widget.pump()
+    assert ready == [None]
+
+
+def test_superseded_load_is_closed():
+    widget = FakeWidget()
+    loader = SynthLoader(widget)
+    first, second = NullBackend(), NullBackend()
+    ready = []
+    loader.load(lambda: first, ready.append)
+    loader.load(lambda: second, ready.append)
+    widget.pump()
+    assert ready == [second]
+    assert first.midi_out is None  # closed
+    assert second.midi_out is second
+
+
+if __name__ == "__main__":
+    print("=== Background Synth Loader Test ===")
+    test_load_returns_immediately_and_delivers_on_ui_thread()
+    print("✓ Loading does not block and hands the synth to the UI thread")
+    test_failed_factory_reports_none()
+    print("✓ Failures are reported as no synth")
+    test_superseded_load_is_closed()
+    print("✓ Superseded synths are closed")
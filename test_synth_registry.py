@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared synth/soundfont registry.
+Uses a counting synth factory so soundfont loads can be observed without FluidSynth.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import SynthRegistry
+
+
+class CountingSynth:
+    """Stands in for fluidsynth.Synth; counts sfload calls"""
+    created = 0
+
+    def __init__(self, **settings):
+        CountingSynth.created += 1
+        self.settings = settings
+        self.loads = []
+
+    def sfload(self, path):
+        self.loads.append(path)
+        return len(self.loads)
+
+    def delete(self):
+        pass
+
+
+def make_soundfont(directory, name):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(b'RIFF')
+    return path
+
+
+def test_soundfont_loaded_once_per_settings():
+    registry = SynthRegistry(CountingSynth)
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_soundfont(directory, 'gm.sf2')
+        first = registry.soundfont(path)
+        # Re-selecting the output asks again: same synth, no reload
+        assert registry.soundfont(path) == first
+        assert registry.synth() is registry.synth({})
+        assert registry.synth().loads == [path]
+        # Different settings get their own synth
+        other = registry.synth({'synth.sample-rate': 48000})
+        assert other is not registry.synth()
+        registry.soundfont(path, {'synth.sample-rate': 48000})
+        assert other.loads == [path]
+
+
+def test_preload_in_background():
+    registry = SynthRegistry(CountingSynth)
+    with tempfile.TemporaryDirectory() as directory:
+        a = make_soundfont(directory, 'a.sf2')
+        b = make_soundfont(directory, 'b.sf2')
+        thread = registry.preload([a, os.path.join(directory, 'missing.sf2'), b])
+        thread.join(2.0)
+        assert registry.is_loaded(a) and registry.is_loaded(b)
+        registry.soundfont(b)
+        assert registry.synth().loads == [a, b]
+
+
+def test_clear():
+    registry = SynthRegistry(CountingSynth)
+    before = CountingSynth.created
+    registry.synth()
+    registry.clear()
+    registry.synth()
+    assert CountingSynth.created == before + 2
+
+
+if __name__ == "__main__":
+    print("=== Synth Registry Test ===")
+    test_soundfont_loaded_once_per_settings()
+    print("✓ Soundfonts load once per synth settings")
+    test_preload_in_background()
+    print("✓ Configured soundfonts preload in the background")
+    test_clear()
+    print("✓ Clearing drops cached synths")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the playback timing accuracy harness.
+Checks the tempo-map ideal times, the jitter/drop/gap report and a real run.
+"""
+
+import os
+import sys
+import tempfile
+
+import mido
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from generate_midi_corpus import generate_corpus
+from timing_harness import ideal_note_events, run, timing_report
+
+
+def tempo_change_file():
+    mf = mido.MidiFile(ticks_per_beat=480)
+    conductor = mido.MidiTrack([mido.MetaMessage('set_tempo', tempo=500000, time=0),
+                                mido.MetaMessage('set_tempo', tempo=250000, time=960)])
+    notes = mido.MidiTrack([mido.Message('note_on', note=60, velocity=90, time=0),
+                            mido.Message('note_off', note=60, time=480),
+                            mido.Message('note_on', note=60, velocity=90, time=960),
+                            mido.Message('note_on', note=60, velocity=0, time=480)])
+    mf.tracks.extend([conductor, notes])
+    return mf
+
+
+def test_ideal_times_follow_tempo_map():
+    events = ideal_note_events(tempo_change_file())
+    assert [(round(t, 6), kind) for t, kind, _, _ in events] == [
+        (0.0, 'note_on'), (0.5, 'note_off'), (1.25, 'note_on'), (1.5, 'note_off')]
+
+
+def test_report_jitter_drops_and_lost_gaps():
+    ideal = [(0.0, 'note_on', 0, 60), (0.5, 'note_off', 0, 60), (0.6, 'note_on', 0, 60),
+             (0.9, 'note_off', 0, 60), (1.0, 'note_on', 0, 64), (1.1, 'note_off', 0, 64)]
+    perfect = timing_report(ideal, list(ideal))
+    assert perfect['max_jitter_ms'] == 0 and perfect['dropped_notes'] == 0
+    assert perfect['gaps'] == 1 and perfect['inaudible_gaps'] == 0
+
+    # The first note-off arrives 80 ms late, squeezing the 100 ms gap to 20 ms,
+    # and the note at 1.0 s never sounds
+    played = [(0.0, 'note_on', 0, 60), (0.58, 'note_off', 0, 60), (0.6, 'note_on', 0, 60),
+              (0.9, 'note_off', 0, 60)]
+    report = timing_report(ideal, played)
+    assert abs(report['max_jitter_ms'] - 80) < 1e-6
+    assert abs(report['mean_lateness_ms'] - 20) < 1e-6
+    assert report['dropped_notes'] == 1 and report['dropped_note_offs'] == 1
+    assert report['inaudible_gaps'] == 1
+
+
+def test_gaps_within_scheduler_resolution():
+    # A 12.5 ms gap whose note-off is 7.5 ms late, and a 1 ms gap played at 0 ms
+    ideal = [(0.0, 'note_on', 0, 60), (0.1, 'note_off', 0, 60), (0.1125, 'note_on', 0, 60),
+             (0.2, 'note_off', 0, 60), (0.201, 'note_on', 0, 60), (0.3, 'note_off', 0, 60)]
+    played = list(ideal)
+    played[1] = (0.1075, 'note_off', 0, 60)
+    played[3] = (0.2012, 'note_off', 0, 60)
+    report = timing_report(ideal, played)
+    assert report['gaps'] == 1 and report['unresolvable_gaps'] == 1
+    assert report['inaudible_gaps'] == 0
+    played[2] = (0.107, 'note_on', 0, 60)  # Retrigger sent before the note-off
+    assert timing_report(ideal, played)['inaudible_gaps'] == 1
+    played[1:3] = [(0.15, 'note_off', 0, 60), (0.15, 'note_on', 0, 60)]  # Held up past the gap
+    assert timing_report(ideal, played)['inaudible_gaps'] == 0
+
+
+def test_window_limits_expected_events():
+    ideal = [(0.0, 'note_on', 0, 60), (0.5, 'note_off', 0, 60), (2.0, 'note_on', 0, 62)]
+    report = timing_report(ideal, ideal[:2], start=0.0, end=1.0)
+    assert report['expected_events'] == 2 and report['dropped_notes'] == 0
+
+
+def test_real_playback_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_corpus(os.path.join(tmp, 'timing.mid'), notes=200, tracks=2, tempo_changes=3,
+                               repeat_density=0.3, seed=5)['path']
+        report = run(path, end=6.0, rate=8.0)
+    assert report['events'] == report['expected_events'] > 0
+    assert report['dropped_notes'] == 0 and report['dropped_note_offs'] == 0
+    assert report['mean_jitter_ms'] < 50  # Song time at 8x; loose for loaded machines
+
+
+if __name__ == "__main__":
+    print("=== Playback Timing Harness Test ===")
+    test_ideal_times_follow_tempo_map()
+    print("✓ Ideal times follow the merged tempo map")
+    test_report_jitter_drops_and_lost_gaps()
+    test_gaps_within_scheduler_resolution()
+    test_window_limits_expected_events()
+    print("✓ Report measures jitter, dropped notes and lost gaps")
+    test_real_playback_run()
+    print("✓ A real scheduler run plays every note")
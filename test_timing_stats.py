@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the hot-path timing stats registry.
+Checks aggregation, percentiles, stage laps, the decorator and JSON export.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from diagnostics import TimingStat, TimingStats
+
+
+def test_percentiles_and_mean():
+    stats = TimingStats()
+    for ms in range(1, 101):
+        stats.record('draw', ms * 1_000_000)
+    row = stats.summary()['draw']
+    assert row['count'] == 100
+    assert abs(row['mean_ms'] - 50.5) < 1e-9
+    assert row['p50_ms'] == 50 and row['p95_ms'] == 95 and row['p99_ms'] == 99
+    assert row['max_ms'] == 100
+
+
+def test_window_bounds_percentiles_not_totals():
+    stats = TimingStats(window=10)
+    for ns in [1000] * 50 + [5000] * 10:
+        stats.record('tick', ns)
+    row = stats.summary()['tick']
+    assert row['count'] == 60
+    assert row['p50_ms'] == 0.005  # Only the recent window
+    assert abs(row['mean_ms'] - (50 * 1000 + 10 * 5000) / 60 * 1e-6) < 1e-12
+
+
+def test_empty_percentile():
+    assert TimingStat.percentile([], 0.5) == 0
+
+
+def test_timed_decorator_records_on_exception():
+    stats = TimingStats()
+
+    @stats.timed('gaps')
+    def create_gaps(fail):
+        if fail:
+            raise RuntimeError
+        return 'ok'
+
+    assert create_gaps(False) == 'ok'
+    try:
+        create_gaps(True)
+    except RuntimeError:
+        pass
+    assert create_gaps.__name__ == 'create_gaps'
+    assert stats.summary()['gaps']['count'] == 2
+
+
+def test_stage_laps_and_export():
+    stats = TimingStats()
+    stages = stats.stage_timer('process_midi')
+    stages.lap('parse')
+    stages.lap('xml')
+    stages.done()
+    summary = stats.summary()
+    assert list(summary) == ['process_midi', 'process_midi.parse', 'process_midi.xml']
+    assert summary['process_midi']['mean_ms'] >= summary['process_midi.xml']['mean_ms']
+    assert 'process_midi.parse' in stats.format_table()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stats.json')
+        stats.export(path)
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == summary
+
+
+if __name__ == "__main__":
+    print("=== Timing Stats Test ===")
+    test_percentiles_and_mean()
+    print("✓ Count, mean and nearest-rank percentiles")
+    test_window_bounds_percentiles_not_totals()
+    test_empty_percentile()
+    print("✓ Percentiles use a bounded window of recent samples")
+    test_timed_decorator_records_on_exception()
+    print("✓ Decorated methods are timed, even when they raise")
+    test_stage_laps_and_export()
+    print("✓ Stages are lapped and the summary exports as JSON")
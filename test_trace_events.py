@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the opt-in Chrome trace-event recorder.
+Checks the trace.json format, Tk callback wrapping and scheduler/synth events.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import tkinter
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import diagnostics
+from diagnostics import TRACER, TraceRecorder
+from main import MidiEventStream, PlaybackScheduler, RecordingBackend
+from test_playback_scheduler import wait_until_done
+
+
+def test_disabled_recorder_records_nothing():
+    tracer = TraceRecorder()
+    traced = tracer.traced('draw', 'render')(lambda: 42)
+    assert traced() == 42
+    assert not tracer.events
+
+
+def test_trace_json_format():
+    tracer = TraceRecorder()
+    tracer.start()
+    tracer.traced('draw_visualization', 'render')(lambda: None)()
+    tracer.stop()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trace.json')
+        tracer.save(path)
+        with open(path, encoding='utf-8') as f:
+            trace = json.load(f)
+    metadata = [e for e in trace['traceEvents'] if e['ph'] == 'M']
+    complete = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert metadata[0]['args']['name'] == 'MainThread'
+    assert len(complete) == 1
+    event = complete[0]
+    assert (event['name'], event['cat']) == ('draw_visualization', 'render')
+    assert event['ts'] >= 0 and event['dur'] >= 0
+    assert event['tid'] == metadata[0]['tid']
+
+
+def test_tk_callbacks_and_after_timers_are_traced():
+    original = tkinter.CallWrapper
+    try:
+        diagnostics.trace_tk_callbacks()
+
+        def on_click():
+            return 'clicked'
+
+        def frame_tick():
+            pass
+
+        def after_callit():
+            frame_tick()
+        # What Misc.after registers: a local wrapper named after the scheduled function
+        after_callit.__qualname__ = 'Misc.after.<locals>.callit'
+        after_callit.__name__ = 'frame_tick'
+
+        TRACER.start()
+        assert tkinter.CallWrapper(on_click, None, None)() == 'clicked'
+        tkinter.CallWrapper(after_callit, None, None)()
+        TRACER.stop()
+        names = [(e[1], e[0]) for e in TRACER.events]
+        assert names[0][0] == 'tk' and names[0][1].endswith('on_click')
+        assert names[1] == ('after', 'frame_tick')
+    finally:
+        tkinter.CallWrapper = original
+        TRACER.events.clear()
+
+
+def test_scheduler_ticks_and_synth_calls_are_traced():
+    notes = [(0.0, 60, 0, 0.01), (0.0, 64, 1, 0.01)]
+    scheduler = PlaybackScheduler()
+    scheduler.load(MidiEventStream.from_notes(notes, [90, 90]))
+    TRACER.start()
+    scheduler.start(0.0, RecordingBackend())
+    wait_until_done(scheduler)
+    TRACER.stop()
+    events = TRACER.trace_events()
+    TRACER.events.clear()
+    synth = [e['name'] for e in events if e.get('cat') == 'synth']
+    assert synth.count('note_on') == 2 and synth.count('note_off') == 2
+    assert any(e.get('name') == 'scheduler tick' for e in events)
+    thread_names = [e['args']['name'] for e in events if e['ph'] == 'M']
+    assert any(name != 'MainThread' for name in thread_names)
+
+
+if __name__ == "__main__":
+    print("=== Chrome Trace Export Test ===")
+    test_disabled_recorder_records_nothing()
+    print("✓ Nothing is recorded while tracing is off")
+    test_trace_json_format()
+    print("✓ trace.json uses complete events with thread names")
+    test_tk_callbacks_and_after_timers_are_traced()
+    print("✓ Tk callbacks and after() timers are traced")
+    test_scheduler_ticks_and_synth_calls_are_traced()
+    print("✓ Scheduler ticks and synth calls are traced")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the monotonic transport clock.
+Drives Transport with a manual nanosecond clock and checks the scheduler follows it.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from main import MidiEventStream, PlaybackScheduler, RecordingBackend, Transport
+from test_playback_scheduler import wait_until_done
+
+
+class ManualClock:
+    def __init__(self):
+        self.ns = 1_000_000_000
+
+    def __call__(self):
+        return self.ns
+
+    def advance(self, seconds):
+        self.ns += int(seconds * 1e9)
+
+
+def test_play_pause_seek():
+    clock = ManualClock()
+    transport = Transport(clock)
+    clock.advance(5)
+    assert transport.position() == 0.0  # Paused until play()
+    transport.play()
+    clock.advance(1.5)
+    assert abs(transport.position() - 1.5) < 1e-9
+    transport.pause()
+    clock.advance(10)
+    assert abs(transport.position() - 1.5) < 1e-9
+    transport.play()
+    clock.advance(0.5)
+    assert abs(transport.position() - 2.0) < 1e-9
+    transport.seek(30.0)
+    clock.advance(1)
+    assert abs(transport.position() - 31.0) < 1e-9
+    transport.seek(-4)
+    assert transport.position() == 0.0
+
+
+def test_rate():
+    clock = ManualClock()
+    transport = Transport(clock)
+    transport.play()
+    clock.advance(1)
+    transport.set_rate(2.0)
+    clock.advance(1)
+    assert abs(transport.position() - 3.0) < 1e-9
+    try:
+        transport.set_rate(0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("zero rate accepted")
+
+
+def test_reads_from_other_threads():
+    transport = Transport()
+    transport.play()
+    seen = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            seen.append(transport.position())
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(200):
+        transport.seek(i * 10.0)
+    stop.set()
+    thread.join()
+    assert seen and all(position >= 0 for position in seen)
+
+
+def test_scheduler_follows_rate():
+    notes = [(0.1, 60, 0, 0.1)]
+    transport = Transport()
+    transport.set_rate(2.0)
+    scheduler = PlaybackScheduler(transport)
+    scheduler.load(MidiEventStream.from_notes(notes, [90]))
+    player = RecordingBackend()
+    scheduler.start(0.0, player)
+    wait_until_done(scheduler)
+    on_time = [t for t, method, *_ in player.calls if method == 'note_on'][0]
+    assert abs(on_time - 0.05) < 0.015  # 0.1s of song at double speed
+    scheduler.stop()
+    assert not transport.running
+
+
+if __name__ == "__main__":
+    print("=== Transport Clock Test ===")
+    test_play_pause_seek()
+    print("✓ Play, pause, resume and seek")
+    test_rate()
+    print("✓ Rate changes keep the position continuous")
+    test_reads_from_other_threads()
+    print("✓ Position reads are safe from other threads")
+    test_scheduler_follows_rate()
+    print("✓ Scheduler follows the transport's rate")
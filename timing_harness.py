@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Measure playback timing accuracy without an audio device.
+
+Plays a MIDI file through the real PlaybackScheduler into the recording
+synth backend. Every note-on/off it sends is compared with the time the
+file's own tempo map gives for it. The report has mean, p99 and max
+jitter, dropped notes, and gaps between repeated notes that were never
+audible. Gaps shorter than the scheduler's wait granularity cannot be
+resolved and are counted but not checked, and a gap is only lost when it
+is shortened by more than ordinary OS scheduling delay.
+
+    python timing_harness.py song.mid
+    python timing_harness.py song.mid --rate 4 --end 60 --max-p99-ms 5 --json timing.json
+
+The exit status is 1 when notes were dropped, gaps were lost or p99 jitter
+is over --max-p99-ms, so the harness can gate automated runs.
+"""
+import argparse
+import bisect
+import json
+import sys
+import time
+
+import mido
+
+from diagnostics import TimingStat
+from main import MidiEventStream, PlaybackScheduler, RecordingBackend, Transport
+
+MIN_GAP_RATIO = 0.5  # A gap played at less than this fraction of its written length is lost
+GAP_TOLERANCE = 2 * PlaybackScheduler.SPIN_THRESHOLD  # Gaps the scheduler cannot resolve
+LATENESS_TOLERANCE = 0.02  # How much shorter a gap may play when the thread is held up
+
+
+def tempo_map(mf):
+    """(tick, seconds, tempo) at every tempo change, merged across tracks"""
+    changes = {}
+    for track in mf.tracks:
+        tick = 0
+        for msg in track:
+            tick += msg.time
+            if msg.type == 'set_tempo':
+                changes[tick] = msg.tempo  # Later tracks win at the same tick, as when merged
+    points = [(0, 0.0, changes.pop(0, 500000))]
+    for tick in sorted(changes):
+        last_tick, last_seconds, last_tempo = points[-1]
+        seconds = last_seconds + (tick - last_tick) * last_tempo / (mf.ticks_per_beat * 1e6)
+        points.append((tick, seconds, changes[tick]))
+    return points
+
+
+def ideal_note_events(mf):
+    """(seconds, kind, channel, note) for every note-on and note-off, in time order"""
+    points = tempo_map(mf)
+    ticks = [point[0] for point in points]
+    scale = mf.ticks_per_beat * 1e6
+    events = []
+    for track in mf.tracks:
+        tick = 0
+        for msg in track:
+            tick += msg.time
+            if msg.type not in ('note_on', 'note_off'):
+                continue
+            start_tick, start_seconds, tempo = points[bisect.bisect_right(ticks, tick) - 1]
+            seconds = start_seconds + (tick - start_tick) * tempo / scale
+            kind = 'note_on' if msg.type == 'note_on' and msg.velocity > 0 else 'note_off'
+            events.append((seconds, kind, msg.channel, msg.note))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def clip_stream(stream, end):
+    """The events of stream at or before end seconds"""
+    count = bisect.bisect_right(stream.times, end)
+    clipped = MidiEventStream()
+    for field in ('times', 'status', 'data1', 'data2'):
+        getattr(clipped, field).extend(getattr(stream, field)[:count])
+    return clipped
+
+
+def measure_playback(stream, start=0.0, end=None, rate=1.0):
+    """Play stream from start to end (song seconds) at rate; returns the note calls in song time"""
+    if end is not None:
+        stream = clip_stream(stream, end)
+    scheduler = PlaybackScheduler(Transport())
+    scheduler.load(stream)
+    scheduler.transport.set_rate(rate)
+    backend = RecordingBackend()
+    scheduler.start(start, backend)
+    while scheduler.running:
+        time.sleep(0.01)
+    calls = list(backend.calls)  # Notes released by stop() are not part of the song
+    transport = scheduler.transport
+    played = [(transport.song_time(int((backend.t0 + t) * 1e9)), method, channel, note)
+              for t, method, channel, note, _ in calls if method in ('note_on', 'note_off')]
+    scheduler.stop()
+    return played
+
+
+def timing_report(ideal, played, start=0.0, end=None, min_gap_ratio=MIN_GAP_RATIO,
+                  gap_tolerance=GAP_TOLERANCE, lateness_tolerance=LATENESS_TOLERANCE):
+    """Compare played note calls with the ideal events in [start, end].
+
+    A written gap counts as inaudible when its notes are missing, the
+    retrigger was sent before the note-off, or it was played at less than
+    min_gap_ratio of its length and more than lateness_tolerance seconds
+    short. Gaps shorter than gap_tolerance are counted as unresolvable
+    instead.
+    """
+    expected = {}
+    for seconds, kind, channel, note in ideal:
+        if seconds >= start and (end is None or seconds <= end):
+            expected.setdefault((kind, channel, note), []).append(seconds)
+    actual = {}
+    for seconds, kind, channel, note in played:
+        actual.setdefault((kind, channel, note), []).append(seconds)
+
+    jitter = TimingStat(max(1, len(played)))
+    signed_total = 0.0
+    dropped_notes = dropped_offs = 0
+    for key, times in expected.items():
+        sent = actual.get(key, [])
+        for ideal_time, played_time in zip(times, sent):
+            error = played_time - ideal_time
+            signed_total += error
+            jitter.add(int(abs(error) * 1e9))
+        missing = max(0, len(times) - len(sent))
+        if key[0] == 'note_on':
+            dropped_notes += missing
+        else:
+            dropped_offs += missing
+
+    gaps = lost_gaps = unresolvable_gaps = 0
+    for (kind, channel, note), ons in expected.items():
+        if kind != 'note_on':
+            continue
+        offs = expected.get(('note_off', channel, note), [])
+        played_ons = actual.get(('note_on', channel, note), [])
+        played_offs = actual.get(('note_off', channel, note), [])
+        for i in range(min(len(ons) - 1, len(offs))):
+            written = ons[i + 1] - offs[i]
+            if written <= 0:
+                continue  # Legato retrigger, no gap was written
+            if written < gap_tolerance:
+                unresolvable_gaps += 1
+                continue
+            gaps += 1
+            if i + 1 >= len(played_ons) or i >= len(played_offs):
+                lost_gaps += 1
+                continue
+            gap = played_ons[i + 1] - played_offs[i]
+            if gap < 0 or (gap < written * min_gap_ratio and written - gap > lateness_tolerance):
+                lost_gaps += 1
+
+    summary = jitter.summary()
+    return {
+        'events': len(played),
+        'expected_events': sum(len(times) for times in expected.values()),
+        'mean_jitter_ms': summary['mean_ms'],
+        'mean_lateness_ms': signed_total / jitter.count * 1000 if jitter.count else 0.0,
+        'p99_jitter_ms': summary['p99_ms'],
+        'max_jitter_ms': summary['max_ms'],
+        'dropped_notes': dropped_notes,
+        'dropped_note_offs': dropped_offs,
+        'gaps': gaps,
+        'inaudible_gaps': lost_gaps,
+        'unresolvable_gaps': unresolvable_gaps,
+    }
+
+
+def run(midi_path, start=0.0, end=None, rate=1.0):
+    mf = mido.MidiFile(midi_path)
+    played = measure_playback(MidiEventStream.from_midi_file(mf), start, end, rate)
+    return timing_report(ideal_note_events(mf), played, start, end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure playback timing jitter against the tempo map")
+    parser.add_argument('midi', help="MIDI file to play")
+    parser.add_argument('--start', type=float, default=0.0, help="Start time in seconds")
+    parser.add_argument('--end', type=float, help="End time in seconds (default: end of song)")
+    parser.add_argument('--rate', type=float, default=1.0, help="Playback speed; jitter is in song time")
+    parser.add_argument('--max-p99-ms', type=float, help="Fail if p99 jitter exceeds this")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run(args.midi, args.start, args.end, args.rate)
+    except (OSError, ValueError) as e:
+        print(f"✗ Timing run failed: {e}")
+        return 1
+    print(f"Events: {report['events']} of {report['expected_events']} expected")
+    print(f"Jitter: mean {report['mean_jitter_ms']:.3f} ms, p99 {report['p99_jitter_ms']:.3f} ms, "
+          f"max {report['max_jitter_ms']:.3f} ms (mean lateness {report['mean_lateness_ms']:+.3f} ms)")
+    print(f"Dropped notes: {report['dropped_notes']} (note-offs: {report['dropped_note_offs']})")
+    print(f"Inaudible gaps: {report['inaudible_gaps']} of {report['gaps']} "
+          f"({report['unresolvable_gaps']} shorter than {GAP_TOLERANCE * 1000:.0f} ms not checked)")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failed = report['dropped_notes'] or report['inaudible_gaps']
+    if args.max_p99_ms is not None and report['p99_jitter_ms'] > args.max_p99_ms:
+        failed = True
+    print("✗ Timing check failed" if failed else "✓ Timing check passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())